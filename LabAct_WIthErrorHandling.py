@@ -1,24 +1,34 @@
-<<<<<<< HEAD
-import matplotlib.pyplot as plt
+from chart_output import finish_figure, new_figure, plt
+from profiling import count, profiled, span
+from sales_validate import parse_amount
+
+CATEGORIES = ['Laptops and Computers', 'Smartphones and Tablets',
+              'Gaming Products', 'Computer Accessories']
+CATEGORY_COLORS = ['red', 'blue', 'green', 'orange']
+QUARTERS = ['Q1', 'Q2', 'Q3']
+
+# Above this many bars create_bar_chart draws one collection instead of
+# one artist per bar (see grouped_bars.py).
+GROUPED_BAR_THRESHOLD = 64
 
 def get_valid_input(prompt):
-    """Get valid numerical input from user with error handling"""
+    """Get valid numerical input (commas and currency signs allowed) from user with error handling"""
     while True:
         try:
-            value = float(input(prompt))
+            value = parse_amount(input(prompt))
             if value < 0:
                 print("Error: Sales cannot be negative. Please enter a positive number.")
                 continue
             return value
         except ValueError:
-            print("Error: Invalid input. Please enter a valid number (e.g., 50000 or 50000.50)")
+            print("Error: Invalid input. Please enter a valid number (e.g., 50,000 or ₱50000.50)")
 
 def get_sales_data():
     """Get sales data from user for all categories"""
     
     print("VisProg Inc. - Sales Data Entry")
     print("=" * 50)
-    print("Note: Enter only numerical values (no letters, symbols, or commas)")
+    print("Note: Enter only numerical values (commas and ₱ or $ signs are fine)")
     
     # Get sales data for Laptops and Computers
     print("\nLaptops and Computers:")
@@ -50,194 +60,144 @@ def get_sales_data():
     
     return laptops_sales, smartphones_sales, gaming_sales, accessories_sales
 
-def display_summary(laptops_sales, smartphones_sales, gaming_sales, accessories_sales):
-    """Display sales summary"""
+def display_summary(*category_sales, categories=None):
+    """
+    Display sales summary.
+
+    Args:
+    *category_sales: one list of period sales per category.
+    categories (list[str]): category names (defaults to CATEGORIES).
+
+    Returns:
+        tuple: total sales per category.
+    """
+    if categories is None:
+        categories = CATEGORIES
     
-    total_laptops = sum(laptops_sales)
-    total_smartphones = sum(smartphones_sales)
-    total_gaming = sum(gaming_sales)
-    total_accessories = sum(accessories_sales)
+    totals = tuple(sum(sales) for sales in category_sales)
     
     print("\n" + "=" * 50)
     print("SALES SUMMARY")
     print("=" * 50)
-    print(f"Laptops and Computers: ${total_laptops}")
-    print(f"Smartphones and Tablets: ${total_smartphones}")
-    print(f"Gaming Products: ${total_gaming}")
-    print(f"Computer Accessories: ${total_accessories}")
+    for category, total in zip(categories, totals):
+        print(f"{category}: ${total}")
     print("=" * 50)
     
-    return total_laptops, total_smartphones, total_gaming, total_accessories
-
-def create_bar_chart(laptops_sales, smartphones_sales, gaming_sales, accessories_sales):
-    """Create bar chart for quarterly sales comparison"""
-    
-    quarters = ['Q1', 'Q2', 'Q3']
-    x = [0, 1, 2]
-    width = 0.2
-    
-    plt.figure(figsize=(10, 6))
-    
-    plt.bar([i - 1.5*width for i in x], laptops_sales, width, label='Laptops and Computers')
-    plt.bar([i - 0.5*width for i in x], smartphones_sales, width, label='Smartphones and Tablets')
-    plt.bar([i + 0.5*width for i in x], gaming_sales, width, label='Gaming Products')
-    plt.bar([i + 1.5*width for i in x], accessories_sales, width, label='Computer Accessories')
-    
-    plt.xlabel('Quarter')
-    plt.ylabel('Sales ($)')
-    plt.title('VisProg Inc. - Quarterly Sales Comparison')
-    plt.xticks(x, quarters)
-    plt.legend()
-    plt.grid(axis='y')
-    
-    plt.tight_layout()
-    plt.show()
+    return totals
 
-def create_pie_chart(total_laptops, total_smartphones, total_gaming, total_accessories):
-    """Create pie chart for category distribution"""
-    
-    categories = ['Laptops and Computers', 'Smartphones and Tablets', 
-                  'Gaming Products', 'Computer Accessories']
-    total_sales = [total_laptops, total_smartphones, total_gaming, total_accessories]
-    colors = ['red', 'blue', 'green', 'orange']
-    
-    plt.figure(figsize=(8, 8))
-    
-    plt.pie(total_sales, labels=categories, autopct='%1.1f%%', colors=colors, startangle=90)
-    plt.title('VisProg Inc. - Product Category Distribution')
-    
-    plt.tight_layout()
-    plt.show()
-
-def main():
-    """Main function to run the program"""
-    
-    # Get sales data from user
-    laptops_sales, smartphones_sales, gaming_sales, accessories_sales = get_sales_data()
-    
-    # Display summary
-    total_laptops, total_smartphones, total_gaming, total_accessories = display_summary(
-        laptops_sales, smartphones_sales, gaming_sales, accessories_sales)
-    
-    # Create bar chart
-    create_bar_chart(laptops_sales, smartphones_sales, gaming_sales, accessories_sales)
-    
-    # Create pie chart
-    create_pie_chart(total_laptops, total_smartphones, total_gaming, total_accessories)
-    
-    print("\nVisualization complete!")
+def default_periods(num_periods):
+    """Period labels when none are given: QUARTERS for three periods, else P1, P2, ..."""
+    return QUARTERS if num_periods == len(QUARTERS) else [f"P{i+1}" for i in range(num_periods)]
 
-# Run the program
-=======
-import matplotlib.pyplot as plt
+@profiled("create_summary_table")
+def create_summary_table(*category_sales, categories=None, periods=None, title=None,
+                         output=None, fmt=None):
+    """
+    Create the sales summary from display_summary as a table page.
 
-def get_valid_input(prompt):
-    """Get valid numerical input from user with error handling"""
-    while True:
-        try:
-            value = float(input(prompt))
-            if value < 0:
-                print("Error: Sales cannot be negative. Please enter a positive number.")
-                continue
-            return value
-        except ValueError:
-            print("Error: Invalid input. Please enter a valid number (e.g., 50000 or 50000.50)")
+    One row per category with its period sales and total, plus a row of
+    period totals.
+    """
+    if categories is None:
+        categories = CATEGORIES
+    num_periods = len(category_sales[0]) if category_sales else 0
+    if periods is None:
+        periods = default_periods(num_periods)
+    
+    totals = [sum(sales) for sales in category_sales]
+    period_totals = [sum(column) for column in zip(*category_sales)]
+    count("points", len(category_sales) * num_periods)
+    
+    with span("artists"):
+        new_figure((10, 6))
+        
+        rows = [list(sales) + [total] for sales, total in zip(category_sales, totals)]
+        rows.append(period_totals + [sum(totals)])
+        cells = [[f"${value:,.2f}" for value in row] for row in rows]
+        table = plt.table(cellText=cells, rowLabels=list(categories) + ['Total'],
+                          colLabels=list(periods) + ['Total'], loc='center')
+        table.auto_set_font_size(False)
+        table.set_fontsize(10)
+        table.scale(1, 1.5)
+        plt.axis('off')
+        plt.title(title or 'VisProg Inc. - Sales Summary')
+    
+    finish_figure(output, fmt)
 
-def get_sales_data():
-    """Get sales data from user for all categories"""
-    
-    print("VisProg Inc. - Sales Data Entry")
-    print("=" * 50)
-    print("Note: Enter only numerical values (no letters, symbols, or commas)")
-    
-    # Get sales data for Laptops and Computers
-    print("\nLaptops and Computers:")
-    laptops_q1 = get_valid_input("Enter sales for Q1 (Jan-Mar): ")
-    laptops_q2 = get_valid_input("Enter sales for Q2 (Apr-Jun): ")
-    laptops_q3 = get_valid_input("Enter sales for Q3 (Jul-Sep): ")
-    laptops_sales = [laptops_q1, laptops_q2, laptops_q3]
-    
-    # Get sales data for Smartphones and Tablets
-    print("\nSmartphones and Tablets:")
-    smartphones_q1 = get_valid_input("Enter sales for Q1 (Jan-Mar): ")
-    smartphones_q2 = get_valid_input("Enter sales for Q2 (Apr-Jun): ")
-    smartphones_q3 = get_valid_input("Enter sales for Q3 (Jul-Sep): ")
-    smartphones_sales = [smartphones_q1, smartphones_q2, smartphones_q3]
-    
-    # Get sales data for Gaming Products
-    print("\nGaming Products:")
-    gaming_q1 = get_valid_input("Enter sales for Q1 (Jan-Mar): ")
-    gaming_q2 = get_valid_input("Enter sales for Q2 (Apr-Jun): ")
-    gaming_q3 = get_valid_input("Enter sales for Q3 (Jul-Sep): ")
-    gaming_sales = [gaming_q1, gaming_q2, gaming_q3]
-    
-    # Get sales data for Computer Accessories
-    print("\nComputer Accessories:")
-    accessories_q1 = get_valid_input("Enter sales for Q1 (Jan-Mar): ")
-    accessories_q2 = get_valid_input("Enter sales for Q2 (Apr-Jun): ")
-    accessories_q3 = get_valid_input("Enter sales for Q3 (Jul-Sep): ")
-    accessories_sales = [accessories_q1, accessories_q2, accessories_q3]
-    
-    return laptops_sales, smartphones_sales, gaming_sales, accessories_sales
+@profiled("create_bar_chart")
+def create_bar_chart(*category_sales, categories=None, periods=None, title=None,
+                     xlabel=None, output=None, fmt=None):
+    """
+    Create bar chart for quarterly sales comparison.
 
-def display_summary(laptops_sales, smartphones_sales, gaming_sales, accessories_sales):
-    """Display sales summary"""
-    
-    total_laptops = sum(laptops_sales)
-    total_smartphones = sum(smartphones_sales)
-    total_gaming = sum(gaming_sales)
-    total_accessories = sum(accessories_sales)
-    
-    print("\n" + "=" * 50)
-    print("SALES SUMMARY")
-    print("=" * 50)
-    print(f"Laptops and Computers: ${total_laptops}")
-    print(f"Smartphones and Tablets: ${total_smartphones}")
-    print(f"Gaming Products: ${total_gaming}")
-    print(f"Computer Accessories: ${total_accessories}")
-    print("=" * 50)
-    
-    return total_laptops, total_smartphones, total_gaming, total_accessories
+    Takes one list of period sales per category, so any number of
+    categories and periods can be compared (defaults: CATEGORIES, QUARTERS).
+    """
+    if categories is None:
+        categories = CATEGORIES
+    num_periods = len(category_sales[0]) if category_sales else 0
+    if periods is None:
+        periods = default_periods(num_periods)
+    
+    x = list(range(num_periods))
+    width = 0.8 / len(category_sales)
+    count("points", len(category_sales) * num_periods)
+    
+    with span("artists"):
+        new_figure((10, 6))
+        
+        if len(category_sales) * num_periods > GROUPED_BAR_THRESHOLD:
+            from grouped_bars import draw_grouped_bars
+            draw_grouped_bars(plt.gca(), category_sales, categories, periods)
+        else:
+            for j, (sales, category) in enumerate(zip(category_sales, categories)):
+                offset = (j - (len(category_sales) - 1) / 2) * width
+                plt.bar([i + offset for i in x], sales, width, label=category)
+            plt.xticks(x, periods)
+            plt.legend()
+        
+        plt.xlabel(xlabel or 'Quarter')
+        plt.ylabel('Sales ($)')
+        plt.title(title or 'VisProg Inc. - Quarterly Sales Comparison')
+        plt.grid(axis='y')
+    
+    finish_figure(output, fmt)
 
-def create_bar_chart(laptops_sales, smartphones_sales, gaming_sales, accessories_sales):
-    """Create bar chart for quarterly sales comparison"""
-    
-    quarters = ['Q1', 'Q2', 'Q3']
-    x = [0, 1, 2]
-    width = 0.2
-    
-    plt.figure(figsize=(10, 6))
-    
-    plt.bar([i - 1.5*width for i in x], laptops_sales, width, label='Laptops and Computers')
-    plt.bar([i - 0.5*width for i in x], smartphones_sales, width, label='Smartphones and Tablets')
-    plt.bar([i + 0.5*width for i in x], gaming_sales, width, label='Gaming Products')
-    plt.bar([i + 1.5*width for i in x], accessories_sales, width, label='Computer Accessories')
-    
-    plt.xlabel('Quarter')
-    plt.ylabel('Sales ($)')
-    plt.title('VisProg Inc. - Quarterly Sales Comparison')
-    plt.xticks(x, quarters)
-    plt.legend()
-    plt.grid(axis='y')
-    
-    plt.tight_layout()
-    plt.show()
+@profiled("create_pie_chart")
+def create_pie_chart(*category_totals, categories=None, title=None, output=None, fmt=None,
+                     fold_below=None, donut=None):
+    """
+    Create pie chart for category distribution (one total per category).
 
-def create_pie_chart(total_laptops, total_smartphones, total_gaming, total_accessories):
-    """Create pie chart for category distribution"""
-    
-    categories = ['Laptops and Computers', 'Smartphones and Tablets', 
-                  'Gaming Products', 'Computer Accessories']
-    total_sales = [total_laptops, total_smartphones, total_gaming, total_accessories]
-    colors = ['red', 'blue', 'green', 'orange']
-    
-    plt.figure(figsize=(8, 8))
-    
-    plt.pie(total_sales, labels=categories, autopct='%1.1f%%', colors=colors, startangle=90)
-    plt.title('VisProg Inc. - Product Category Distribution')
-    
-    plt.tight_layout()
-    plt.show()
+    fold_below folds categories under that share of the total into "Other";
+    donut draws a ring of that width instead of a full pie.
+    """
+    
+    if categories is None:
+        categories = CATEGORIES
+    total_sales = list(category_totals)
+    colors = CATEGORY_COLORS if len(total_sales) == len(CATEGORY_COLORS) else None
+    
+    count("points", len(total_sales))
+    
+    if fold_below:
+        with span("prepare"):
+            from pie_slices import fold_slices
+            categories, total_sales, _, colors = fold_slices(
+                categories, total_sales, fold_below, colors=colors)
+    
+    with span("artists"):
+        new_figure((8, 8))
+        
+        from pie_slices import PIE_COLLECTION_THRESHOLD
+        if donut is not None or len(total_sales) > PIE_COLLECTION_THRESHOLD:
+            from pie_slices import draw_pie
+            draw_pie(plt.gca(), total_sales, categories, colors, width=donut)
+        else:
+            plt.pie(total_sales, labels=categories, autopct='%1.1f%%', colors=colors, startangle=90)
+        plt.title(title or 'VisProg Inc. - Product Category Distribution')
+    
+    finish_figure(output, fmt)
 
 def main():
     """Main function to run the program"""
@@ -258,5 +218,5 @@ def main():
     print("\nVisualization complete!")
 
 # Run the program
->>>>>>> 87fc7c722aae4cb55b57442b91c11eca64575500
-main()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
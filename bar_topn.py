@@ -0,0 +1,268 @@
+"""
+Bar graphs for data with thousands of categories.
+
+A bar per category stops being readable (and gets slow) long before
+tens of thousands of categories. This module ranks the values with
+np.argpartition, so only the bars that are shown get sorted, and then:
+
+    create_topn_bar_graph   the top N bars plus one "Other" bar for the rest
+    create_bar_pages        every bar, split into pages of a fixed size,
+                            either as separate figures or as facets of
+                            a few fixed-size figures
+
+Bar colors come from a colormap in one vectorized call instead of one
+menu prompt per bar.
+"""
+
+import numpy as np
+
+from chart_output import finish_figure, new_figure, plt
+from profiling import count, profiled, span
+
+DEFAULT_TOP_N = 20
+DEFAULT_CMAP = "viridis"
+OTHER_LABEL = "Other"
+OTHER_COLOR = "lightgray"
+# Rows of facets per figure in the "facets" layout; more pages start a
+# new figure of the same size instead of making one figure taller.
+FACET_ROWS = 3
+
+
+# ==================== RANKING ====================
+
+def ranked(values, k=None):
+    """
+    Indices of the k largest values, largest first.
+
+    Only those k values get sorted: np.argpartition moves them to the end
+    in O(n) first, so ranking the top 20 of a million values is cheap.
+
+    Args:
+    values: 1-D array of numbers.
+    k (int): how many indices to return (default: all of them).
+
+    Returns:
+        numpy.ndarray: indices into values.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if k is None or k >= values.size:
+        top = np.arange(values.size)
+    else:
+        top = np.argpartition(values, values.size - k)[values.size - k:]
+    return top[np.argsort(-values[top], kind="stable")]
+
+
+def top_n(labels, values, n=DEFAULT_TOP_N, other=True):
+    """
+    Keep the n largest bars and roll the rest into one "Other" bar.
+
+    Args:
+    labels: label per value.
+    values: 1-D array of numbers.
+    n (int): number of bars to keep.
+    other (bool): add the "Other" bar (only when something was left out).
+
+    Returns:
+        (labels, values, rest): arrays of the kept bars, largest first, with
+        "Other" last, and how many values went into "Other".
+    """
+    if n <= 0:
+        raise ValueError("Number of bars must be at least 1.")
+    labels = np.asarray(labels).astype(str)
+    values = np.asarray(values, dtype=np.float64)
+    if labels.shape != values.shape:
+        raise ValueError(f"Got {labels.size} labels for {values.size} values.")
+
+    top = ranked(values, n)
+    rest = values.size - top.size
+    top_labels, top_values = labels[top], values[top]
+    if other and rest:
+        left_out = np.ones(values.size, dtype=bool)
+        left_out[top] = False
+        top_labels = np.append(top_labels, OTHER_LABEL)
+        top_values = np.append(top_values, values[left_out].sum())
+    return top_labels, top_values, rest
+
+
+def paginate(labels, values, per_page, max_pages=None):
+    """
+    Split bars into pages of per_page bars, largest first.
+
+    Args:
+    labels: label per value.
+    values: 1-D array of numbers.
+    per_page (int): bars per page.
+    max_pages (int): stop after this many pages (only the bars on them
+        get sorted).
+
+    Returns:
+        list[(labels, values)]: one pair of arrays per page.
+    """
+    if per_page <= 0:
+        raise ValueError("Bars per page must be at least 1.")
+    labels = np.asarray(labels).astype(str)
+    values = np.asarray(values, dtype=np.float64)
+
+    shown = None if max_pages is None else per_page * max_pages
+    order = ranked(values, shown)
+    return [(labels[order[i:i + per_page]], values[order[i:i + per_page]])
+            for i in range(0, order.size, per_page)]
+
+
+def colormap_colors(values, cmap=DEFAULT_CMAP, vmin=None, vmax=None):
+    """
+    RGBA color per value from a colormap, scaled by value.
+
+    Args:
+    values: 1-D array of numbers.
+    cmap (str): matplotlib colormap name.
+    vmin, vmax (float): value range mapped onto the colormap (defaults
+        to the range of values).
+
+    Returns:
+        numpy.ndarray: (n, 4) array of colors.
+    """
+    from matplotlib import colormaps
+    from matplotlib.colors import Normalize
+
+    values = np.asarray(values, dtype=np.float64)
+    if values.size == 0:
+        return np.empty((0, 4))
+    vmin = values.min() if vmin is None else vmin
+    vmax = values.max() if vmax is None else vmax
+    return colormaps[cmap](Normalize(vmin, vmax)(values))
+
+
+# ==================== DRAWING ====================
+
+def _draw_bars(ax, labels, values, width, colors):
+    """Draw one set of ranked bars onto ax"""
+    positions = np.arange(len(values))
+    ax.bar(positions, values, width=width, color=colors, edgecolor="black", linewidth=0.5)
+    ax.set_xticks(positions, labels)
+    if len(values) > 10:
+        ax.tick_params(axis="x", labelrotation=90, labelsize="small")
+    ax.set_xlim(-0.5, len(values) - 0.5)
+    ax.grid(True, alpha=0.3, axis="y")
+
+
+@profiled("create_topn_bar_graph")
+def create_topn_bar_graph(labels, values, n=DEFAULT_TOP_N, width=0.8, cmap=DEFAULT_CMAP,
+                          other=True, output=None, fmt=None):
+    """
+    Bar graph of the n largest values plus an "Other" bar for the rest.
+
+    Args:
+    labels: label per value.
+    values: 1-D array of numbers.
+    n (int): number of bars to show before "Other".
+    width (float): bar width.
+    cmap (str): colormap for the top bars ("Other" is drawn in gray).
+    other (bool): add the "Other" bar.
+    output, fmt: where to save the chart (see chart_output.finish_figure).
+    """
+    count("points", len(values))
+    with span("prepare"):
+        bar_labels, bar_values, rest = top_n(labels, values, n, other)
+        bar_labels = bar_labels.tolist()
+        shown = len(bar_values) - (1 if other and rest else 0)
+        if shown < len(bar_values):
+            bar_labels[-1] = f"{OTHER_LABEL} ({rest:,})"
+        colors = np.empty((len(bar_values), 4))
+        colors[:shown] = colormap_colors(bar_values[:shown], cmap)
+        if shown < len(bar_values):
+            from matplotlib.colors import to_rgba
+            colors[shown:] = to_rgba(OTHER_COLOR)
+
+    with span("artists"):
+        new_figure((10, 6))
+        _draw_bars(plt.gca(), bar_labels, bar_values, width, colors)
+        plt.xlabel('Labels')
+        plt.ylabel('Values')
+        title = f'Top {shown} of {len(values):,}' if rest else 'Bar Graph'
+        plt.title(title)
+    finish_figure(output, fmt)
+
+
+@profiled("create_bar_pages")
+def create_bar_pages(labels, values, per_page=50, max_pages=None, layout="pages",
+                     columns=2, width=0.8, cmap=DEFAULT_CMAP, output=None, fmt=None):
+    """
+    Bar graphs of every value, largest first, per_page bars at a time.
+
+    All pages share one color scale, so the same color means the same
+    value on every page.
+
+    Args:
+    labels: label per value.
+    values: 1-D array of numbers.
+    per_page (int): bars per page.
+    max_pages (int): draw only the first this many pages.
+    layout (str): "pages" for one figure per page, "facets" for a
+        subplot per page, FACET_ROWS rows of them per figure.
+    columns (int): subplots per row for the "facets" layout.
+    width (float): bar width.
+    cmap (str): matplotlib colormap name.
+    output (str): where to save. When more than one figure is drawn it
+        must contain "{page}", which is replaced by the figure number.
+        None shows the figures.
+    fmt (str): image format (see chart_output.finish_figure).
+
+    Returns:
+        int: number of pages drawn.
+
+    Raises:
+        ValueError: for an unknown layout, or an output file name without
+        "{page}" when more than one figure is drawn.
+    """
+    if layout not in ("pages", "facets"):
+        raise ValueError(f"Unknown layout '{layout}' (expected 'pages' or 'facets').")
+
+    count("points", len(values))
+    with span("prepare"):
+        pages = paginate(labels, values, per_page, max_pages)
+        if not pages:
+            return 0
+        vmin = min(page_values.min() for _, page_values in pages)
+        vmax = pages[0][1].max()
+        colors = [colormap_colors(page_values, cmap, vmin, vmax) for _, page_values in pages]
+
+    # One figure per page, or per FACET_ROWS rows of facets.
+    per_figure = columns * FACET_ROWS if layout == "facets" else 1
+    figures = [pages[i:i + per_figure] for i in range(0, len(pages), per_figure)]
+    figure_colors = [colors[i:i + per_figure] for i in range(0, len(pages), per_figure)]
+    if isinstance(output, str) and len(figures) > 1 and "{page}" not in output:
+        raise ValueError(f"{len(figures)} figures would all be saved to '{output}'; "
+                         "add {page} to the file name.")
+
+    first = 1
+    for number, (figure_pages, page_colors) in enumerate(zip(figures, figure_colors), start=1):
+        with span("artists"):
+            if layout == "facets":
+                rows = FACET_ROWS if len(figures) > 1 else -(-len(figure_pages) // columns)
+                fig = new_figure((10, 4 * rows))
+                axes = fig.subplots(rows, columns, squeeze=False)
+                for i, ax in enumerate(axes.flat):
+                    if i >= len(figure_pages):
+                        ax.set_visible(False)
+                        continue
+                    page_labels, page_values = figure_pages[i]
+                    _draw_bars(ax, page_labels, page_values, width, page_colors[i])
+                    ax.set_title(f'Bars {first}-{first + len(page_values) - 1}')
+                    first += len(page_values)
+                title = 'Bar Graph'
+                if len(figures) > 1:
+                    title += f' (page {number} of {len(figures)})'
+                fig.suptitle(title)
+            else:
+                (page_labels, page_values), = figure_pages
+                new_figure((10, 6))
+                _draw_bars(plt.gca(), page_labels, page_values, width, page_colors[0])
+                plt.xlabel('Labels')
+                plt.ylabel('Values')
+                plt.title(f'Bar Graph (page {number} of {len(figures)}, '
+                          f'bars {first}-{first + len(page_values) - 1})')
+                first += len(page_values)
+        page_output = output.format(page=number) if isinstance(output, str) else output
+        finish_figure(page_output, fmt)
+    return len(pages)
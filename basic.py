@@ -1,4 +1,4 @@
-import matplotlib.pyplot as plt
+from chart_output import plt
 
 def get_sales_data():
     """Get sales data from user for all categories"""
@@ -114,4 +114,5 @@ def main():
     print("\nVisualization complete!")
 
 # Run the program
-main()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+"""
+Headless batch renderer for the charts in labexamnga.py and LabAct_WIthErrorHandling.py.
+
+Reads a JSON or JSONL job file and renders every job to PNG/SVG on the
+Agg backend, without any of the interactive prompts.
+
+Each job is an object with a "kind" ("line", "bar" or "pie"), "labels",
+"values" and the same style choices the menus collect:
+
+    line: marker, color, markercolor, linestyle, max_points, decimation,
+          density (draw a binned density image instead of a line)
+    bar:  width, colors
+    pie:  explode, colors, hatch, fold_below, donut
+
+The sales charts from LabAct_WIthErrorHandling.py are kinds too; their
+"labels" are the categories (defaulting to the four product categories):
+
+    sales_bar: "values" is one list of period sales per category; periods
+    sales_pie: "values" is one total per category; fold_below, donut
+
+Missing style choices fall back to the menu defaults. "colors" can be a
+single color name or one per bar/slice, and "explode" can be a list or the
+1-based number of the slice to explode. Instead of "labels"/"values" a job
+can name a CSV/TSV/.npy/.npz file in "data" (see data_loader.py). An
+optional "output" names the file (relative to the output directory).
+
+Usage:
+    python batch_render.py jobs.jsonl --outdir charts --format svg
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+
+import matplotlib
+matplotlib.use("Agg")
+
+import labexamnga
+import LabAct_WIthErrorHandling as labact
+from data_loader import load_data
+from render_cache import RenderCache, chart_key
+from sales_validate import parse_sales
+
+# ==================== JOB DEFAULTS ====================
+
+LINE_DEFAULTS = {"marker": "o", "color": "red", "markercolor": "red", "linestyle": "-",
+                 "max_points": None, "decimation": "lttb", "density": False}
+BAR_DEFAULTS = {"width": 0.5, "colors": "blue"}
+PIE_DEFAULTS = {"explode": None, "colors": "blue", "hatch": "", "fold_below": None, "donut": None}
+SALES_BAR_DEFAULTS = {"periods": None}
+SALES_PIE_DEFAULTS = {"fold_below": None, "donut": None}
+STYLE_DEFAULTS = {"line": LINE_DEFAULTS, "bar": BAR_DEFAULTS, "pie": PIE_DEFAULTS,
+                  "sales_bar": SALES_BAR_DEFAULTS, "sales_pie": SALES_PIE_DEFAULTS}
+
+# Figure sizes used by the chart functions (part of the cache key).
+FIGSIZES = {"line": (10, 6), "bar": (10, 6), "pie": (10, 8),
+            "sales_bar": (10, 6), "sales_pie": (8, 8)}
+
+FORMATS = ("png", "svg")
+
+
+# ==================== JOB FILE FUNCTIONS ====================
+
+def load_jobs(path):
+    """
+    Read jobs from a job file.
+
+    Args:
+    path (str): .jsonl file with one job per line, or .json file holding
+        a list of jobs (or an object with a "jobs" list).
+
+    Returns:
+        list[dict]: the jobs in file order.
+    """
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            jobs = []
+            for line_num, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    jobs.append(json.loads(line))
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{path}:{line_num}: invalid JSON ({e.msg})")
+            return jobs
+
+        data = json.load(f)
+
+    if isinstance(data, dict):
+        data = data.get("jobs", [])
+    if not isinstance(data, list):
+        raise ValueError(f"{path}: expected a list of jobs")
+    return data
+
+
+def _check_sales(job):
+    """Validate a sales job: categories and non-negative sales, like get_valid_input"""
+    values = job.get("values")
+    if not values:
+        raise ValueError("You must have at least one category.")
+
+    rows = values if job["kind"] == "sales_bar" else [values]
+    if job["kind"] == "sales_bar":
+        if not all(isinstance(row, list) and row for row in rows):
+            raise ValueError("values must be one non-empty list of sales per category.")
+        if len({len(row) for row in rows}) != 1:
+            raise ValueError("every category must have sales for the same periods.")
+    # Amounts may be numbers or strings like "₱50,000" (see sales_validate.py).
+    parsed, rejected = parse_sales([v for row in rows for v in row], keep_rows=True)
+    if len(rejected):
+        if set(rejected.counts()) == {"negative"}:
+            raise ValueError("Sales cannot be negative.")
+        raise ValueError(f"sales must all be valid numbers ({rejected.describe()}).")
+    width = len(rows[0])
+    rows = [parsed[i:i + width].tolist() for i in range(0, parsed.size, width)]
+
+    labels = job.get("labels")
+    num_categories = len(rows) if job["kind"] == "sales_bar" else len(rows[0])
+    if labels is None:
+        if num_categories == len(labact.CATEGORIES):
+            labels = labact.CATEGORIES
+        else:
+            labels = [f"Category {i}" for i in range(1, num_categories + 1)]
+    if len(labels) != num_categories:
+        raise ValueError("labels and values must have the same number of categories.")
+
+    values = rows if job["kind"] == "sales_bar" else rows[0]
+    return [str(label) for label in labels], values
+
+
+def _check_data(job):
+    """Validate labels and values the same way the data prompts do"""
+    if job.get("kind") in ("sales_bar", "sales_pie"):
+        return _check_sales(job)
+    if job.get("data"):
+        try:
+            return load_data(job["data"])
+        except OSError as e:
+            raise ValueError(f"could not read {job['data']}: {e.strerror}.")
+
+    labels = job.get("labels")
+    values = job.get("values")
+
+    if not values:
+        raise ValueError("You must have at least one data point.")
+    if labels is None:
+        labels = [str(i) for i in range(1, len(values) + 1)]
+    if len(labels) != len(values):
+        raise ValueError("labels and values must have the same length.")
+
+    try:
+        values = [float(v) for v in values]
+    except (TypeError, ValueError):
+        raise ValueError("values must all be valid numbers.")
+
+    return [str(label) for label in labels], values
+
+
+def _per_item(colors, count):
+    """Expand a single color into one color per bar/slice"""
+    if isinstance(colors, str):
+        return [colors] * count
+    if len(colors) != count:
+        raise ValueError(f"expected {count} colors, got {len(colors)}.")
+    return list(colors)
+
+
+def _explode(explode, count):
+    """Turn a slice number or list into the explode list create_pie_chart expects"""
+    if explode is None:
+        return [0] * count
+    if isinstance(explode, int):
+        if not 1 <= explode <= count:
+            raise ValueError(f"explode must be a slice between 1 and {count}.")
+        values = [0] * count
+        values[explode - 1] = 0.1
+        return values
+    if len(explode) != count:
+        raise ValueError(f"expected {count} explode values, got {len(explode)}.")
+    return list(explode)
+
+
+# ==================== RENDER FUNCTIONS ====================
+
+def _style(job):
+    """Job style choices merged over the menu defaults for its kind"""
+    if not isinstance(job, dict):
+        raise ValueError(f"a job must be a JSON object, not {type(job).__name__}.")
+    defaults = STYLE_DEFAULTS.get(job.get("kind"))
+    if defaults is None:
+        raise ValueError(f"unknown chart kind {job.get('kind')!r} "
+                         f"(expected line, bar, pie, sales_bar or sales_pie).")
+    return {key: job.get(key, default) for key, default in defaults.items()}
+
+
+def _draw(kind, labels, values, style, output, fmt):
+    """Draw a validated job with the labexamnga/LabAct chart functions"""
+    if kind == "line" and style["density"]:
+        from density import create_density_plot
+        create_density_plot(values, output=output, fmt=fmt)
+    elif kind == "line":
+        labexamnga.create_line_plot(
+            labels, values, style["marker"], style["color"],
+            style["markercolor"], style["linestyle"], output=output, fmt=fmt,
+            max_points=style["max_points"], decimation=style["decimation"]
+        )
+    elif kind == "sales_bar":
+        periods = style["periods"]
+        if periods is not None and len(periods) != len(values[0]):
+            raise ValueError(f"expected {len(values[0])} periods, got {len(periods)}.")
+        labact.create_bar_chart(*values, categories=labels, periods=periods,
+                                output=output, fmt=fmt)
+    elif kind == "sales_pie":
+        labact.create_pie_chart(*values, categories=labels, output=output, fmt=fmt,
+                                fold_below=style["fold_below"], donut=style["donut"])
+    elif kind == "bar":
+        width = min(max(float(style["width"]), 0.1), 1.0)
+        colors = _per_item(style["colors"], len(values))
+        labexamnga.create_bar_graph(labels, values, width, colors, output=output, fmt=fmt)
+    else:
+        explode = _explode(style["explode"], len(values))
+        colors = _per_item(style["colors"], len(values))
+        labexamnga.create_pie_chart(
+            labels, values, explode, colors, style["hatch"], output=output, fmt=fmt,
+            fold_below=style["fold_below"], donut=style["donut"]
+        )
+
+
+def render_job(job, output, fmt=None):
+    """
+    Render one job with the chart functions.
+
+    Args:
+    job (dict): job description (see module docstring).
+    output: file path or binary file object to write the chart to.
+    fmt (str): image format, inferred from the file name when not given.
+    """
+    style = _style(job)
+    labels, values = _check_data(job)
+    _draw(job["kind"], labels, values, style, output, fmt)
+
+
+def render_bytes(job, fmt="png", cache=None):
+    """
+    Render one job to encoded image bytes.
+
+    Args:
+    job (dict): job description (see module docstring).
+    fmt (str): image format.
+    cache (RenderCache): when given, identical charts are served from it.
+
+    Returns:
+        bytes: the encoded image.
+    """
+    style = _style(job)
+    labels, values = _check_data(job)
+
+    def render():
+        buffer = io.BytesIO()
+        _draw(job["kind"], labels, values, style, buffer, fmt)
+        return buffer.getvalue()
+
+    if cache is None:
+        return render()
+
+    dpi = matplotlib.rcParams["savefig.dpi"]
+    if dpi == "figure":
+        dpi = matplotlib.rcParams["figure.dpi"]
+    key = chart_key(job["kind"], [labels, values], style, FIGSIZES[job["kind"]], dpi, fmt)
+    return cache.get_or_render(key, render)
+
+
+def output_path(job, index, outdir, fmt):
+    """Return the file a job is written to"""
+    if not isinstance(job, dict):
+        raise ValueError(f"a job must be a JSON object, not {type(job).__name__}.")
+    name = job.get("output") or f"{index:04d}_{job.get('kind', 'chart')}.{fmt}"
+    if not isinstance(name, str):
+        raise ValueError("output must be a file name.")
+    path = os.path.join(outdir, name)
+    root = os.path.realpath(outdir)
+    if os.path.commonpath([root, os.path.realpath(path)]) != root:
+        raise ValueError(f"output {name!r} is outside the output directory.")
+    return path
+
+
+def render_all(jobs, outdir, fmt="png", cache=None):
+    """
+    Render every job into outdir, serving repeats from cache when given.
+
+    Returns:
+        tuple: (list of written paths, list of (job number, error message)).
+    """
+    os.makedirs(outdir, exist_ok=True)
+    written = []
+    errors = []
+
+    for index, job in enumerate(jobs, start=1):
+        try:
+            path = output_path(job, index, outdir, fmt)
+            if cache is None:
+                render_job(job, path)
+            else:
+                job_fmt = os.path.splitext(path)[1].lstrip(".") or fmt
+                data = render_bytes(job, job_fmt, cache)
+                with open(path, "wb") as f:
+                    f.write(data)
+        except Exception as e:  # one bad job must not stop the batch
+            errors.append((index, str(e) or type(e).__name__))
+            continue
+        written.append(path)
+
+    return written, errors
+
+
+# ==================== PROGRAM ENTRY POINT ====================
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Render charts from a JSON/JSONL job file.")
+    parser.add_argument("jobs", help="job file (.json or .jsonl)")
+    parser.add_argument("--outdir", default="charts", help="output directory (default: charts)")
+    parser.add_argument("--format", default="png", choices=FORMATS,
+                        help="default image format (default: png)")
+    parser.add_argument("--cache", metavar="DIR",
+                        help="reuse identical charts from a render cache in DIR")
+    args = parser.parse_args(argv)
+
+    try:
+        jobs = load_jobs(args.jobs)
+    except (OSError, ValueError) as e:
+        print(f"Error! {e}", file=sys.stderr)
+        return 2
+
+    cache = RenderCache(args.cache) if args.cache else None
+    written, errors = render_all(jobs, args.outdir, args.format, cache)
+
+    for index, message in errors:
+        print(f"Error! Job {index}: {message}", file=sys.stderr)
+    print(f"Rendered {len(written)} of {len(jobs)} charts into {args.outdir}")
+    if cache is not None:
+        stats = cache.stats()
+        print(f"Cache: {stats['hits']} hits, {stats['misses']} misses")
+
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
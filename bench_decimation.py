@@ -0,0 +1,96 @@
+"""
+Benchmark: line plot render time versus point count, with and without
+decimation.
+
+Renders a random-walk series through labexamnga.create_line_plot into an
+in-memory PNG and SVG at several sizes and prints one row per size and
+mode, along with the output size and decimation shape error.
+
+Usage:
+    python bench_decimation.py
+    python bench_decimation.py --sizes 10000,100000,1000000 --max-points 2000
+"""
+
+import argparse
+import io
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+
+import numpy as np
+
+import decimate
+import labexamnga
+
+MODES = ("off",) + decimate.METHODS
+
+
+def render_time(labels, values, fmt, mode, max_points):
+    """Render one line plot and return (seconds, output bytes)"""
+    buffer = io.BytesIO()
+    start = time.perf_counter()
+    labexamnga.create_line_plot(
+        labels, values, "o", "red", "red", "-", output=buffer, fmt=fmt,
+        max_points=None if mode == "off" else max_points,
+        decimation="lttb" if mode == "off" else mode,
+    )
+    return time.perf_counter() - start, buffer.tell()
+
+
+def run(sizes, max_points, formats, skip_off_above):
+    """Time every size, format and mode"""
+    rng = np.random.default_rng(0)
+    rows = []
+    for size in sizes:
+        values = np.cumsum(rng.normal(size=size))
+        labels = np.arange(size)
+
+        for mode in MODES:
+            if mode == "off" and size > skip_off_above:
+                continue
+
+            error = 0.0
+            if mode != "off":
+                keep = decimate.decimate(values, max_points, mode)
+                width = max_points // 2 if mode == "minmax" else max_points
+                error = decimate.shape_error(values, keep, width)
+
+            for fmt in formats:
+                seconds, nbytes = render_time(labels, values, fmt, mode, max_points)
+                rows.append((size, mode, fmt, seconds, nbytes, error))
+    return rows
+
+
+def print_rows(rows):
+    """Print the results table"""
+    print("\n" + "=" * 72)
+    print("LINE PLOT RENDER TIME VS POINT COUNT")
+    print("=" * 72)
+    print(f"{'points':>10} {'mode':>7} {'format':>6} {'seconds':>9} {'bytes':>12} {'shape err':>10}")
+    for size, mode, fmt, seconds, nbytes, error in rows:
+        flag = " !" if error > decimate.SHAPE_TOLERANCE else ""
+        print(f"{size:>10} {mode:>7} {fmt:>6} {seconds:>9.3f} {nbytes:>12} {error:>10.4f}{flag}")
+    print("=" * 72)
+    print(f"shape err is a fraction of the value range (tolerance {decimate.SHAPE_TOLERANCE}).")
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark line plot decimation.")
+    parser.add_argument("--sizes", default="1000,10000,100000,1000000",
+                        help="comma-separated point counts")
+    parser.add_argument("--max-points", type=int, default=2000,
+                        help="points kept by decimation (default: 2000)")
+    parser.add_argument("--formats", default="png,svg", help="comma-separated output formats")
+    parser.add_argument("--skip-off-above", type=int, default=1000000,
+                        help="skip undecimated runs above this many points")
+    args = parser.parse_args(argv)
+
+    sizes = [int(n) for n in args.sizes.split(",")]
+    formats = args.formats.split(",")
+    print_rows(run(sizes, args.max_points, formats, args.skip_off_above))
+
+
+if __name__ == "__main__":
+    main()
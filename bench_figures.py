@@ -0,0 +1,55 @@
+"""
+Soak test: memory while rendering many charts in one process.
+
+Renders a rotating mix of line, bar and pie charts through
+batch_render.render_job into memory, and prints the figure manager's
+stats (open figures, current RSS) every --every charts. Run it with
+--no-reuse to close every figure instead of reusing a pooled one.
+
+Usage:
+    python bench_figures.py
+    python bench_figures.py --charts 3000 --every 500 --no-reuse
+"""
+
+import argparse
+import io
+import time
+
+import batch_render
+from figure_manager import FigureManager, figure_stats, set_manager
+
+JOBS = [
+    {"kind": "line", "labels": ["Q1", "Q2", "Q3", "Q4"], "values": [4, 7, 5, 9]},
+    {"kind": "bar", "labels": ["A", "B", "C"], "values": [3, 8, 5], "colors": "green"},
+    {"kind": "pie", "labels": ["X", "Y", "Z", "W"], "values": [5, 3, 2, 1], "hatch": "/"},
+]
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Render many charts and watch memory.")
+    parser.add_argument("--charts", type=int, default=1000, help="charts to render")
+    parser.add_argument("--every", type=int, default=250, help="report interval")
+    parser.add_argument("--no-reuse", action="store_true", help="close figures instead of reusing them")
+    args = parser.parse_args(argv)
+
+    set_manager(FigureManager(reuse=not args.no_reuse))
+
+    print("\n" + "=" * 60)
+    print(f"FIGURE SOAK ({'close' if args.no_reuse else 'reuse'} figures)")
+    print("=" * 60)
+    print(f"{'charts':>8} {'open figs':>10} {'RSS MB':>8} {'charts/s':>9}")
+    start = time.perf_counter()
+    for i in range(1, args.charts + 1):
+        batch_render.render_job(JOBS[i % len(JOBS)], io.BytesIO(), fmt="png")
+        if i % args.every == 0:
+            stats = figure_stats()
+            rate = i / (time.perf_counter() - start)
+            rss = stats["rss_mb"]
+            rss_text = f"{rss:.1f}" if rss is not None else "-"
+            print(f"{i:>8} {stats['open']:>10} {rss_text:>8} {rate:>9.1f}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark: grouped bars as one PolyCollection versus one artist per bar.
+
+For each grid size, draws the same grouped bar chart both ways (one
+plt.bar call per category, as create_bar_chart does for small grids, and
+grouped_bars.draw_grouped_bars) and saves it to an in-memory PNG.
+
+Usage:
+    python bench_grouped_bars.py
+    python bench_grouped_bars.py --grids 4x3,200x40 --repeats 5
+"""
+
+import argparse
+import io
+import statistics
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from grouped_bars import GROUP_WIDTH, draw_grouped_bars
+
+
+def per_bar(totals, categories, periods):
+    """The plt.bar-per-category approach"""
+    num_categories, num_periods = totals.shape
+    width = GROUP_WIDTH / num_categories
+    x = np.arange(num_periods)
+    for j in range(num_categories):
+        offset = (j - (num_categories - 1) / 2) * width
+        plt.bar(x + offset, totals[j], width, label=categories[j])
+    plt.xticks(x, periods)
+    plt.legend()
+
+
+def collection(totals, categories, periods):
+    """The single-collection approach"""
+    draw_grouped_bars(plt.gca(), totals, categories, periods)
+
+
+def time_render(draw, totals, repeats):
+    """Median seconds to draw and save one chart"""
+    categories = [f"Category {i}" for i in range(totals.shape[0])]
+    periods = [f"P{i+1}" for i in range(totals.shape[1])]
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fig = plt.figure(figsize=(10, 6))
+        draw(totals, categories, periods)
+        fig.savefig(io.BytesIO(), format="png")
+        plt.close(fig)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark grouped bar rendering.")
+    parser.add_argument("--grids", default="4x3,20x12,50x20,200x40",
+                        help="comma-separated CATEGORIESxPERIODS sizes")
+    parser.add_argument("--repeats", type=int, default=3, help="timed repeats per case")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    time_render(collection, rng.random((2, 2)), 1)  # warm-up
+
+    print("\n" + "=" * 56)
+    print("GROUPED BARS: PER-BAR ARTISTS VS ONE COLLECTION")
+    print("=" * 56)
+    print(f"{'grid':>10} {'bars':>7} {'per-bar s':>10} {'collection s':>13} {'speedup':>8}")
+    for grid in args.grids.split(","):
+        num_categories, num_periods = (int(n) for n in grid.split("x"))
+        totals = rng.random((num_categories, num_periods)) * 1000
+        slow = time_render(per_bar, totals, args.repeats)
+        fast = time_render(collection, totals, args.repeats)
+        print(f"{grid:>10} {totals.size:>7} {slow:>10.3f} {fast:>13.3f} {slow / fast:>7.1f}x")
+    print("=" * 56)
+
+
+if __name__ == "__main__":
+    main()
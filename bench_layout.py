@@ -0,0 +1,82 @@
+"""
+Benchmark: layout templates (layout_cache.py) versus tight_layout on every chart.
+
+Renders the same charts repeatedly to in-memory PNGs, once with the
+layout cache disabled and once with it enabled, and reports the time
+spent in the layout phase (from profiling.py) and per chart overall.
+The first render of each chart is a cache miss; the rest are hits.
+
+Usage:
+    python bench_layout.py
+    python bench_layout.py --repeats 50
+"""
+
+import argparse
+import io
+
+import matplotlib
+matplotlib.use("Agg")
+
+import numpy as np
+
+import labexamnga
+import LabAct_WIthErrorHandling as labact
+import layout_cache
+import profiling
+
+
+def charts():
+    """Chart name and a function rendering it to a file object"""
+    rng = np.random.default_rng(0)
+    sales = rng.uniform(10000, 90000, (4, 3)).round()
+    labels = [f"Item {i}" for i in range(6)]
+    values = rng.uniform(1, 100, 6)
+    return [
+        ("sales bar", lambda out: labact.create_bar_chart(*sales, output=out, fmt="png")),
+        ("sales pie", lambda out: labact.create_pie_chart(*sales.sum(axis=1), output=out,
+                                                          fmt="png")),
+        ("line", lambda out: labexamnga.create_line_plot(labels, values, "o", "red", "red", "-",
+                                                         output=out, fmt="png")),
+        ("bar", lambda out: labexamnga.create_bar_graph(labels, values, 0.5, ["blue"] * 6,
+                                                        output=out, fmt="png")),
+    ]
+
+
+def time_chart(render, repeats, cache):
+    """(layout seconds, total seconds) per chart, averaged over repeats"""
+    layout_cache.set_layout_cache(cache)
+    profiling.reset()
+    profiling.enable()
+    for _ in range(repeats):
+        render(io.BytesIO())
+    profiling.disable()
+    totals = profiling.totals()
+    total = sum(seconds for name, seconds in totals.items() if name.startswith("create_"))
+    return totals.get("layout", 0.0) / repeats, total / repeats
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark cached layout templates.")
+    parser.add_argument("--repeats", type=int, default=20, help="renders per chart")
+    args = parser.parse_args(argv)
+
+    for _, render in charts():
+        render(io.BytesIO())  # warm-up
+
+    print("\n" + "=" * 72)
+    print(f"LAYOUT TEMPLATES ({args.repeats} renders per chart)")
+    print("=" * 72)
+    print(f"{'chart':<10} {'tight ms':>9} {'cached ms':>10} {'speedup':>8} "
+          f"{'chart ms':>9} {'cached':>8}")
+    for name, render in charts():
+        slow_layout, slow_total = time_chart(render, args.repeats, layout_cache.LayoutCache(0))
+        fast_layout, fast_total = time_chart(render, args.repeats, layout_cache.LayoutCache())
+        print(f"{name:<10} {slow_layout * 1000:>9.1f} {fast_layout * 1000:>10.1f} "
+              f"{slow_layout / fast_layout:>7.1f}x {slow_total * 1000:>9.1f} "
+              f"{fast_total * 1000:>8.1f}")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark: many line series as one LineCollection versus a plt.plot loop.
+
+For each series count, draws the same (series, points) array both ways
+and saves it to an in-memory PNG. The loop is skipped above --loop-max
+series, where it gets very slow.
+
+Usage:
+    python bench_multi_line.py
+    python bench_multi_line.py --series 10,100,1000,5000 --points 500
+"""
+
+import argparse
+import io
+import statistics
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from multi_line import draw_series, series_colors
+
+
+def plot_loop(values):
+    """One plt.plot call per series"""
+    x = np.arange(values.shape[1])
+    for row, color in zip(values, series_colors(len(values))):
+        plt.plot(x, row, color=color, linewidth=1)
+
+
+def collection(values):
+    """All series in one LineCollection"""
+    draw_series(plt.gca(), values)
+
+
+def time_render(draw, values, repeats):
+    """Median seconds to draw and save one chart"""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fig = plt.figure(figsize=(10, 6))
+        draw(values)
+        fig.savefig(io.BytesIO(), format="png")
+        plt.close(fig)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark multi-series line rendering.")
+    parser.add_argument("--series", default="10,100,1000,5000",
+                        help="comma-separated series counts")
+    parser.add_argument("--points", type=int, default=200, help="points per series")
+    parser.add_argument("--loop-max", type=int, default=1000,
+                        help="largest series count timed with the plt.plot loop")
+    parser.add_argument("--repeats", type=int, default=3, help="timed repeats per case")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    time_render(collection, rng.random((2, 2)), 1)  # warm-up
+
+    print("\n" + "=" * 60)
+    print(f"MULTI-SERIES LINES ({args.points} points per series)")
+    print("=" * 60)
+    print(f"{'series':>8} {'plot loop s':>12} {'collection s':>13} {'speedup':>8}")
+    for num_series in (int(n) for n in args.series.split(",")):
+        values = rng.standard_normal((num_series, args.points)).cumsum(axis=1)
+        fast = time_render(collection, values, args.repeats)
+        if num_series <= args.loop_max:
+            slow = time_render(plot_loop, values, args.repeats)
+            print(f"{num_series:>8} {slow:>12.3f} {fast:>13.3f} {slow / fast:>7.1f}x")
+        else:
+            print(f"{num_series:>8} {'-':>12} {fast:>13.3f} {'-':>8}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark: sharded sales aggregation speedup versus worker count.
+
+Writes synthetic per-store transaction files to a temporary directory,
+aggregates them sequentially and with several pool sizes, checks that
+every parallel result is bit-for-bit identical to the sequential one and
+prints the speedup.
+
+Usage:
+    python bench_sharded.py
+    python bench_sharded.py --stores 200 --rows 50000 --workers 1,2,4,8,16,32
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from LabAct_WIthErrorHandling import CATEGORIES
+from sharded_aggregate import aggregate_files
+
+
+def write_stores(folder, stores, rows, seed=0):
+    """Write one synthetic transactions file per store"""
+    rng = np.random.default_rng(seed)
+    names = np.array(CATEGORIES)
+    paths = []
+    for store in range(stores):
+        categories = names[rng.integers(0, len(names), rows)]
+        days = np.datetime64("2024-01-01") + rng.integers(0, 273, rows)
+        amounts = np.round(rng.gamma(2.0, 500.0, rows), 2)
+
+        path = os.path.join(folder, f"store_{store:04d}.csv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("category,date,amount\n")
+            f.writelines(f"{c},{d},{a}\n" for c, d, a in zip(categories, days.astype(str), amounts))
+        paths.append(path)
+    return paths
+
+
+def run(paths, worker_counts):
+    """Time each pool size against the sequential run"""
+    start = time.perf_counter()
+    expected = aggregate_files(paths, workers=1)
+    sequential = time.perf_counter() - start
+
+    rows = [("sequential", sequential, 1.0, True)]
+    for workers in worker_counts:
+        start = time.perf_counter()
+        result = aggregate_files(paths, workers=workers)
+        seconds = time.perf_counter() - start
+        exact = (result.categories == expected.categories
+                 and result.periods == expected.periods
+                 and np.array_equal(result.totals, expected.totals))
+        rows.append((f"{workers} workers", seconds, sequential / seconds, exact))
+    return rows
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark sharded sales aggregation.")
+    parser.add_argument("--stores", type=int, default=64, help="number of store files")
+    parser.add_argument("--rows", type=int, default=20000, help="transactions per store")
+    parser.add_argument("--workers", default="1,2,4,8", help="comma-separated pool sizes")
+    args = parser.parse_args(argv)
+
+    counts = [int(n) for n in args.workers.split(",")]
+    with tempfile.TemporaryDirectory() as folder:
+        paths = write_stores(folder, args.stores, args.rows)
+        rows = run(paths, counts)
+
+    print("\n" + "=" * 56)
+    print(f"SHARDED AGGREGATION ({args.stores} stores x {args.rows} rows)")
+    print("=" * 56)
+    print(f"{'run':<14} {'seconds':>9} {'speedup':>9} {'matches sequential':>20}")
+    for name, seconds, speedup, exact in rows:
+        print(f"{name:<14} {seconds:>9.3f} {speedup:>8.2f}x {'yes' if exact else 'NO':>20}")
+    print("=" * 56)
+
+    return 0 if all(row[3] for row in rows) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
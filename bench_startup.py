@@ -0,0 +1,159 @@
+"""
+Startup benchmark for the three interactive programs.
+
+Checks two things for labexamnga.py, LabAct_WIthErrorHandling.py and
+basic.py:
+
+    import time   cumulative `python -X importtime` cost of importing the
+                  program module, which must stay under IMPORT_BUDGET_MS
+                  and must not pull in matplotlib or NumPy.
+    first prompt  wall time from starting `python <script>` until its
+                  first prompt is written, which must stay under
+                  PROMPT_BUDGET_MS.
+
+Each measurement is the best of several runs. Exits with status 1 when any
+budget is exceeded, so it can gate changes.
+
+Usage:
+    python bench_startup.py
+    python bench_startup.py --runs 10
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Script, its module name and text that appears in its first prompt.
+PROGRAMS = [
+    ("labexamnga.py", "labexamnga", b"Enter your choice"),
+    ("LabAct_WIthErrorHandling.py", "LabAct_WIthErrorHandling", b"Enter sales for Q1"),
+    ("basic.py", "basic", b"Enter sales for Q1"),
+]
+
+IMPORT_BUDGET_MS = 30.0
+PROMPT_BUDGET_MS = 250.0
+
+# Modules that must not load before the first chart is drawn.
+HEAVY_MODULES = ("matplotlib", "numpy")
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)")
+
+
+# ==================== MEASUREMENTS ====================
+
+def import_profile(module):
+    """
+    Import a module under -X importtime.
+
+    Returns:
+        tuple: (cumulative milliseconds for the module, set of all imported
+        module names).
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=HERE, capture_output=True, text=True, check=True,
+    )
+
+    cumulative = None
+    imported = set()
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        name = match.group(4)
+        imported.add(name)
+        if name == module:
+            cumulative = int(match.group(2)) / 1000
+
+    return cumulative, imported
+
+
+def time_to_prompt(script, marker, timeout=30):
+    """Milliseconds from process start until marker appears on stdout"""
+    env = dict(os.environ, PYTHONUNBUFFERED="1")
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, script], cwd=HERE, env=env,
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+    )
+    try:
+        output = b""
+        while marker not in output:
+            chunk = os.read(proc.stdout.fileno(), 4096)
+            if not chunk:
+                raise RuntimeError(f"{script} exited before showing its first prompt")
+            output += chunk
+            if time.perf_counter() - start > timeout:
+                raise RuntimeError(f"{script} did not prompt within {timeout}s")
+        return (time.perf_counter() - start) * 1000
+    finally:
+        proc.kill()
+        proc.wait()
+        proc.stdout.close()
+        proc.stdin.close()
+
+
+# ==================== REPORT ====================
+
+def run(runs):
+    """
+    Measure every program.
+
+    Returns:
+        list[dict]: one row per program with timings and any failures.
+    """
+    rows = []
+    for script, module, marker in PROGRAMS:
+        import_ms = float("inf")
+        imported = set()
+        for _ in range(runs):
+            ms, imported = import_profile(module)
+            import_ms = min(import_ms, ms)
+
+        prompt_ms = min(time_to_prompt(script, marker) for _ in range(runs))
+
+        failures = []
+        if import_ms > IMPORT_BUDGET_MS:
+            failures.append(f"import {import_ms:.1f}ms > {IMPORT_BUDGET_MS:.0f}ms")
+        if prompt_ms > PROMPT_BUDGET_MS:
+            failures.append(f"first prompt {prompt_ms:.1f}ms > {PROMPT_BUDGET_MS:.0f}ms")
+        for heavy in HEAVY_MODULES:
+            if heavy in imported:
+                failures.append(f"imports {heavy} at startup")
+
+        rows.append({"script": script, "import_ms": import_ms,
+                     "prompt_ms": prompt_ms, "failures": failures})
+    return rows
+
+
+def print_rows(rows):
+    """Print the results table"""
+    print("\n" + "=" * 72)
+    print("STARTUP BUDGET")
+    print("=" * 72)
+    print(f"{'script':<30} {'import ms':>10} {'prompt ms':>10}  result")
+    for row in rows:
+        result = "ok" if not row["failures"] else "FAIL: " + "; ".join(row["failures"])
+        print(f"{row['script']:<30} {row['import_ms']:>10.1f} {row['prompt_ms']:>10.1f}  {result}")
+    print("=" * 72)
+    print(f"Budgets: import {IMPORT_BUDGET_MS:.0f}ms, first prompt {PROMPT_BUDGET_MS:.0f}ms")
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Check program startup time budgets.")
+    parser.add_argument("--runs", type=int, default=5, help="runs per measurement (best is kept)")
+    args = parser.parse_args(argv)
+
+    rows = run(args.runs)
+    print_rows(rows)
+    return 1 if any(row["failures"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,333 @@
+"""
+Benchmark suite for the chart builders and input paths.
+
+Covers:
+    labexamnga.create_line_plot / create_bar_graph / create_pie_chart
+    bar_topn.create_topn_bar_graph
+    density.create_density_plot
+    LabAct_WIthErrorHandling.create_bar_chart / create_pie_chart
+        at several data sizes, rendered to PNG and SVG in memory
+    LabAct_WIthErrorHandling.get_valid_input and
+    labexamnga.get_data_points
+        fed from scripted stdin
+    sales_validate.parse_sales
+        on columns of formatted amounts ("₱50,000", ...)
+
+Every case runs in its own fresh Python process on the Agg backend, so its
+peak RSS is its own. Each case builds its data first and then makes the
+measured call; only that call is timed. Each case records the median wall
+time over several repeats, peak RSS and a per-phase breakdown (data setup
+plus the render phases reported by profiling.py). Line plots are drawn
+the way the program draws loaded files, decimated to
+labexamnga.DEFAULT_MAX_POINTS. Results can be saved as a JSON
+baseline; later runs are compared against it and the suite exits with
+status 1 when any case is slower (or uses more memory) than the baseline
+by more than the threshold.
+
+Usage:
+    python bench_suite.py --save-baseline          # record bench_baseline.json
+    python bench_suite.py                          # compare against it
+    python bench_suite.py --only line --repeats 3 --threshold 0.5
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE_FILE = os.path.join(HERE, "bench_baseline.json")
+
+FORMATS = ("png", "svg")
+LINE_SIZES = (10, 1000, 100000)
+BAR_SIZES = (6, 100, 1000)
+TOPN_SIZES = (10000, 1000000)
+DENSITY_SIZES = (100000, 10000000)
+PIE_SIZES = (5, 50, 500)
+SALES_SIZES = ((4, 3), (20, 12), (100, 40))
+INPUT_SIZES = (100, 10000)
+PARSE_SIZES = (10000, 1000000)
+
+
+# ==================== CASES ====================
+
+def _timed(phases, name, func, *args, **kwargs):
+    """Run func, adding its wall time to phases[name]"""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    phases[name] = phases.get(name, 0.0) + time.perf_counter() - start
+    return result
+
+
+def _chart_case(kind, size, fmt):
+    """Build the function that sets up one chart case and returns its render call"""
+    def run(phases):
+        import numpy as np
+        import bar_topn
+        import density
+        import labexamnga
+        import LabAct_WIthErrorHandling as labact
+
+        def make_data():
+            rng = np.random.default_rng(size if isinstance(size, int) else size[0] * size[1])
+            if kind == "sales_bar":
+                categories, periods = size
+                return rng.random((categories, periods)) * 1000, None
+            count = size
+            if kind == "density":
+                return None, rng.standard_normal(count).cumsum()
+            labels = np.array([f"L{i}" for i in range(count)])
+            return labels, rng.random(count) * 100 + 1
+
+        labels, values = _timed(phases, "data", make_data)
+        buffer = io.BytesIO()
+
+        def render():
+            if kind == "line":
+                labexamnga.create_line_plot(labels, values, "o", "red", "red", "-",
+                                            output=buffer, fmt=fmt,
+                                            max_points=labexamnga.DEFAULT_MAX_POINTS)
+            elif kind == "bar":
+                labexamnga.create_bar_graph(labels, values, 0.5, ["blue"] * len(values),
+                                            output=buffer, fmt=fmt)
+            elif kind == "bar_topn":
+                bar_topn.create_topn_bar_graph(labels, values, output=buffer, fmt=fmt)
+            elif kind == "density":
+                density.create_density_plot(values, output=buffer, fmt=fmt)
+            elif kind == "pie":
+                labexamnga.create_pie_chart(labels, values, [0] * len(values),
+                                            ["blue"] * len(values), "/", output=buffer, fmt=fmt)
+            elif kind == "sales_pie":
+                labact.create_pie_chart(*values, categories=labels, output=buffer, fmt=fmt)
+            else:
+                matrix = labels
+                categories = [f"C{i}" for i in range(len(matrix))]
+                labact.create_bar_chart(*matrix, categories=categories, output=buffer, fmt=fmt)
+            phases["bytes"] = buffer.tell()
+        return render
+    return run
+
+
+def _input_case(kind, size):
+    """Build the function that sets up one scripted-stdin case and returns its parse call"""
+    def run(phases):
+        import labexamnga
+        import LabAct_WIthErrorHandling as labact
+
+        if kind == "get_valid_input":
+            # Every tenth answer is rejected once before a valid one follows.
+            answers = []
+            for i in range(size):
+                if i % 10 == 0:
+                    answers.append("abc" if i % 20 == 0 else "-5")
+                answers.append(f"{i * 1.5}")
+            script = "\n".join(answers) + "\n"
+
+            def parse():
+                return [labact.get_valid_input("") for _ in range(size)]
+        else:
+            lines = ["", str(size)]
+            for i in range(size):
+                lines += [f"label {i}", f"{i * 0.25}"]
+            script = "\n".join(lines) + "\n"
+
+            def parse():
+                return labexamnga.get_data_points()
+
+        def run_parse():
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                old_stdin = sys.stdin
+                sys.stdin = io.StringIO(script)
+                try:
+                    parse()
+                finally:
+                    sys.stdin = old_stdin
+        return run_parse
+    return run
+
+
+def _parse_case(size):
+    """Build the function that sets up one column of sales strings and returns its parse call"""
+    def run(phases):
+        from sales_validate import parse_sales
+
+        def make_column():
+            # Mixed formats, with one bad value in every thousand.
+            column = []
+            for i in range(size):
+                amount = i * 12.5
+                if i % 1000 == 999:
+                    column.append("n/a" if i % 2000 == 999 else f"-{amount}")
+                elif i % 3 == 0:
+                    column.append(f"₱{amount:,.2f}")
+                elif i % 3 == 1:
+                    column.append(f"${amount:.2f}")
+                else:
+                    column.append(f"{amount}")
+            return column
+
+        column = _timed(phases, "data", make_column)
+        return lambda: parse_sales(column)
+    return run
+
+
+def all_cases():
+    """Every benchmark case by name"""
+    cases = {}
+    for fmt in FORMATS:
+        for size in LINE_SIZES:
+            cases[f"line/{size}/{fmt}"] = _chart_case("line", size, fmt)
+        for size in BAR_SIZES:
+            cases[f"bar/{size}/{fmt}"] = _chart_case("bar", size, fmt)
+        for size in TOPN_SIZES:
+            cases[f"bar_topn/{size}/{fmt}"] = _chart_case("bar_topn", size, fmt)
+        for size in DENSITY_SIZES:
+            cases[f"density/{size}/{fmt}"] = _chart_case("density", size, fmt)
+        for size in PIE_SIZES:
+            cases[f"pie/{size}/{fmt}"] = _chart_case("pie", size, fmt)
+            cases[f"sales_pie/{size}/{fmt}"] = _chart_case("sales_pie", size, fmt)
+        for size in SALES_SIZES:
+            cases[f"sales_bar/{size[0]}x{size[1]}/{fmt}"] = _chart_case("sales_bar", size, fmt)
+    for size in INPUT_SIZES:
+        cases[f"get_valid_input/{size}"] = _input_case("get_valid_input", size)
+        cases[f"get_data_points/{size}"] = _input_case("get_data_points", size)
+    for size in PARSE_SIZES:
+        cases[f"parse_sales/{size}"] = _parse_case(size)
+    return cases
+
+
+# ==================== RUNNING ====================
+
+def run_case_here(name, repeats):
+    """Run one case in this process and return its measurements"""
+    import resource
+
+    import profiling
+
+    case = all_cases()[name]
+    case({})()  # warm-up: imports, font cache
+    profiling.enable()
+
+    times = []
+    phase_runs = []
+    for _ in range(repeats):
+        phases = {}
+        measured = case(phases)  # data setup is not part of the wall time
+        profiling.reset()
+        start = time.perf_counter()
+        measured()
+        times.append(time.perf_counter() - start)
+        for span_name, seconds in profiling.totals().items():
+            phases[f"render.{span_name}"] = seconds
+        phase_runs.append(phases)
+
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    phases = {key: statistics.median(run[key] for run in phase_runs) for key in phase_runs[0]}
+    return {"wall": statistics.median(times), "peak_rss_mb": peak_kb / 1024, "phases": phases}
+
+
+def run_case(name, repeats):
+    """Run one case in a fresh headless Python process"""
+    env = dict(os.environ, MPLBACKEND="Agg")
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--run-case", name, "--repeats", str(repeats)],
+        cwd=HERE, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"case {name} failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def compare(results, baseline, threshold):
+    """
+    Find cases that regressed against the baseline.
+
+    Returns:
+        list[str]: one message per regression.
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        limit = 1 + threshold
+        if result["wall"] > base["wall"] * limit:
+            regressions.append(f"{name}: wall {result['wall']:.4f}s vs baseline {base['wall']:.4f}s")
+        if result["peak_rss_mb"] > base["peak_rss_mb"] * limit:
+            regressions.append(f"{name}: peak RSS {result['peak_rss_mb']:.1f}MB "
+                               f"vs baseline {base['peak_rss_mb']:.1f}MB")
+    return regressions
+
+
+def print_results(results, baseline):
+    """Print the results table"""
+    print("\n" + "=" * 78)
+    print("BENCHMARK SUITE")
+    print("=" * 78)
+    print(f"{'case':<32} {'wall s':>9} {'baseline':>9} {'RSS MB':>8}  phases")
+    for name, result in results.items():
+        base = baseline.get(name, {}).get("wall")
+        base_text = f"{base:.4f}" if base is not None else "-"
+        phases = " ".join(f"{k}={v:.4f}" for k, v in result["phases"].items() if k != "bytes")
+        print(f"{name:<32} {result['wall']:>9.4f} {base_text:>9} {result['peak_rss_mb']:>8.1f}  {phases}")
+    print("=" * 78)
+
+
+# ==================== PROGRAM ENTRY POINT ====================
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark chart builders and input paths.")
+    parser.add_argument("--only", help="run only cases whose name contains this text")
+    parser.add_argument("--repeats", type=int, default=5, help="timed repeats per case")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown before failing (default: 0.25 = 25%%)")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="write the results as the new baseline")
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    parser.add_argument("--run-case", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_case:
+        print(json.dumps(run_case_here(args.run_case, args.repeats)))
+        return 0
+
+    names = [name for name in all_cases() if not args.only or args.only in name]
+    results = {name: run_case(name, args.repeats) for name in names}
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        merged = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                merged = json.load(f)
+        merged.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(merged, f, indent=2, sort_keys=True)
+        print(f"Saved baseline for {len(results)} cases to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
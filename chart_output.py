@@ -0,0 +1,113 @@
+"""
+Shared output helpers for the chart programs.
+
+matplotlib.pyplot is slow to import, so the programs use the lazy plt
+object from this module instead: pyplot (and its backend) is only loaded
+the first time a chart is actually drawn, and the menus come up straight
+away. When there is no display to draw on, the Agg backend is selected
+automatically so charts can still be saved.
+
+Chart functions take their figures from new_figure() (re-exported from
+figure_manager.py) and finish_figure() hands them back once shown or saved,
+so long sessions do not pile up open figures. Layout goes through
+layout_cache.py, which only runs tight_layout for layouts it has not seen.
+"""
+
+import os
+import sys
+
+from figure_manager import new_figure, release_figure
+from layout_cache import apply_layout
+from profiling import count, span
+
+_pyplot = None
+_output_dir = None
+_output_fmt = "png"
+_saved = []
+
+
+# ==================== LAZY PYPLOT ====================
+
+def is_headless():
+    """True when there is no display for an interactive backend"""
+    if sys.platform in ("win32", "darwin"):
+        return False
+    return not (os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+
+
+def load_pyplot():
+    """Import matplotlib.pyplot on first use (selecting Agg when headless)"""
+    global _pyplot
+    if _pyplot is None:
+        import matplotlib
+        if is_headless() and not os.environ.get("MPLBACKEND"):
+            matplotlib.use("Agg")
+        import matplotlib.pyplot
+        _pyplot = matplotlib.pyplot
+    return _pyplot
+
+
+class _LazyPyplot:
+    """Stand-in for matplotlib.pyplot that imports it on first attribute access"""
+
+    def __getattr__(self, name):
+        return getattr(load_pyplot(), name)
+
+
+plt = _LazyPyplot()
+
+
+# ==================== OUTPUT FUNCTIONS ====================
+
+def save_charts_to(directory, fmt="png"):
+    """
+    Save charts that would be shown into a directory instead.
+
+    Charts are numbered chart_001, chart_002, ... in the order they are
+    finished. Pass None to go back to showing them.
+    """
+    global _output_dir, _output_fmt
+    _output_dir = directory
+    _output_fmt = fmt
+    _saved.clear()
+    if directory is not None:
+        os.makedirs(directory, exist_ok=True)
+
+
+def saved_charts():
+    """Paths written since save_charts_to() was called"""
+    return list(_saved)
+
+
+def finish_figure(output=None, fmt=None, dpi=None):
+    """
+    Lay out the current figure, either show it or write it out, and hand
+    it back to the figure manager.
+
+    Args:
+    output: file path or binary file object to save to. When None the
+        figure is shown with plt.show() like the interactive program does
+        (or saved into the save_charts_to() directory, when one is set).
+    fmt (str): image format ('png', 'svg', ...). Inferred from the file
+        name when not given.
+    dpi (int): resolution for raster output (optional).
+    """
+    if output is None and _output_dir is not None:
+        fmt = fmt or _output_fmt
+        output = os.path.join(_output_dir, f"chart_{len(_saved) + 1:03d}.{fmt}")
+        _saved.append(output)
+
+    fig = plt.gcf()
+    with span("layout"):
+        apply_layout(fig)
+
+    if output is None:
+        with span("show"):
+            plt.show()
+        release_figure(fig)
+        return
+
+    with span("savefig"):
+        fig.savefig(output, format=fmt, dpi=dpi)
+    release_figure(fig)
+    count("charts")
@@ -0,0 +1,437 @@
+"""
+Local chart-rendering service.
+
+Lets other tools ask for charts over HTTP (on a TCP port or a Unix
+socket) instead of starting a Python process per chart. Requests are
+chart jobs in the batch_render.py format, so every parameter of
+create_line_plot, create_bar_graph, create_pie_chart (kinds line, bar,
+pie) and the LabAct create_bar_chart/create_pie_chart (sales_bar,
+sales_pie) can be sent.
+
+    POST /render[?format=png|svg]   body: one JSON job -> image bytes
+    GET  /stats                     queue depth, counters, latency percentiles
+    GET  /health                    "ok" (503 while the worker pool restarts)
+
+Jobs go through a bounded queue to a pool of pre-warmed render workers
+(parallel_render.start_pool). When the queue is full the service answers
+429 Too Many Requests with a Retry-After header straight away instead of
+letting latency grow without limit. If a worker dies, the pool is
+replaced and the job that was running is tried once more on the new pool.
+Workers are never forked from the service process itself, so they do not
+hold copies of its listening and client sockets.
+Latency is measured from the moment a
+request is read until its response is ready (queueing plus rendering).
+
+Usage:
+    python chart_service.py --port 8765 --workers 4 --queue 64
+    python chart_service.py --unix /tmp/charts.sock
+    curl -X POST --data '{"kind": "bar", "labels": ["a", "b"], "values": [1, 2]}' \\
+        localhost:8765/render?format=svg -o chart.svg
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import statistics
+import sys
+import time
+from collections import deque
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import parse_qs, urlsplit
+
+import batch_render
+import parallel_render
+
+DEFAULT_PORT = 8765
+DEFAULT_QUEUE = 64
+LATENCY_WINDOW = 2048
+MAX_BODY = 16 * 1024 * 1024
+MAX_HEADERS = 100
+CONTENT_TYPES = {"png": "image/png", "svg": "image/svg+xml"}
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 429: "Too Many Requests",
+           431: "Request Header Fields Too Large", 500: "Internal Server Error",
+           503: "Service Unavailable"}
+
+
+# ==================== STATS ====================
+
+class ServiceStats:
+    """Request counters and a sliding window of latencies"""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.started = time.time()
+        self.requests = 0
+        self.rendered = 0
+        self.failed = 0
+        self.rejected = 0
+        self.latencies = deque(maxlen=window)
+
+    def record(self, seconds):
+        self.latencies.append(seconds)
+
+    def percentiles(self):
+        """p50/p90/p99/max latency in milliseconds over the window"""
+        if not self.latencies:
+            return {"p50_ms": None, "p90_ms": None, "p99_ms": None, "max_ms": None}
+        samples = sorted(self.latencies)
+        if len(samples) == 1:
+            cuts = samples * 99
+        else:
+            cuts = statistics.quantiles(samples, n=100, method="inclusive")
+        return {"p50_ms": cuts[49] * 1000, "p90_ms": cuts[89] * 1000,
+                "p99_ms": cuts[98] * 1000, "max_ms": samples[-1] * 1000}
+
+
+# ==================== SERVICE ====================
+
+class ChartService:
+    """Queues render requests and runs them on a warmed worker pool"""
+
+    def __init__(self, workers=None, queue_size=DEFAULT_QUEUE, fmt="png", cache_dir=None):
+        """
+        Args:
+        workers (int): render processes (defaults to the CPU count).
+        queue_size (int): requests allowed to wait for a worker; beyond
+            that new requests get 429.
+        fmt (str): format when a request does not name one.
+        cache_dir (str): shared render cache directory (optional).
+        """
+        self.workers = workers or parallel_render.default_workers()
+        self.queue_size = queue_size
+        self.fmt = fmt
+        self.cache_dir = cache_dir
+        self.stats = ServiceStats()
+        self.pool = None
+        self.healthy = False
+        self._queue = None
+        self._dispatchers = []
+        self._restart_lock = asyncio.Lock()
+
+    async def start(self):
+        """Start and warm up the worker pool, then the dispatchers"""
+        loop = asyncio.get_running_loop()
+        self.pool = await loop.run_in_executor(
+            None, parallel_render.start_pool, self.workers, self.fmt, self.cache_dir,
+            _worker_context())
+        self.healthy = True
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """Stop taking work and shut the pool down"""
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+
+    async def _dispatch(self):
+        """Feed queued jobs to the pool, one at a time per worker"""
+        while True:
+            job, fmt, future = await self._queue.get()
+            try:
+                result = await self._run(job, fmt)
+                if not future.done():
+                    future.set_result(result)
+            except Exception as e:  # a crashed worker must not kill the dispatcher
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job, fmt):
+        """
+        Render one job on the pool.
+
+        A worker that dies leaves the pool broken for good, so the pool is
+        replaced and the job tried once more; if it breaks the new pool
+        too, BrokenProcessPool is raised for this job only.
+        """
+        loop = asyncio.get_running_loop()
+        for attempt in (1, 2):
+            pool = self.pool
+            try:
+                return await loop.run_in_executor(
+                    pool, parallel_render._render_one, (job, None, fmt))
+            except BrokenProcessPool:
+                await self._restart_pool(pool)
+                if attempt == 2:
+                    raise
+
+    async def _restart_pool(self, broken):
+        """Replace a broken pool (once, however many dispatchers saw it break)"""
+        async with self._restart_lock:
+            if self.pool is not broken:
+                return
+            self.healthy = False
+            broken.shutdown(wait=False, cancel_futures=True)
+            loop = asyncio.get_running_loop()
+            self.pool = await loop.run_in_executor(
+                None, parallel_render.start_pool, self.workers, self.fmt, self.cache_dir,
+            _worker_context())
+            self.healthy = True
+
+    def submit(self, job, fmt):
+        """
+        Queue a job.
+
+        Returns:
+            asyncio.Future resolving to (bytes, error), or None when the
+            queue is full.
+        """
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((job, fmt, future))
+        except asyncio.QueueFull:
+            return None
+        return future
+
+    def snapshot(self):
+        """Everything /stats reports"""
+        stats = self.stats
+        return {
+            "uptime_s": time.time() - stats.started,
+            "workers": self.workers,
+            "healthy": self.healthy,
+            "queue_size": self.queue_size,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "requests": stats.requests,
+            "rendered": stats.rendered,
+            "failed": stats.failed,
+            "rejected": stats.rejected,
+            "latency": stats.percentiles(),
+        }
+
+    # ==================== HTTP ====================
+
+    async def handle(self, reader, writer):
+        """Serve HTTP/1.1 requests on one connection (keep-alive supported)"""
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body = request
+                status, content_type, payload, extra = await self._route(method, target, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await _write_response(writer, status, content_type, payload, extra, keep_alive)
+                if not keep_alive:
+                    break
+        except _HTTPError as e:
+            await _write_response(writer, e.status, "text/plain", str(e).encode(), {}, False)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _route(self, method, target, body):
+        """Answer one request: (status, content type, payload, extra headers)"""
+        url = urlsplit(target)
+        if url.path == "/health":
+            if not self.healthy:
+                return 503, "text/plain", b"render workers are restarting", {"Retry-After": "1"}
+            return 200, "text/plain", b"ok", {}
+        if url.path == "/stats":
+            return 200, "application/json", json.dumps(self.snapshot()).encode(), {}
+        if url.path != "/render":
+            return 404, "text/plain", b"unknown path", {}
+        if method != "POST":
+            return 405, "text/plain", b"use POST", {"Allow": "POST"}
+        return await self._render(url, body)
+
+    async def _render(self, url, body):
+        """Handle POST /render"""
+        start = time.perf_counter()
+        self.stats.requests += 1
+
+        try:
+            job = json.loads(body)
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            self.stats.failed += 1
+            return 400, "text/plain", f"invalid JSON: {e}".encode(), {}
+        if not isinstance(job, dict):
+            self.stats.failed += 1
+            return 400, "text/plain", b"expected one JSON job object", {}
+
+        fmt = parse_qs(url.query).get("format", [job.pop("format", self.fmt)])[0]
+        if fmt not in CONTENT_TYPES:
+            self.stats.failed += 1
+            return 400, "text/plain", f"unknown format {fmt!r}".encode(), {}
+        job.pop("data", None)  # no reading server-side files on a client's behalf
+
+        future = self.submit(job, fmt)
+        if future is None:
+            self.stats.rejected += 1
+            return 429, "text/plain", b"render queue is full", {"Retry-After": "1"}
+
+        try:
+            image, error = await future
+        except Exception as e:
+            self.stats.failed += 1
+            return 500, "text/plain", f"render failed: {e}".encode(), {}
+        if error is not None:
+            self.stats.failed += 1
+            return 400, "text/plain", error.encode(), {}
+
+        self.stats.rendered += 1
+        self.stats.record(time.perf_counter() - start)
+        return 200, CONTENT_TYPES[fmt], image, {}
+
+
+def _worker_context():
+    """
+    Start method for render workers: forkserver (spawn where it is missing).
+
+    A forked worker keeps the service's open sockets, so a client whose
+    connection was open when the pool was (re)started never sees it close.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+class _HTTPError(Exception):
+    """Malformed request; answered with its status and the connection closed"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+async def _read_line(reader, status):
+    """Read one line of the request head (longer than the stream limit: status)"""
+    try:
+        return await reader.readline()
+    except ValueError:
+        raise _HTTPError(status, "request line or header too long")
+
+
+async def _read_request(reader):
+    """
+    Read one HTTP request.
+
+    Returns:
+        tuple: (method, target, headers, body), or None at end of stream.
+    """
+    line = await _read_line(reader, 400)
+    if not line:
+        return None
+    try:
+        method, target, _ = line.decode("latin-1").split(" ", 2)
+    except ValueError:
+        raise _HTTPError(400, "malformed request line")
+
+    headers = {}
+    for _ in range(MAX_HEADERS + 1):
+        line = await _read_line(reader, 431)
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    else:
+        raise _HTTPError(431, f"more than {MAX_HEADERS} headers")
+
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise _HTTPError(400, "bad Content-Length")
+    if length < 0:
+        raise _HTTPError(400, "bad Content-Length")
+    if length > MAX_BODY:
+        raise _HTTPError(413, "request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target, headers, body
+
+
+async def _write_response(writer, status, content_type, payload, extra, keep_alive):
+    """Write one HTTP response, streaming the payload in chunks"""
+    head = [f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(payload)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+    head += [f"{name}: {value}" for name, value in extra.items()]
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+    view = memoryview(payload)
+    for offset in range(0, len(view), 64 * 1024):
+        writer.write(view[offset:offset + 64 * 1024])
+        await writer.drain()
+    await writer.drain()
+
+
+# ==================== PROGRAM ENTRY POINT ====================
+
+async def serve(host="127.0.0.1", port=DEFAULT_PORT, unix_path=None, workers=None,
+                queue_size=DEFAULT_QUEUE, fmt="png", cache_dir=None, ready=None):
+    """
+    Run the service until cancelled (or SIGINT/SIGTERM).
+
+    Args:
+    host, port: TCP address to listen on (ignored when unix_path is given).
+    unix_path (str): Unix socket path to listen on instead.
+    workers, queue_size, fmt, cache_dir: see ChartService.
+    ready (asyncio.Event): set once the service is accepting requests.
+    """
+    service = ChartService(workers, queue_size, fmt, cache_dir)
+    await service.start()
+    if unix_path:
+        server = await asyncio.start_unix_server(service.handle, path=unix_path)
+        where = unix_path
+    else:
+        server = await asyncio.start_server(service.handle, host, port)
+        where = f"http://{host}:{server.sockets[0].getsockname()[1]}"
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+
+    print(f"Chart service on {where} ({service.workers} workers, queue {queue_size})")
+    if ready is not None:
+        ready.set()
+    try:
+        async with server:
+            await stop.wait()
+    finally:
+        server.close()
+        await service.stop()
+        if unix_path and os.path.exists(unix_path):
+            os.remove(unix_path)
+    return service
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Serve chart rendering over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="TCP port")
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="render processes (default: number of CPUs)")
+    parser.add_argument("--queue", type=int, default=DEFAULT_QUEUE,
+                        help="requests allowed to wait before answering 429")
+    parser.add_argument("--format", default="png", choices=batch_render.FORMATS,
+                        help="default image format (default: png)")
+    parser.add_argument("--cache", metavar="DIR", help="shared render cache directory")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.workers, args.queue,
+                          args.format, args.cache))
+    except OSError as e:
+        print(f"Error! {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
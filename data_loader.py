@@ -0,0 +1,182 @@
+"""
+Streaming data loader for the chart programs.
+
+Reads labels and values from CSV, TSV or NumPy (.npy/.npz) files in fixed
+size chunks straight into NumPy arrays, so large series never go through
+one input() call (or one Python float) per value.
+
+File layouts:
+    .csv/.tsv/.txt  one row per point: "label,value" or just "value".
+                    A header row is skipped automatically.
+    .npy            1-D array of values (opened memory-mapped).
+    .npz            "values" array and an optional "labels" array.
+
+Rows are checked with the same rules as the prompts in get_data_points():
+every value must be a valid number and there must be at least one point.
+Points without labels get the labels "1", "2", ...
+"""
+
+import os
+from itertools import islice
+
+import numpy as np
+
+CHUNK_ROWS = 65536
+
+
+# ==================== VALIDATION FUNCTIONS ====================
+
+def _to_values(column, first_row, path):
+    """Convert a column of strings to float64, reporting the first bad row"""
+    try:
+        return column.astype(np.float64)
+    except ValueError:
+        pass
+
+    for offset, text in enumerate(column):
+        try:
+            float(text)
+        except ValueError:
+            raise ValueError(
+                f"{path}: row {first_row + offset}: {str(text)!r} is not a valid number."
+            )
+    raise ValueError(f"{path}: invalid number near row {first_row}.")
+
+
+def _check_values(values, path):
+    """Reject values that are not numeric"""
+    if values.dtype.kind not in "iuf":
+        raise ValueError(f"{path}: values must be numeric, got dtype {values.dtype}.")
+    return values.astype(np.float64, copy=False)
+
+
+def _default_labels(start, count):
+    """Labels "start+1" .. "start+count" for unlabeled points"""
+    return np.arange(start + 1, start + count + 1).astype(str)
+
+
+def _is_number(text):
+    """True if the text parses as a number"""
+    try:
+        float(text)
+        return True
+    except ValueError:
+        return False
+
+
+# ==================== CHUNK READERS ====================
+
+def _iter_text_chunks(path, delimiter, chunk_rows):
+    """Yield (labels, values) chunks from a delimited text file"""
+    with open(path, encoding="utf-8") as f:
+        first = f.readline()
+        if not first:
+            return
+
+        fields = first.rstrip("\r\n").split(delimiter)
+        pending = []
+        row = 1     # file line of the next row, for error messages
+        points = 0  # data rows read so far, for default labels
+        if _is_number(fields[-1].strip()):
+            pending.append(first)
+        else:
+            row = 2
+
+        while True:
+            lines = pending + list(islice(f, chunk_rows - len(pending)))
+            pending = []
+            lines = [line for line in lines if line.strip()]
+            if not lines:
+                break
+
+            table = np.loadtxt(lines, delimiter=delimiter, dtype=str,
+                               comments=None, quotechar='"', ndmin=2)
+            table = np.char.strip(table)
+
+            values = _to_values(table[:, -1], row, path)
+            if table.shape[1] > 1:
+                labels = table[:, 0]
+            else:
+                labels = _default_labels(points, len(values))
+
+            yield labels, values
+            row += len(values)
+            points += len(values)
+
+
+def _iter_npy_chunks(path, chunk_rows):
+    """Yield (labels, values) chunks from a memory-mapped .npy file"""
+    data = np.load(path, mmap_mode="r")
+    if data.ndim != 1:
+        raise ValueError(f"{path}: expected a 1-D array of values, got shape {data.shape}.")
+
+    for start in range(0, len(data), chunk_rows):
+        values = _check_values(np.asarray(data[start:start + chunk_rows]), path)
+        yield _default_labels(start, len(values)), values
+
+
+def _iter_npz_chunks(path, chunk_rows):
+    """Yield (labels, values) chunks from a .npz archive"""
+    with np.load(path) as archive:
+        if "values" not in archive:
+            raise ValueError(f"{path}: archive has no 'values' array.")
+        data = archive["values"]
+        labels = archive["labels"] if "labels" in archive else None
+
+    if data.ndim != 1:
+        raise ValueError(f"{path}: expected a 1-D array of values, got shape {data.shape}.")
+    if labels is not None and len(labels) != len(data):
+        raise ValueError(f"{path}: 'labels' and 'values' have different lengths.")
+
+    for start in range(0, len(data), chunk_rows):
+        values = _check_values(data[start:start + chunk_rows], path)
+        if labels is None:
+            chunk_labels = _default_labels(start, len(values))
+        else:
+            chunk_labels = labels[start:start + chunk_rows].astype(str)
+        yield chunk_labels, values
+
+
+# ==================== LOADER FUNCTIONS ====================
+
+def iter_chunks(path, chunk_rows=CHUNK_ROWS):
+    """
+    Stream a data file in chunks.
+
+    Args:
+    path (str): CSV, TSV, .npy or .npz file.
+    chunk_rows (int): maximum rows per chunk.
+
+    Yields:
+        tuple: (labels, values) as a str array and a float64 array.
+    """
+    ext = os.path.splitext(path)[1].lower()
+
+    if ext == ".npy":
+        return _iter_npy_chunks(path, chunk_rows)
+    if ext == ".npz":
+        return _iter_npz_chunks(path, chunk_rows)
+    if ext == ".tsv":
+        return _iter_text_chunks(path, "\t", chunk_rows)
+    return _iter_text_chunks(path, ",", chunk_rows)
+
+
+def load_data(path, chunk_rows=CHUNK_ROWS):
+    """
+    Load a whole data file into arrays.
+
+    Returns:
+        tuple: (labels, values) NumPy arrays ready for the chart functions.
+    """
+    label_chunks = []
+    value_chunks = []
+    for labels, values in iter_chunks(path, chunk_rows):
+        label_chunks.append(labels)
+        value_chunks.append(values)
+
+    if not value_chunks:
+        raise ValueError(f"{path}: You must have at least one data point.")
+
+    if len(value_chunks) == 1:
+        return label_chunks[0], value_chunks[0]
+    return np.concatenate(label_chunks), np.concatenate(value_chunks)
@@ -0,0 +1,160 @@
+"""
+Level-of-detail downsampling for line plots.
+
+A line plot is only ever drawn a couple of thousand pixels wide, so series
+with millions of points can be reduced to a few thousand before plotting
+without changing what ends up on screen. Both methods return the indices
+of the points to keep (always including the first and last point), so the
+matching labels can be picked with the same indices.
+
+Methods:
+    lttb    Largest-Triangle-Three-Buckets. Keeps n_out points, choosing in
+            each bucket the point that forms the largest triangle with its
+            neighbours. Good general-purpose shape preservation.
+    minmax  Keeps the minimum and maximum of every pixel-wide bucket, so
+            the highest and lowest point of every pixel column survive.
+
+shape_error() measures how far a decimated line strays from the original
+on screen, per pixel column. For continuous series (random walks, sensor
+readings, anything smoother than white noise) both methods stay within
+SHAPE_TOLERANCE at one bucket per pixel; uncorrelated noise is the worst
+case. bench_decimation.py reports the error next to the timings.
+"""
+
+import numpy as np
+
+METHODS = ("lttb", "minmax")
+
+# Shape error (fraction of the value range, per pixel column) decimated
+# continuous series are expected to stay within.
+SHAPE_TOLERANCE = 0.05
+
+
+# ==================== DECIMATION FUNCTIONS ====================
+
+def _bucket_edges(n, n_buckets):
+    """Start index of each bucket over the points 1..n-2 (plus the end)"""
+    every = (n - 2) / n_buckets
+    edges = (np.arange(n_buckets + 1) * every).astype(np.int64) + 1
+    edges[-1] = n - 1
+    return edges
+
+
+def lttb(values, n_out, x=None):
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Args:
+    values: 1-D array of y values.
+    n_out (int): number of points to keep (at least 3).
+    x: 1-D array of x values (defaults to the point index).
+
+    Returns:
+        numpy.ndarray: sorted indices of the points to keep.
+    """
+    y = np.asarray(values, dtype=np.float64)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.arange(n, dtype=np.float64) if x is None else np.asarray(x, dtype=np.float64)
+
+    edges = _bucket_edges(n, n_out - 2)
+    counts = np.diff(edges)
+
+    # Average point of every bucket, computed in one pass; the last
+    # bucket's "next" neighbour is the final point itself.
+    avg_x = np.add.reduceat(x[:-1], edges[:-1]) / counts
+    avg_y = np.add.reduceat(y[:-1], edges[:-1]) / counts
+    next_x = np.append(avg_x[1:], x[-1])
+    next_y = np.append(avg_y[1:], y[-1])
+
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0] = 0
+    keep[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        bx = x[start:stop]
+        by = y[start:stop]
+        area = np.abs((x[a] - next_x[i]) * (by - y[a]) - (x[a] - bx) * (next_y[i] - y[a]))
+        a = start + int(np.argmax(area))
+        keep[i + 1] = a
+
+    return keep
+
+
+def minmax(values, n_buckets):
+    """
+    Min/max-per-bucket downsampling.
+
+    Args:
+    values: 1-D array of y values.
+    n_buckets (int): number of buckets, normally the plot width in pixels.
+
+    Returns:
+        numpy.ndarray: sorted, unique indices of the points to keep
+        (at most 2 * n_buckets + 2).
+    """
+    y = np.asarray(values, dtype=np.float64)
+    n = len(y)
+    if n_buckets < 1 or 2 * n_buckets + 2 >= n:
+        return np.arange(n)
+
+    size = -(-n // n_buckets)
+    padded = np.pad(y, (0, size * n_buckets - n), mode="edge").reshape(n_buckets, size)
+
+    base = np.arange(n_buckets) * size
+    low = np.minimum(base + padded.argmin(axis=1), n - 1)
+    high = np.minimum(base + padded.argmax(axis=1), n - 1)
+
+    return np.unique(np.concatenate(([0], low, high, [n - 1])))
+
+
+def decimate(values, max_points, method="lttb"):
+    """
+    Reduce a series to at most max_points points.
+
+    minmax keeps two points per bucket, so it uses max_points // 2 buckets.
+
+    Returns:
+        numpy.ndarray: sorted indices of the points to keep.
+    """
+    if method == "lttb":
+        return lttb(values, max_points)
+    if method == "minmax":
+        return minmax(values, max(1, max_points // 2))
+    raise ValueError(f"unknown decimation method {method!r} (expected one of {METHODS}).")
+
+
+# ==================== QUALITY CHECK ====================
+
+def _column_envelope(y, width):
+    """Min and max of y inside each of width equal pixel columns"""
+    size = -(-len(y) // width)
+    columns = -(-len(y) // size)
+    padded = np.pad(y, (0, size * columns - len(y)), mode="edge").reshape(columns, size)
+    return padded.min(axis=1), padded.max(axis=1)
+
+
+def shape_error(values, keep, width=2000):
+    """
+    How far the decimated line strays from the original on screen.
+
+    The decimated points are linearly interpolated back onto every original
+    index (which is what the drawn line does), then the min/max envelope of
+    each of width pixel columns is compared with the original's envelope.
+    Use the number of buckets the series was decimated to as the width.
+
+    Returns:
+        float: worst envelope difference as a fraction of the value range.
+    """
+    y = np.asarray(values, dtype=np.float64)
+    span = np.ptp(y)
+    if span == 0 or len(keep) == len(y):
+        return 0.0
+
+    approx = np.interp(np.arange(len(y)), keep, y[keep])
+    low, high = _column_envelope(y, width)
+    approx_low, approx_high = _column_envelope(approx, width)
+    worst = max(np.max(np.abs(low - approx_low)), np.max(np.abs(high - approx_high)))
+    return float(worst / span)
@@ -0,0 +1,273 @@
+"""
+Density (binned raster) plots for very dense line and scatter data.
+
+Tens of millions of points drawn as lines or markers turn into a solid
+blob, and vector output grows with every point. This module instead
+counts how many points (or how much line) fall into each pixel of a fixed
+grid and shows the counts with imshow, so the picture, the file size and
+the drawing time depend on the grid resolution only.
+
+    grid = DensityGrid((0, 1e6), (-50, 50), shape=(480, 800))
+    for x, y in chunks:
+        grid.add_line(x, y)
+    create_density_plot(grid=grid, output="density.png")
+
+Binning uses np.bincount on flattened pixel indices (the same counts as
+np.histogram2d, without its per-call bin search). Lines are rasterized by
+sampling every segment about once per pixel it crosses. Segments and
+samples are both processed in blocks of at most SAMPLE_BLOCK, so working
+memory stays fixed however much is added.
+density_from_file() streams a data file through the grid in chunks.
+"""
+
+import numpy as np
+
+from chart_output import finish_figure, new_figure, plt
+from profiling import count, profiled, span
+
+DEFAULT_SHAPE = (480, 800)
+SAMPLE_BLOCK = 1 << 20
+DEFAULT_CMAP = "viridis"
+
+
+# ==================== BINNING ====================
+
+class DensityGrid:
+    """Running per-pixel counts over a fixed x/y range"""
+
+    def __init__(self, x_range, y_range, shape=DEFAULT_SHAPE):
+        """
+        Args:
+        x_range, y_range: (low, high) data range covered by the grid.
+        shape: (rows, columns) of the grid, i.e. the image resolution.
+        """
+        self.x_range = _check_range(x_range, "x")
+        self.y_range = _check_range(y_range, "y")
+        self.shape = (int(shape[0]), int(shape[1]))
+        self.counts = np.zeros(self.shape, dtype=np.int64)
+        self.points = 0
+        self._last = None
+
+    def _pixels(self, x, y):
+        """Fractional pixel coordinates (column, row) of data points"""
+        rows, columns = self.shape
+        (x0, x1), (y0, y1) = self.x_range, self.y_range
+        px = (np.asarray(x, dtype=np.float64) - x0) * (columns / (x1 - x0))
+        py = (np.asarray(y, dtype=np.float64) - y0) * (rows / (y1 - y0))
+        return px, py
+
+    def _add_pixels(self, px, py):
+        """Count samples at fractional pixel coordinates, dropping any outside the grid"""
+        rows, columns = self.shape
+        # The top edge of the range belongs to the last row/column.
+        inside = (px >= 0) & (px <= columns) & (py >= 0) & (py <= rows)
+        column = np.minimum(px[inside].astype(np.intp), columns - 1)
+        row = np.minimum(py[inside].astype(np.intp), rows - 1)
+        flat = row * columns + column
+        self.counts += np.bincount(flat, minlength=rows * columns).reshape(self.shape)
+
+    def add_points(self, x, y):
+        """Count each (x, y) point in its pixel (scatter data)"""
+        px, py = self._pixels(x, y)
+        self._add_pixels(px, py)
+        self.points += px.size
+
+    def add_segments(self, x0, y0, x1, y1):
+        """
+        Count the pixels crossed by each segment from (x0, y0) to (x1, y1).
+
+        A segment covers its start pixel but not its end one, so a line's
+        segments do not count the points they share twice.
+        """
+        for start in range(0, len(x0), SAMPLE_BLOCK):
+            stop = start + SAMPLE_BLOCK
+            self._rasterize(x0[start:stop], y0[start:stop], x1[start:stop], y1[start:stop])
+
+    def _rasterize(self, x0, y0, x1, y1):
+        """Count the pixels crossed by one block of segments"""
+        ax, ay = self._pixels(x0, y0)
+        bx, by = self._pixels(x1, y1)
+        dx, dy = bx - ax, by - ay
+
+        # One sample per pixel crossed (capped at the grid size), at least one.
+        longest = max(self.shape)
+        steps = np.ceil(np.maximum(np.abs(dx), np.abs(dy)))
+        steps = np.clip(np.nan_to_num(steps, nan=1.0), 1, longest).astype(np.intp)
+
+        # Sample SAMPLE_BLOCK points (or one very long segment) at a time.
+        ends = np.cumsum(steps)
+        first = 0
+        while first < steps.size:
+            done = ends[first - 1] if first else 0
+            last = max(first + 1, int(np.searchsorted(ends, done + SAMPLE_BLOCK, side="right")))
+            block = steps[first:last]
+            segment = np.repeat(np.arange(first, last), block)
+            step = np.arange(segment.size) - np.repeat(np.cumsum(block) - block, block)
+            t = step / steps[segment]
+            self._add_pixels(ax[segment] + dx[segment] * t, ay[segment] + dy[segment] * t)
+            first = last
+
+    def add_line(self, x, y, continues=False):
+        """
+        Count one line through the points (x, y).
+
+        With continues=True the line is joined to the last point of the
+        previous add_line call, so a long series can be added chunk by chunk.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if continues and self._last is not None:
+            x = np.concatenate(([self._last[0]], x))
+            y = np.concatenate(([self._last[1]], y))
+            self.points -= 1
+        if x.size == 1:
+            self.add_points(x, y)
+        elif x.size > 1:
+            self.add_segments(x[:-1], y[:-1], x[1:], y[1:])
+            self.points += x.size
+        if x.size:
+            self._last = (x[-1], y[-1])
+
+    def add_series(self, values, x=None):
+        """Count every row of a (series, points) array as its own line"""
+        values = np.asarray(values, dtype=np.float64)
+        if values.ndim != 2:
+            raise ValueError("Series values must be a 2-D (series, points) array.")
+        if x is None:
+            x = np.arange(values.shape[1], dtype=np.float64)
+        x = np.broadcast_to(np.asarray(x, dtype=np.float64), values.shape)
+        if values.shape[1] == 1:
+            self.add_points(x.ravel(), values.ravel())
+            return
+        self.add_segments(x[:, :-1].ravel(), values[:, :-1].ravel(),
+                          x[:, 1:].ravel(), values[:, 1:].ravel())
+        self.points += values.size
+
+    def image(self):
+        """Counts as an image array, with empty pixels masked"""
+        return np.ma.masked_equal(self.counts, 0)
+
+    def extent(self):
+        """imshow extent covering the grid's data range"""
+        return (*self.x_range, *self.y_range)
+
+
+def _check_range(bounds, axis):
+    """Validate a (low, high) range, widening a zero-width one"""
+    low, high = (float(b) for b in bounds)
+    if not (np.isfinite(low) and np.isfinite(high)) or high < low:
+        raise ValueError(f"Invalid {axis} range ({low}, {high}).")
+    if high == low:
+        low, high = low - 0.5, high + 0.5
+    return low, high
+
+
+def value_range(values):
+    """(min, max) of the finite values in an array"""
+    values = np.asarray(values, dtype=np.float64)
+    finite = values[np.isfinite(values)]
+    if finite.size == 0:
+        raise ValueError("No finite values to plot.")
+    return finite.min(), finite.max()
+
+
+def density_from_file(path, shape=DEFAULT_SHAPE, kind="lines", chunk_rows=None):
+    """
+    Bin a CSV/TSV/.npy/.npz data file into a DensityGrid, chunk by chunk.
+
+    The file is read twice: once for the value range, once to bin. x is the
+    row number. Only one chunk is in memory at a time.
+
+    Args:
+    path (str): data file (see data_loader.py).
+    shape: (rows, columns) of the grid.
+    kind (str): "lines" to join consecutive values, "points" to bin each
+        value on its own.
+    chunk_rows (int): rows per chunk (data_loader's default when None).
+
+    Returns:
+        DensityGrid: the filled grid.
+    """
+    from data_loader import CHUNK_ROWS, iter_chunks
+
+    if kind not in ("lines", "points"):
+        raise ValueError(f"Unknown density kind '{kind}' (expected 'lines' or 'points').")
+    chunk_rows = chunk_rows or CHUNK_ROWS
+
+    total = 0
+    low, high = np.inf, -np.inf
+    for _, values in iter_chunks(path, chunk_rows):
+        if values.size:
+            chunk_low, chunk_high = value_range(values)
+            low, high = min(low, chunk_low), max(high, chunk_high)
+        total += values.size
+    if total == 0:
+        raise ValueError(f"{path}: no data points.")
+
+    grid = DensityGrid((0, max(total - 1, 1)), (low, high), shape)
+    start = 0
+    for _, values in iter_chunks(path, chunk_rows):
+        x = np.arange(start, start + values.size, dtype=np.float64)
+        if kind == "lines":
+            grid.add_line(x, values, continues=True)
+        else:
+            grid.add_points(x, values)
+        start += values.size
+    return grid
+
+
+# ==================== DRAWING ====================
+
+@profiled("create_density_plot")
+def create_density_plot(values=None, x=None, grid=None, kind="lines", shape=DEFAULT_SHAPE,
+                        cmap=DEFAULT_CMAP, log=True, output=None, fmt=None):
+    """
+    Density plot of dense line or scatter data.
+
+    Pass either values (a 1-D series, or a 2-D (series, points) array drawn
+    as one line per row) or a grid that was already filled, e.g. by
+    density_from_file().
+
+    Args:
+    values: y values.
+    x: x positions (default 0, 1, 2, ...).
+    grid (DensityGrid): counts to show instead of values.
+    kind (str): "lines" or "points" (how values are binned).
+    shape: (rows, columns) of the grid when binning values.
+    cmap (str): matplotlib colormap name.
+    log (bool): color by log of the count, so sparse areas stay visible.
+    output, fmt: where to save the chart (see chart_output.finish_figure).
+    """
+    if kind not in ("lines", "points"):
+        raise ValueError(f"Unknown density kind '{kind}' (expected 'lines' or 'points').")
+
+    with span("prepare"):
+        if grid is None:
+            if values is None:
+                raise ValueError("Pass either values or a grid.")
+            values = np.asarray(values, dtype=np.float64)
+            if x is None:
+                x = np.arange(values.shape[-1], dtype=np.float64)
+            grid = DensityGrid(value_range(x), value_range(values), shape)
+            if values.ndim == 2 and kind == "lines":
+                grid.add_series(values, x)
+            elif kind == "lines":
+                grid.add_line(x, values)
+            else:
+                grid.add_points(np.broadcast_to(x, values.shape).ravel(), values.ravel())
+    count("points", grid.points)
+
+    with span("artists"):
+        from matplotlib.colors import LogNorm, Normalize
+
+        image = grid.image()
+        high = max(int(grid.counts.max()), 1)
+        norm = LogNorm(1, max(high, 2)) if log else Normalize(0, high)
+        new_figure((10, 6))
+        shown = plt.imshow(image, origin='lower', extent=grid.extent(), aspect='auto',
+                           interpolation='nearest', cmap=cmap, norm=norm)
+        plt.colorbar(shown, label='Count per pixel')
+        plt.xlabel('Labels')
+        plt.ylabel('Values')
+        plt.title(f'Density Plot ({grid.points:,} points)')
+    finish_figure(output, fmt)
@@ -0,0 +1,214 @@
+"""
+Figure lifecycle management for long-running chart programs.
+
+pyplot keeps every figure it creates until plt.close() is called on it.
+The interactive menus can run for a whole session, and the batch and
+service paths render thousands of charts in one process, so figures that
+are never closed add up to steadily growing memory.
+
+The chart functions get their figures from new_figure() and hand them back
+through release_figure() (finish_figure does this after saving/showing).
+A released figure is cleared and kept in a small pool for the next chart
+instead of being rebuilt, and the number of live figures is capped: when
+a new figure would go over MAX_FIGURES, the oldest ones are closed.
+
+    from figure_manager import figure_stats
+    figure_stats()   # {'live': 1, 'pooled': 1, 'created': 3, 'reused': 40, ...}
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+from profiling import count
+
+MAX_FIGURES = 4
+MAX_POOLED = 2
+
+
+# ==================== MANAGER ====================
+
+class FigureManager:
+    """Hands out pyplot figures, reusing released ones and capping how many stay open"""
+
+    def __init__(self, max_figures=MAX_FIGURES, max_pooled=MAX_POOLED, reuse=True):
+        """
+        Args:
+        max_figures (int): most figures left open at once (pooled ones included).
+        max_pooled (int): most released figures kept for reuse.
+        reuse (bool): clear and reuse released figures instead of closing them.
+        """
+        if max_figures < 1:
+            raise ValueError("max_figures must be at least 1.")
+        self.max_figures = max_figures
+        self.max_pooled = min(max_pooled, max_figures - 1) if reuse else 0
+        self._pool = []
+        self._live = OrderedDict()
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+        self.closed = 0
+
+    def new_figure(self, figsize=None):
+        """
+        A blank figure of the given size, made the current pyplot figure.
+
+        Returns:
+            matplotlib.figure.Figure
+        """
+        from chart_output import plt
+
+        with self._lock:
+            self._forget_closed(plt)
+            fig = self._pool.pop() if self._pool else None
+            if fig is not None:
+                if figsize is not None:
+                    fig.set_size_inches(figsize)
+                plt.figure(fig.number)
+                self.reused += 1
+                count("figures_reused")
+            else:
+                self._make_room(plt, self.max_figures - 1)
+                fig = plt.figure(figsize=figsize)
+                self.created += 1
+                count("figures_created")
+            self._live[fig.number] = fig
+        return fig
+
+    def release(self, fig):
+        """Give back a figure that is done with: pool it for reuse or close it"""
+        from chart_output import plt
+
+        with self._lock:
+            self._live.pop(fig.number, None)
+            if len(self._pool) < self.max_pooled and plt.fignum_exists(fig.number):
+                fig.clear()
+                # clear() keeps the layout engine tight_layout installed (so
+                # every later savefig would run an extra draw), the margins
+                # it set, and any size/dpi change; start fresh.
+                fig.set_layout_engine(None)
+                fig.subplots_adjust(**_default_margins(plt))
+                fig.set_size_inches(plt.rcParams["figure.figsize"])
+                fig.set_dpi(plt.rcParams["figure.dpi"])
+                self._pool.append(fig)
+            else:
+                self._close(plt, fig)
+
+    def close_all(self):
+        """Close every figure this manager knows about, pooled ones included"""
+        from chart_output import plt
+
+        with self._lock:
+            for fig in self._pool + list(self._live.values()):
+                self._close(plt, fig)
+            self._pool.clear()
+            self._live.clear()
+
+    def stats(self):
+        """
+        Figure counts and process memory.
+
+        Returns:
+            dict: live (figures in use), pooled, open (all pyplot figures),
+            created, reused, closed, rss_mb (current resident memory, or
+            None where it cannot be read) and peak_rss_mb.
+        """
+        import sys
+
+        open_figures = 0
+        pyplot = sys.modules.get("matplotlib.pyplot")
+        if pyplot is not None:
+            open_figures = len(pyplot.get_fignums())
+        with self._lock:
+            return {
+                "live": len(self._live),
+                "pooled": len(self._pool),
+                "open": open_figures,
+                "created": self.created,
+                "reused": self.reused,
+                "closed": self.closed,
+                "rss_mb": current_rss_mb(),
+                "peak_rss_mb": peak_rss_mb(),
+            }
+
+    def _forget_closed(self, plt):
+        """Drop figures that were closed behind the manager's back"""
+        self._pool = [fig for fig in self._pool if plt.fignum_exists(fig.number)]
+        for number in [n for n in self._live if not plt.fignum_exists(n)]:
+            del self._live[number]
+
+    def _make_room(self, plt, limit):
+        """Close pooled, then oldest live, figures until at most limit are open"""
+        while self._pool and len(self._pool) + len(self._live) > limit:
+            self._close(plt, self._pool.pop(0))
+        while self._live and len(self._pool) + len(self._live) > limit:
+            _, fig = self._live.popitem(last=False)
+            self._close(plt, fig)
+
+    def _close(self, plt, fig):
+        plt.close(fig)
+        self.closed += 1
+        count("figures_closed")
+
+
+def _default_margins(plt):
+    """The rcParams subplot margins a new figure starts with"""
+    names = ("left", "right", "bottom", "top", "wspace", "hspace")
+    return {name: plt.rcParams[f"figure.subplot.{name}"] for name in names}
+
+
+# ==================== PROCESS MEMORY ====================
+
+def current_rss_mb():
+    """Current resident set size in MB (None where /proc is not available)"""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def peak_rss_mb():
+    """Peak resident set size in MB (None on platforms without resource)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    import sys
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+# ==================== DEFAULT MANAGER ====================
+
+_manager = FigureManager()
+
+
+def get_manager():
+    """The manager used by new_figure/release_figure"""
+    return _manager
+
+
+def set_manager(manager):
+    """Replace the default manager (returns the previous one)"""
+    global _manager
+    previous, _manager = _manager, manager
+    return previous
+
+
+def new_figure(figsize=None):
+    """A blank current figure from the default manager"""
+    return _manager.new_figure(figsize)
+
+
+def release_figure(fig):
+    """Give a figure back to the default manager"""
+    _manager.release(fig)
+
+
+def figure_stats():
+    """Figure counts and memory from the default manager"""
+    return _manager.stats()
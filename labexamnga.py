@@ -1,4 +1,5 @@
-import matplotlib.pyplot as plt
+from chart_output import finish_figure, new_figure, plt
+from profiling import count, profiled, span
 
 # ==================== HELPER FUNCTIONS ========================
 def get_menu_choice (prompt, options, default_label=None, default_value=None):
@@ -41,8 +42,38 @@ def get_menu_choice (prompt, options, default_label=None, default_value=None):
 
 # ==================== DATA INPUT FUNCTIONS ====================
 
+def get_data_file():
+    """
+    Ask for a CSV/TSV/.npy/.npz data file to load instead of typing values.
+
+    Returns:
+        (labels, values) arrays, or None if the user presses Enter.
+    """
+    while True:
+        path = input("Data file to load (press Enter to type values): ").strip()
+        if path == '':
+            return None
+
+        # Imported here so NumPy only loads when a file is actually used
+        from data_loader import load_data
+        try:
+            labels, values = load_data(path)
+        except OSError as e:
+            print(f"Error! Could not read file: {e.strerror}.")
+            continue
+        except ValueError as e:
+            print(f"Error! {e}")
+            continue
+        print(f"Loaded {len(values)} data points.")
+        return labels, values
+
+
 def get_data_points():
-    """Get data labels and values from user"""
+    """Get data labels and values from user (or from a data file)"""
+    data = get_data_file()
+    if data is not None:
+        return data
+
     labels = []
     values = []
     
@@ -73,21 +104,24 @@ def get_data_points():
 
 
 def get_bar_data():
-    """Get data for bar graph (max 6 bars)"""
+    """Get data for bar graph"""
+    data = get_data_file()
+    if data is not None:
+        return data
+
     labels = []
     values = []
     
     while True:
         try:
-            num_bars = int(input("How many bars (max 6)? "))
+            num_bars = int(input("How many bars? "))
+            if num_bars <= 0:
+                print("Error! You must have at least one bar.")
+                continue
             break
         except ValueError:
             print("Error! Please enter a valid number.")
     
-    if num_bars > 6:
-        print("Maximum 6 bars allowed. Setting to 6...")
-        num_bars = 6
-    
     for i in range(num_bars):
         label = input(f"Enter label for bar {i+1}: ")
         
@@ -139,22 +173,71 @@ def get_line_style():
     ]
     return get_menu_choice("Line Style Options:", options, "Solid", "-")
 
-def create_line_plot(labels, values, marker, color, markercolor, linestyle):
-    """Create and display line plot"""
-    plt.figure(figsize=(10, 6))
-    plt.plot(labels, values, marker=marker, color=color, linestyle=linestyle, 
-             linewidth=2, markersize=15, markerfacecolor=markercolor, 
-             markeredgecolor='black', markeredgewidth=2, alpha=0.7)
-    plt.xlabel('Labels')
-    plt.ylabel('Values')
-    plt.title('Line Plot')
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
-    plt.show()
+# Line plots of loaded files are reduced to this many points before drawing.
+DEFAULT_MAX_POINTS = 2000
+
+# Longer series are plotted by position, with only a few of their labels
+# as ticks, instead of one category tick per point.
+MAX_LABELED_POINTS = 50
+
+@profiled("create_line_plot")
+def create_line_plot(labels, values, marker, color, markercolor, linestyle,
+                     output=None, fmt=None, max_points=None, decimation="lttb"):
+    """
+    Create and display line plot (saved to output instead when given).
+
+    When max_points is given and the series is longer, it is first reduced
+    with decimate() ("lttb" or "minmax"). Series longer than
+    MAX_LABELED_POINTS are plotted by position, and only every few labels
+    are shown as tick labels.
+
+    A 2-D (series, points) array of values is drawn as one line per row,
+    colored from a colormap (see multi_line.py); color and markercolor
+    style the first row, and labels name the points shared by every series.
+    """
+    if getattr(values, 'ndim', 1) == 2:
+        from multi_line import create_multi_line_plot
+        create_multi_line_plot(values, labels, marker=marker, linestyle=linestyle,
+                               output=output, fmt=fmt, color=color, markercolor=markercolor)
+        return
+
+    ticks = None
+    with span("prepare"):
+        decimated = max_points is not None and len(values) > max_points
+        if decimated or len(values) > MAX_LABELED_POINTS:
+            import numpy as np
+
+            if decimated:
+                from decimate import decimate
+                keep = decimate(values, max_points, decimation)
+            else:
+                keep = np.arange(len(values))
+            ticks = keep[np.linspace(0, len(keep) - 1, min(len(keep), 10)).astype(int)]
+            tick_labels = np.asarray(labels)[ticks]
+            labels = keep
+            values = np.asarray(values)[keep]
+    count("points", len(values))
+
+    with span("artists"):
+        new_figure((10, 6))
+        if ticks is not None:
+            plt.xticks(ticks, tick_labels, rotation=45, ha='right')
+        plt.plot(labels, values, marker=marker, color=color, linestyle=linestyle, 
+                 linewidth=2, markersize=15, markerfacecolor=markercolor, 
+                 markeredgecolor='black', markeredgewidth=2, alpha=0.7)
+        plt.xlabel('Labels')
+        plt.ylabel('Values')
+        plt.title('Line Plot')
+        plt.grid(True, alpha=0.3)
+    finish_figure(output, fmt)
 
 
 # ==================== BAR GRAPH FUNCTIONS ====================
 
+# Above this many bars, colors come from a colormap instead of a menu
+# prompt per bar, and only the top bars are drawn (see bar_topn.py).
+MAX_PROMPTED_BARS = 6
+
 def get_bar_width():
     """Get bar width"""
     while True:
@@ -204,20 +287,47 @@ def get_bar_colors(num_bars):
         colors.append(color)
     return colors
 
-def create_bar_graph(labels, values, width, colors):
-    """Create and display bar graph"""
-    plt.figure(figsize=(10, 6))
-    plt.bar(labels, values, width=width, color=colors, edgecolor='black')
-    plt.xlabel('Labels')
-    plt.ylabel('Values')
-    plt.title('Bar Graph')
-    plt.grid(True, alpha=0.3, axis='y')
-    plt.tight_layout()
-    plt.show()
+def get_top_n(num_bars):
+    """Get how many of the largest bars to show before the "Other" bar"""
+    while True:
+        top = input(f"Show how many of the {num_bars} bars (press Enter for 20)? ")
+
+        if top == '':
+            print("Setting to default (20) bars...")
+            return 20
+
+        try:
+            top = int(top)
+        except ValueError:
+            print("Error! Please enter a valid number.")
+            continue
+
+        if top <= 0:
+            print("Error! You must show at least one bar.")
+            continue
+        return top
+
+@profiled("create_bar_graph")
+def create_bar_graph(labels, values, width, colors, output=None, fmt=None):
+    """Create and display bar graph (saved to output instead when given)"""
+    count("points", len(values))
+    with span("artists"):
+        new_figure((10, 6))
+        plt.bar(labels, values, width=width, color=colors, edgecolor='black')
+        plt.xlabel('Labels')
+        plt.ylabel('Values')
+        plt.title('Bar Graph')
+        plt.grid(True, alpha=0.3, axis='y')
+    finish_figure(output, fmt)
 
 
 # ==================== PIE CHART FUNCTIONS ====================
 
+# Above this many slices, colors come from a colormap instead of a menu
+# prompt per slice and small slices are folded into "Other" (see
+# pie_slices.fold_fraction).
+MAX_PROMPTED_SLICES = 12
+
 def get_explode_values(num_slices):
     """Get explode values for pie chart"""
     explode_choice = input("\nDo you want to explode any slice? (yes/no): ").lower()
@@ -276,32 +386,51 @@ def get_hatch_pattern():
     return get_menu_choice("Hatch Pattern Options:", options, default_label="None", default_value="")
 
 
-def create_pie_chart(labels, values, explode, colors, hatch):
-    """Create and display pie chart"""
-    plt.figure(figsize=(10, 8))
-    
-    wedges, texts, autotexts = plt.pie(
-        values, 
-        labels=labels, 
-        explode=explode,
-        colors=colors,
-        autopct='%1.1f%%',
-        startangle=90,
-        shadow=False
-    )
-    
-    # Apply hatch pattern to all wedges if selected
-    if hatch != '':
-        for wedge in wedges:
-            wedge.set_hatch(hatch)
-            wedge.set_alpha(0.7)
-            wedge.set_edgecolor('black')
-            wedge.set_linewidth(2)
-    
-    plt.title('Pie Chart')
-    plt.axis('equal')
-    plt.tight_layout()
-    plt.show()
+@profiled("create_pie_chart")
+def create_pie_chart(labels, values, explode, colors, hatch, output=None, fmt=None,
+                     fold_below=None, donut=None):
+    """
+    Create and display pie chart (saved to output instead when given).
+
+    fold_below folds slices under that share of the total into "Other";
+    donut draws a ring of that width instead of a full pie. Donuts and pies
+    with more than pie_slices.PIE_COLLECTION_THRESHOLD slices are drawn as
+    one collection.
+    """
+    count("points", len(values))
+    with span("prepare"):
+        if fold_below:
+            from pie_slices import fold_slices
+            labels, values, explode, colors = fold_slices(labels, values, fold_below, explode, colors)
+
+        # Hatch styling for all wedges, applied in one update
+        wedgeprops = None
+        if hatch != '':
+            wedgeprops = {'hatch': hatch, 'alpha': 0.7, 'edgecolor': 'black', 'linewidth': 2}
+
+    with span("artists"):
+        new_figure((10, 8))
+
+        from pie_slices import PIE_COLLECTION_THRESHOLD
+        if donut is not None or len(values) > PIE_COLLECTION_THRESHOLD:
+            from pie_slices import draw_pie
+            draw_pie(plt.gca(), values, labels, colors, explode, width=donut,
+                     wedgeprops=wedgeprops)
+        else:
+            plt.pie(
+                values, 
+                labels=labels, 
+                explode=explode,
+                colors=colors,
+                autopct='%1.1f%%',
+                startangle=90,
+                shadow=False,
+                wedgeprops=wedgeprops
+            )
+
+        plt.title('Pie Chart')
+        plt.axis('equal')
+    finish_figure(output, fmt)
 
 
 # ==================== MAIN MENU FUNCTIONS ====================
@@ -326,7 +455,10 @@ def handle_line_plot():
     color = get_line_color()
     markercolor = get_marker_color()
     linestyle = get_line_style()
-    create_line_plot(labels, values, marker, color, markercolor, linestyle)
+    if len(values) > DEFAULT_MAX_POINTS:
+        print(f"Reducing {len(values)} points to {DEFAULT_MAX_POINTS} for drawing...")
+    create_line_plot(labels, values, marker, color, markercolor, linestyle,
+                     max_points=DEFAULT_MAX_POINTS)
 
 
 def handle_bar_graph():
@@ -334,6 +466,11 @@ def handle_bar_graph():
     print("\n--- BAR GRAPH ---")
     labels, values = get_bar_data()
     width = get_bar_width()
+    if len(labels) > MAX_PROMPTED_BARS:
+        from bar_topn import create_topn_bar_graph
+        top = get_top_n(len(labels))
+        create_topn_bar_graph(labels, values, top, width)
+        return
     colors = get_bar_colors(len(labels))
     create_bar_graph(labels, values, width, colors)
 
@@ -345,6 +482,14 @@ def handle_pie_chart():
     
     if len(values) < 5:
         print("Note: Pie chart works best with at least 5 values.")
+
+    if len(values) > MAX_PROMPTED_SLICES:
+        from pie_slices import fold_fraction
+        fold_below = fold_fraction(len(values))
+        print(f"Folding slices under {fold_below:.2%} into 'Other'...")
+        hatch = get_hatch_pattern()
+        create_pie_chart(labels, values, None, None, hatch, fold_below=fold_below)
+        return
     
     explode = get_explode_values(len(values))
     colors = get_pie_colors(len(values))
@@ -0,0 +1,153 @@
+"""
+Cached layout templates, so tight_layout only runs for new layouts.
+
+plt.tight_layout() measures the extent of every title, label and tick
+label on each call, and in batch runs it is one of the most expensive
+steps of a chart. The programs keep drawing the same few layouts (same
+figure size, same titles, same category labels), so finish_figure() asks
+this module for the layout instead:
+
+    apply_layout(fig)   # tight_layout on a miss, subplots_adjust on a hit
+
+The template key is built from everything tight_layout measures: figure
+size and DPI, the font size, and for every axes its grid position,
+titles, axis labels, tick labels (and their rotation), legend entries and
+free-standing texts such as pie labels (with their positions) and table
+cells. Building it creates and formats the tick labels, which the draw
+does anyway, but measures no text. A hit applies the stored subplot
+parameters with subplots_adjust(); any change to the key runs tight_layout
+again and stores the result. bench_layout.py compares the two.
+"""
+
+import threading
+from collections import OrderedDict
+
+from profiling import count
+
+MAX_TEMPLATES = 256
+SUBPLOT_PARAMS = ("left", "right", "bottom", "top", "wspace", "hspace")
+
+
+# ==================== KEY FUNCTIONS ====================
+
+def _texts(labels):
+    return tuple(label.get_text() for label in labels)
+
+
+def _axes_key(ax):
+    """Everything about one axes that changes its tight layout"""
+    spec = ax.get_subplotspec()
+    xticks = ax.get_xticklabels()
+    yticks = ax.get_yticklabels()
+    legend = ax.get_legend()
+    return (
+        spec.get_geometry() if spec is not None else tuple(ax.get_position().bounds),
+        ax.axison,
+        ax.get_title("left"), ax.get_title(), ax.get_title("right"),
+        ax.get_xlabel(), ax.get_ylabel(),
+        _texts(xticks), xticks[0].get_rotation() if xticks else None,
+        _texts(yticks), yticks[0].get_rotation() if yticks else None,
+        (_texts(legend.get_texts()), legend._loc, legend.get_bbox_to_anchor().bounds)
+        if legend is not None else None,
+        tuple((text.get_text(), tuple(round(p, 6) for p in text.get_position()))
+              for text in ax.texts),
+        tuple(tuple((position, cell.get_text().get_text())
+                    for position, cell in sorted(table.get_celld().items()))
+              for table in ax.tables),
+    )
+
+
+def layout_key(fig):
+    """
+    Template key for a figure's current contents.
+
+    Returns:
+        tuple: hashable key; equal keys give the same tight layout.
+    """
+    from chart_output import plt
+
+    suptitle = fig._suptitle.get_text() if fig._suptitle is not None else None
+    return (
+        tuple(fig.get_size_inches()), fig.dpi, plt.rcParams["font.size"], suptitle,
+        tuple(_axes_key(ax) for ax in fig.axes),
+    )
+
+
+# ==================== CACHE ====================
+
+class LayoutCache:
+    """LRU of subplot parameters computed by tight_layout, by layout key"""
+
+    def __init__(self, max_templates=MAX_TEMPLATES):
+        """
+        Args:
+        max_templates (int): most layouts kept (0 always runs tight_layout).
+        """
+        self.max_templates = max_templates
+        self._templates = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def apply(self, fig):
+        """Lay out fig from a stored template, or with tight_layout on a miss"""
+        if self.max_templates <= 0:
+            fig.tight_layout()
+            return
+
+        key = layout_key(fig)
+        with self._lock:
+            params = self._templates.get(key)
+            if params is not None:
+                self._templates.move_to_end(key)
+                self.hits += 1
+        if params is not None:
+            count("layout_hits")
+            # tight_layout fixes the aspect of equal-aspect axes (pies) for
+            # the untouched margins as a side effect; do the same here.
+            for ax in fig.axes:
+                if ax.get_aspect() != "auto":
+                    ax.apply_aspect()
+            fig.subplots_adjust(**params)
+            return
+
+        count("layout_misses")
+        fig.tight_layout()
+        params = {name: getattr(fig.subplotpars, name) for name in SUBPLOT_PARAMS}
+        with self._lock:
+            self.misses += 1
+            self._templates[key] = params
+            while len(self._templates) > self.max_templates:
+                self._templates.popitem(last=False)
+
+    def clear(self):
+        """Forget every stored layout"""
+        with self._lock:
+            self._templates.clear()
+
+    def stats(self):
+        """Hit/miss counts and number of stored templates"""
+        with self._lock:
+            return {"templates": len(self._templates), "hits": self.hits, "misses": self.misses}
+
+
+# ==================== DEFAULT CACHE ====================
+
+_cache = LayoutCache()
+
+
+def set_layout_cache(cache):
+    """Replace the cache used by apply_layout (returns the previous one)"""
+    global _cache
+    previous, _cache = _cache, cache
+    return previous
+
+
+def apply_layout(fig):
+    """Lay out fig with the default layout cache"""
+    _cache.apply(fig)
+
+
+def layout_stats():
+    """Hit/miss counts of the default layout cache"""
+    return _cache.stats()
@@ -0,0 +1,388 @@
+"""
+Live streaming line plot.
+
+create_line_plot draws a finished series into a new figure and blocks in
+plt.show(). To watch a metric as it arrives, LivePlot keeps the latest
+`capacity` values in a fixed-size NumPy ring buffer and redraws only the
+line on each frame: the axes, grid and labels are drawn once and saved as
+a background, then every frame restores that background, draws the line
+artist and blits the axes area. A full redraw only happens when a value
+falls outside the current y range.
+
+Values come from a file (optionally followed like `tail -f`), a pipe
+(stdin) or any Python iterable, read on a background thread, so slow
+sources never stall the frame loop. The loop aims for a target frame rate
+and reports the rate it actually achieved.
+
+On Agg there is no window, but every frame can still be copied into an
+in-memory buffer (frame_sink), which is how the frame rate is measured
+headless:
+
+    python live_plot.py --demo --duration 5 --headless
+    tail -f metric.log | python live_plot.py - --fps 30
+    python live_plot.py metric.log --follow --capacity 2000
+"""
+
+import argparse
+import queue
+import sys
+import threading
+import time
+
+import numpy as np
+
+from chart_output import new_figure, plt, release_figure
+
+DEFAULT_CAPACITY = 500
+DEFAULT_FPS = 30
+MARKER_MAX_POINTS = 100
+HEADROOM = 0.1
+
+
+# ==================== RING BUFFER ====================
+
+class RingBuffer:
+    """
+    The last `capacity` values of a stream.
+
+    Every value is stored twice, `capacity` slots apart, so the window in
+    arrival order is always one contiguous slice: view() costs nothing and
+    never copies.
+    """
+
+    def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1.")
+        self.capacity = capacity
+        self._data = np.full(2 * capacity, np.nan)
+        self._next = 0
+        self.total = 0
+
+    def extend(self, values):
+        """Append values (only the last `capacity` of a big batch are kept)"""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        self.total += values.size
+        if values.size > self.capacity:
+            values = values[-self.capacity:]
+        positions = (self._next + np.arange(values.size)) % self.capacity
+        self._data[positions] = values
+        self._data[positions + self.capacity] = values
+        self._next = (self._next + values.size) % self.capacity
+
+    def view(self):
+        """The buffered values, oldest first, padded with NaN until full"""
+        return self._data[self._next:self._next + self.capacity]
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+
+# ==================== SOURCES ====================
+
+def _parse_line(line):
+    """Numbers on one line of text (comma/whitespace separated; junk skipped)"""
+    values = []
+    for field in line.replace(",", " ").split():
+        try:
+            values.append(float(field))
+        except ValueError:
+            continue
+    return values
+
+
+def iter_stream(stream):
+    """Yield the numbers on each line of an open text stream (e.g. a pipe)"""
+    for line in stream:
+        values = _parse_line(line)
+        if values:
+            yield values
+
+
+def iter_file(path, follow=False, poll=0.05, stop=None):
+    """
+    Yield the numbers on each line of a file.
+
+    With follow=True, keep waiting for new lines at the end of the file
+    (like `tail -f`) until the stop event is set.
+    """
+    with open(path, encoding="utf-8") as f:
+        while True:
+            line = f.readline()
+            if line:
+                values = _parse_line(line)
+                if values:
+                    yield values
+            elif not follow or (stop is not None and stop.is_set()):
+                return
+            else:
+                time.sleep(poll)
+
+
+def random_walk(rate=1000, seed=0, stop=None):
+    """Demo source: `rate` random-walk values per second, in small batches"""
+    rng = np.random.default_rng(seed)
+    level = 0.0
+    batch = max(1, rate // 100)
+    while stop is None or not stop.is_set():
+        steps = rng.standard_normal(batch)
+        values = level + np.cumsum(steps)
+        level = values[-1]
+        yield values
+        time.sleep(batch / rate)
+
+
+class _Reader(threading.Thread):
+    """Background thread moving values from a source into a queue"""
+
+    def __init__(self, source):
+        super().__init__(daemon=True)
+        self.source = source
+        self.queue = queue.SimpleQueue()
+        self.finished = threading.Event()
+
+    def run(self):
+        try:
+            for values in self.source:
+                self.queue.put(values)
+        finally:
+            self.finished.set()
+
+    def drain(self):
+        """Everything read since the last call, as one array"""
+        batches = []
+        while True:
+            try:
+                batches.append(np.atleast_1d(np.asarray(self.queue.get_nowait(), dtype=np.float64)))
+            except queue.Empty:
+                break
+        if not batches:
+            return None
+        return np.concatenate(batches)
+
+
+class FrameBuffer:
+    """
+    In-memory frame sink that keeps only the latest frame.
+
+    Each write copies the frame into one reused buffer, so headless runs
+    pay for the copy (like a real consumer would) without keeping every
+    frame in memory.
+    """
+
+    def __init__(self):
+        self.frame = bytearray()
+        self.frames = 0
+        self.bytes = 0
+
+    def write(self, data):
+        view = memoryview(data).cast("B")
+        if len(self.frame) != view.nbytes:
+            self.frame = bytearray(view.nbytes)
+        self.frame[:] = view
+        self.frames += 1
+        self.bytes += view.nbytes
+        return view.nbytes
+
+
+# ==================== LIVE PLOT ====================
+
+class LivePlot:
+    """A line plot of a stream's latest values, redrawn with blitting"""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, marker='', color='red', markercolor='red',
+                 linestyle='-', title='Live Line Plot'):
+        """
+        Args:
+        capacity (int): how many of the latest values are shown.
+        marker, color, markercolor, linestyle: create_line_plot styling
+            (markers are only drawn for windows of at most MARKER_MAX_POINTS).
+        title (str): chart title.
+        """
+        self.buffer = RingBuffer(capacity)
+        self.fig = new_figure((10, 6))
+        self.ax = self.fig.gca()
+        self.x = np.arange(capacity)
+
+        if capacity > MARKER_MAX_POINTS:
+            marker = ''
+        (self.line,) = self.ax.plot(self.x, self.buffer.view(), marker=marker, color=color,
+                                    linestyle=linestyle, linewidth=2, markersize=8,
+                                    markerfacecolor=markercolor, markeredgecolor='black',
+                                    alpha=0.7, animated=True)
+        self.ax.set_xlim(0, capacity - 1)
+        self.ax.set_ylim(-1, 1)
+        self.ax.set_xlabel(f'Last {capacity} samples')
+        self.ax.set_ylabel('Values')
+        self.ax.set_title(title)
+        self.ax.grid(True, alpha=0.3)
+
+        self.frames = 0
+        self.full_redraws = 0
+        self._background = None
+
+    def _redraw_background(self):
+        """Draw everything but the line and keep it for the next frames"""
+        self.fig.canvas.draw()
+        self._background = self.fig.canvas.copy_from_bbox(self.ax.bbox)
+        self.full_redraws += 1
+
+    def _fit_y(self, values):
+        """Widen (or shrink) the y range when values leave it; True if it changed"""
+        shown = values[np.isfinite(values)]
+        if shown.size == 0:
+            return False
+        low, high = shown.min(), shown.max()
+        bottom, top = self.ax.get_ylim()
+        span = max(top - bottom, 1e-12)
+        outside = low < bottom or high > top
+        too_loose = (high - low) < span * 0.25
+        if not (outside or too_loose):
+            return False
+        margin = max(high - low, 1e-9) * HEADROOM
+        self.ax.set_ylim(low - margin, high + margin)
+        return True
+
+    def update(self, values=None):
+        """
+        Append values (if any) and draw one frame.
+
+        Returns:
+            bool: True if the frame needed a full redraw.
+        """
+        if values is not None and len(values):
+            self.buffer.extend(values)
+        window = self.buffer.view()
+        self.line.set_ydata(window)
+
+        full = self._fit_y(window) or self._background is None
+        if full:
+            self._redraw_background()
+        else:
+            self.fig.canvas.restore_region(self._background)
+        self.ax.draw_artist(self.line)
+        self.fig.canvas.blit(self.ax.bbox)
+        self.fig.canvas.flush_events()
+        self.frames += 1
+        return full
+
+    def close(self):
+        """Hand the figure back to the figure manager"""
+        release_figure(self.fig)
+
+    def run(self, source, fps=DEFAULT_FPS, duration=None, max_frames=None, frame_sink=None):
+        """
+        Show values from a source until it ends, the time is up or the window closes.
+
+        Args:
+        source: iterable yielding numbers or arrays of numbers (see
+            iter_file, iter_stream, random_walk).
+        fps (float): target frame rate.
+        duration (float): stop after this many seconds.
+        max_frames (int): stop after this many frames.
+        frame_sink: binary file object (or FrameBuffer) that receives every
+            frame's raw RGBA pixels, for headless testing and recording.
+
+        Returns:
+            dict: frames, seconds, fps (achieved), points, full_redraws.
+        """
+        reader = _Reader(source)
+        reader.start()
+        interactive = frame_sink is None and not _is_agg()
+        if interactive:
+            plt.show(block=False)
+
+        interval = 1.0 / fps
+        start = time.perf_counter()
+        next_frame = start
+        while True:
+            self.update(reader.drain())
+            if frame_sink is not None:
+                frame_sink.write(self.fig.canvas.buffer_rgba())
+
+            now = time.perf_counter()
+            if duration is not None and now - start >= duration:
+                break
+            if max_frames is not None and self.frames >= max_frames:
+                break
+            if reader.finished.is_set() and reader.queue.empty():
+                break
+            if interactive and not plt.fignum_exists(self.fig.number):
+                break
+
+            next_frame += interval
+            if next_frame > now:
+                time.sleep(next_frame - now)
+            else:
+                next_frame = now  # running behind: don't try to catch up
+
+        seconds = time.perf_counter() - start
+        if interactive and plt.fignum_exists(self.fig.number):
+            # Source ended: leave the last frame up until the window is closed.
+            self.line.set_animated(False)
+            plt.show()
+        return {
+            "frames": self.frames,
+            "seconds": seconds,
+            "fps": self.frames / seconds if seconds else 0.0,
+            "points": self.buffer.total,
+            "full_redraws": self.full_redraws,
+        }
+
+
+def _is_agg():
+    """True when pyplot is drawing with the non-interactive Agg backend"""
+    return plt.get_backend().lower() == "agg"
+
+
+# ==================== PROGRAM ENTRY POINT ====================
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Plot a stream of numbers live.")
+    parser.add_argument("source", nargs="?", help="file to read, or - for stdin")
+    parser.add_argument("--demo", action="store_true", help="plot a random walk instead")
+    parser.add_argument("--follow", action="store_true", help="keep reading as the file grows")
+    parser.add_argument("--capacity", type=int, default=DEFAULT_CAPACITY, help="values shown")
+    parser.add_argument("--fps", type=float, default=DEFAULT_FPS, help="target frame rate")
+    parser.add_argument("--duration", type=float, help="stop after this many seconds")
+    parser.add_argument("--headless", action="store_true",
+                        help="render frames into memory and report the frame rate")
+    args = parser.parse_args(argv)
+
+    if args.headless:
+        import matplotlib
+        matplotlib.use("Agg")
+
+    stop = threading.Event()
+    if args.demo:
+        source = random_walk(stop=stop)
+    elif args.source == "-":
+        source = iter_stream(sys.stdin)
+    elif args.source:
+        source = iter_file(args.source, follow=args.follow, stop=stop)
+    else:
+        parser.error("give a source file, - for stdin, or --demo")
+
+    if args.headless and args.duration is None and (args.demo or args.follow):
+        args.duration = 5.0
+
+    live = LivePlot(capacity=args.capacity)
+    sink = FrameBuffer() if args.headless else None
+    try:
+        stats = live.run(source, fps=args.fps, duration=args.duration, frame_sink=sink)
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        stop.set()
+        live.close()
+
+    print(f"{stats['frames']} frames in {stats['seconds']:.2f}s "
+          f"({stats['fps']:.1f} fps, target {args.fps:g}), {stats['points']} points, "
+          f"{stats['full_redraws']} full redraws")
+    if sink is not None:
+        print(f"{sink.bytes / 1e6:.1f} MB of frames written to memory")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
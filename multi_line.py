@@ -0,0 +1,176 @@
+"""
+Line plots with many series on one axes.
+
+Overlaying thousands of series (per-store trends, for example) with one
+plt.plot call each creates a Line2D artist per series, and both building
+and drawing them grows with the series count. This module draws a whole
+(series, points) array as one LineCollection instead:
+
+    segments = series_segments(values)      # (series, points, 2), no loop
+    draw_series(ax, values, marker="o")
+
+Each series gets its color from a colormap in one call; a color chosen
+in the line plot menu replaces the first series' color. Markers are only
+drawn when the chart has at most MARKER_THRESHOLD points in total (more
+markers than that just cover the lines), and then as one scatter artist.
+
+create_line_plot switches to this mode when given a 2-D array of values.
+bench_multi_line.py compares it with a plt.plot loop.
+"""
+
+import numpy as np
+
+from chart_output import finish_figure, new_figure, plt
+from profiling import count, profiled, span
+
+MARKER_THRESHOLD = 2000
+LEGEND_MAX_SERIES = 10
+DEFAULT_CMAP = "viridis"
+
+
+# ==================== GEOMETRY ====================
+
+def series_segments(values, x=None):
+    """
+    Vertices of every series, for a LineCollection.
+
+    Args:
+    values: (series, points) array of y values.
+    x: 1-D array of x positions shared by all series (default 0, 1, 2, ...).
+
+    Returns:
+        numpy.ndarray: (series, points, 2) array of (x, y) vertices.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim != 2:
+        raise ValueError("Multi-series values must be a 2-D (series, points) array.")
+    num_series, num_points = values.shape
+    if x is None:
+        x = np.arange(num_points, dtype=np.float64)
+    x = np.asarray(x, dtype=np.float64)
+    if x.shape != (num_points,):
+        raise ValueError(f"Got {x.size} x positions for {num_points} points per series.")
+
+    segments = np.empty((num_series, num_points, 2))
+    segments[:, :, 0] = x
+    segments[:, :, 1] = values
+    return segments
+
+
+def series_colors(num_series, cmap=DEFAULT_CMAP):
+    """RGBA color per series, spread evenly over a colormap"""
+    from matplotlib import colormaps
+
+    return colormaps[cmap](np.linspace(0, 1, num_series))
+
+
+# ==================== DRAWING ====================
+
+def draw_series(ax, values, x=None, colors=None, cmap=DEFAULT_CMAP, linestyle="-",
+                linewidth=1.0, alpha=None, marker=None, markersize=6,
+                marker_threshold=MARKER_THRESHOLD, series_labels=None, markercolors=None):
+    """
+    Draw every row of values as one series, all in one LineCollection.
+
+    Args:
+    ax: matplotlib Axes to draw on.
+    values: (series, points) array of y values.
+    x: 1-D array of x positions shared by all series.
+    colors: color per series (defaults to the colormap).
+    cmap (str): colormap for the series colors.
+    linestyle, linewidth, alpha: line style for every series.
+    marker (str): marker drawn at each point, only while values has at
+        most marker_threshold points.
+    markersize (float): marker size in points.
+    marker_threshold (int): largest total point count that gets markers.
+    series_labels (list[str]): series names; a legend is added when there
+        are at most LEGEND_MAX_SERIES series.
+    markercolors: marker color per series (defaults to colors).
+
+    Returns:
+        LineCollection: the lines.
+    """
+    from matplotlib.collections import LineCollection
+
+    segments = series_segments(values, x)
+    num_series, num_points = segments.shape[:2]
+    if colors is None:
+        colors = series_colors(num_series, cmap)
+
+    lines = LineCollection(segments, colors=colors, linestyles=linestyle,
+                           linewidths=linewidth, alpha=alpha)
+    ax.add_collection(lines)
+    ax.update_datalim(segments.reshape(-1, 2))
+    ax.autoscale_view()
+
+    if marker and segments.shape[0] * num_points <= marker_threshold:
+        from matplotlib.colors import to_rgba_array
+
+        point_colors = to_rgba_array(colors if markercolors is None else markercolors)
+        point_colors = np.repeat(point_colors, num_points, axis=0)
+        ax.scatter(segments[:, :, 0].ravel(), segments[:, :, 1].ravel(), s=markersize ** 2,
+                   marker=marker, c=point_colors, edgecolors="black", alpha=alpha, zorder=3)
+
+    if series_labels is not None and num_series <= LEGEND_MAX_SERIES:
+        from matplotlib.colors import to_rgba_array
+        from matplotlib.lines import Line2D
+
+        handles = [Line2D([], [], color=color, linestyle=linestyle, marker=marker, label=label)
+                   for color, label in zip(to_rgba_array(colors), series_labels)]
+        ax.legend(handles=handles)
+    return lines
+
+
+@profiled("create_multi_line_plot")
+def create_multi_line_plot(values, labels=None, series_labels=None, marker=None,
+                           linestyle="-", cmap=DEFAULT_CMAP, output=None, fmt=None,
+                           color=None, markercolor=None):
+    """
+    Line plot of every row of a 2-D array, drawn as one collection.
+
+    Args:
+    values: (series, points) array of y values.
+    labels: x label per point (shown as tick labels; beyond 20 points only
+        10 of them are shown).
+    series_labels (list[str]): series names, for the legend.
+    marker (str): marker for each point (skipped for large charts).
+    linestyle (str): line style for every series.
+    cmap (str): colormap for the series colors.
+    output, fmt: where to save the chart (see chart_output.finish_figure).
+    color, markercolor: line and marker color of the first series (the
+        other series keep their colormap colors).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    count("points", values.size)
+
+    with span("prepare"):
+        from matplotlib.colors import to_rgba
+
+        colors = series_colors(values.shape[0], cmap)
+        markercolors = colors.copy()
+        if color is not None and len(colors):
+            colors[0] = to_rgba(color)
+            markercolors[0] = colors[0]
+        if markercolor is not None and len(colors):
+            markercolors[0] = to_rgba(markercolor)
+
+    with span("artists"):
+        new_figure((10, 6))
+        ax = plt.gca()
+        draw_series(ax, values, colors=colors, markercolors=markercolors,
+                    marker=marker, linestyle=linestyle,
+                    linewidth=2 if values.shape[0] <= LEGEND_MAX_SERIES else 1,
+                    alpha=0.7 if values.shape[0] <= LEGEND_MAX_SERIES else 0.4,
+                    series_labels=series_labels)
+        if labels is not None:
+            if len(labels) <= 20:
+                ticks = np.arange(len(labels))
+            else:
+                ticks = np.unique(np.linspace(0, len(labels) - 1, 10).astype(int))
+            plt.xticks(ticks, np.asarray(labels)[ticks], rotation=45 if len(labels) > 10 else 0,
+                       ha='right' if len(labels) > 10 else 'center')
+        plt.xlabel('Labels')
+        plt.ylabel('Values')
+        plt.title(f'Line Plot ({values.shape[0]:,} series)')
+        plt.grid(True, alpha=0.3)
+    finish_figure(output, fmt)
@@ -0,0 +1,236 @@
+"""
+Parallel chart renderer.
+
+Fans a batch of chart jobs (same format as batch_render.py) out to a
+process pool so rendering is no longer stuck on one core. Each worker
+imports matplotlib once and renders a warm-up chart of every kind when it
+starts, so fonts and backend state are ready before the first real job.
+Results come back in job order regardless of which worker finished first.
+
+Usage:
+    python parallel_render.py jobs.jsonl --workers 8 --outdir charts
+    python parallel_render.py jobs.jsonl --bench 1,2,4,8,16,32
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import batch_render
+from render_cache import RenderCache
+
+WARMUP_JOBS = [
+    {"kind": "line", "labels": ["a", "b"], "values": [1, 2]},
+    {"kind": "bar", "labels": ["a", "b"], "values": [1, 2]},
+    {"kind": "pie", "labels": ["a", "b"], "values": [1, 2]},
+    {"kind": "sales_bar", "labels": ["a", "b"], "values": [[1, 2], [3, 4]]},
+    {"kind": "sales_pie", "labels": ["a", "b"], "values": [1, 2]},
+]
+
+# Per-worker render cache, set up by the pool initializer.
+_cache = None
+
+
+# ==================== WORKER FUNCTIONS ====================
+
+def _warm_worker(fmt, cache_dir=None):
+    """Pool initializer: open the cache and render one throwaway chart of each kind"""
+    global _cache
+    for job in WARMUP_JOBS:
+        batch_render.render_job(job, io.BytesIO(), fmt=fmt)
+    if cache_dir is not None:
+        _cache = RenderCache(cache_dir)
+
+
+def _render_one(task):
+    """
+    Render a single job inside a worker.
+
+    Returns:
+        tuple: (result, error). result is the written path when the job
+        has one, otherwise the encoded image bytes. error is None on success.
+    """
+    job, path, fmt = task
+    try:
+        if path is None:
+            return batch_render.render_bytes(job, fmt, _cache), None
+        if _cache is None:
+            batch_render.render_job(job, path)
+        else:
+            fmt = os.path.splitext(path)[1].lstrip(".") or fmt
+            with open(path, "wb") as f:
+                f.write(batch_render.render_bytes(job, fmt, _cache))
+        return path, None
+    except Exception as e:  # one bad job must not lose the rest of the batch
+        return None, str(e) or type(e).__name__
+
+
+def _ping(_):
+    """No-op task used to make sure every worker has started"""
+    return os.getpid()
+
+
+# ==================== POOL FUNCTIONS ====================
+
+def default_workers():
+    """Number of workers to use when none is given"""
+    return os.cpu_count() or 1
+
+
+def start_pool(workers=None, fmt="png", cache_dir=None, mp_context=None):
+    """
+    Start a pool of warmed-up render workers (sharing an on-disk cache when given).
+
+    mp_context is the multiprocessing context workers are started with
+    (the platform default when not given).
+    """
+    workers = workers or default_workers()
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=mp_context,
+                               initializer=_warm_worker, initargs=(fmt, cache_dir))
+    list(pool.map(_ping, range(workers * 2)))
+    return pool
+
+
+def _chunksize(num_jobs, workers):
+    """Hand out jobs in chunks to keep pickling overhead low"""
+    return max(1, min(32, num_jobs // (workers * 4)))
+
+
+def render_batch(jobs, workers=None, fmt="png", outdir=None, pool=None, cache_dir=None):
+    """
+    Render jobs in parallel.
+
+    Args:
+    jobs (list[dict]): chart jobs.
+    workers (int): pool size (defaults to the CPU count).
+    fmt (str): image format.
+    outdir (str): when given, workers write files there; otherwise the
+        encoded bytes are returned.
+    pool: an already started pool to reuse (optional).
+    cache_dir (str): render cache directory for a newly started pool.
+
+    Returns:
+        list[tuple]: one (result, error) pair per job, in job order.
+    """
+    if outdir is not None:
+        os.makedirs(outdir, exist_ok=True)
+
+    tasks = []
+    results = []
+    for index, job in enumerate(jobs, start=1):
+        path = None
+        if outdir is not None:
+            try:
+                path = batch_render.output_path(job, index, outdir, fmt)
+            except ValueError as e:
+                results.append((None, str(e)))
+                continue
+        tasks.append((job, path, fmt))
+        results.append(None)
+
+    workers = workers or default_workers()
+    own_pool = pool is None
+    if own_pool:
+        pool = start_pool(workers, fmt, cache_dir)
+    try:
+        size = _chunksize(len(tasks), workers)
+        rendered = pool.map(_render_one, tasks, chunksize=size)
+        return [result if result is not None else next(rendered) for result in results]
+    finally:
+        if own_pool:
+            pool.shutdown()
+
+
+# ==================== THROUGHPUT REPORT ====================
+
+def measure_throughput(jobs, worker_counts, fmt="png"):
+    """
+    Time the same batch at several pool sizes.
+
+    Pool start-up and warm-up are excluded; only rendering is timed.
+
+    Returns:
+        list[dict]: workers, charts, seconds and charts_per_sec per run.
+    """
+    report = []
+    for workers in worker_counts:
+        pool = start_pool(workers, fmt)
+        try:
+            start = time.perf_counter()
+            render_batch(jobs, workers, fmt, pool=pool)
+            seconds = time.perf_counter() - start
+        finally:
+            pool.shutdown()
+
+        report.append({
+            "workers": workers,
+            "charts": len(jobs),
+            "seconds": seconds,
+            "charts_per_sec": len(jobs) / seconds if seconds else float("inf"),
+        })
+    return report
+
+
+def print_report(report):
+    """Print a throughput table"""
+    base = report[0]["charts_per_sec"] if report else 0
+    print("\n" + "=" * 50)
+    print("RENDER THROUGHPUT")
+    print("=" * 50)
+    print(f"{'workers':>8} {'charts':>8} {'seconds':>10} {'charts/sec':>11} {'speedup':>8}")
+    for row in report:
+        speedup = row["charts_per_sec"] / base if base else 0
+        print(f"{row['workers']:>8} {row['charts']:>8} {row['seconds']:>10.2f} "
+              f"{row['charts_per_sec']:>11.1f} {speedup:>7.2f}x")
+    print("=" * 50)
+
+
+# ==================== PROGRAM ENTRY POINT ====================
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Render chart jobs on a process pool.")
+    parser.add_argument("jobs", help="job file (.json or .jsonl)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="pool size (default: number of CPUs)")
+    parser.add_argument("--outdir", default="charts", help="output directory (default: charts)")
+    parser.add_argument("--format", default="png", choices=batch_render.FORMATS,
+                        help="default image format (default: png)")
+    parser.add_argument("--bench", metavar="COUNTS",
+                        help="comma-separated worker counts to report throughput for")
+    parser.add_argument("--cache", metavar="DIR",
+                        help="reuse identical charts from a render cache in DIR")
+    args = parser.parse_args(argv)
+
+    try:
+        jobs = batch_render.load_jobs(args.jobs)
+    except (OSError, ValueError) as e:
+        print(f"Error! {e}", file=sys.stderr)
+        return 2
+
+    if args.bench:
+        try:
+            counts = [int(n) for n in args.bench.split(",")]
+        except ValueError:
+            print("Error! --bench expects numbers like 1,2,4,8", file=sys.stderr)
+            return 2
+        print_report(measure_throughput(jobs, counts, args.format))
+        return 0
+
+    results = render_batch(jobs, args.workers, args.format, args.outdir,
+                           cache_dir=args.cache)
+    failed = 0
+    for index, (_, error) in enumerate(results, start=1):
+        if error is not None:
+            failed += 1
+            print(f"Error! Job {index}: {error}", file=sys.stderr)
+    print(f"Rendered {len(results) - failed} of {len(jobs)} charts into {args.outdir}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
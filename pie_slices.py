@@ -0,0 +1,240 @@
+"""
+Pie charts with many slices.
+
+plt.pie makes a Wedge patch, a label and a percentage text for every
+slice, so thousands of slices are slow to draw and impossible to read.
+This module helps in two ways:
+
+    fold_slices   folds every slice below a fraction of the total into one
+                  "Other" slice, in one vectorized pass
+    draw_pie      computes all wedge angles with one cumsum, builds every
+                  wedge outline (or donut ring segment) as arrays and draws
+                  them as a single PolyCollection; styling such as hatch,
+                  alpha and edge color is one property update on that
+                  collection, and only slices big enough to read get text
+
+Both create_pie_chart functions use them (see PIE_COLLECTION_THRESHOLD).
+"""
+
+import numpy as np
+
+# Pies with more slices than this are drawn as one collection.
+PIE_COLLECTION_THRESHOLD = 100
+FOLD_BELOW = 0.01
+# fold_fraction() never folds a slice bigger than this share of the average slice.
+FOLD_SHARE_OF_MEAN = 0.25
+LABEL_MIN_FRACTION = 0.02
+ARC_STEP = 1.0
+OTHER_LABEL = "Other"
+OTHER_COLOR = "lightgray"
+DEFAULT_CMAP = "tab20"
+
+
+# ==================== FOLDING ====================
+
+def fold_fraction(num_slices, min_fraction=FOLD_BELOW):
+    """
+    Fold threshold for a pie with num_slices slices.
+
+    A fixed share would fold every slice once there are more slices than
+    1 / min_fraction (200 equal slices are 0.5% each), leaving one "Other"
+    wedge. The threshold is therefore lowered to FOLD_SHARE_OF_MEAN of the
+    average slice, so only slices well below average are folded.
+
+    Returns:
+        float: share of the total below which slices are folded.
+    """
+    return min(min_fraction, FOLD_SHARE_OF_MEAN / max(num_slices, 1))
+
+
+def fold_small(values, min_fraction=FOLD_BELOW):
+    """
+    Find the slices that are at least min_fraction of the total.
+
+    Args:
+    values: 1-D array of slice sizes.
+    min_fraction (float): smallest share of the total kept as its own slice.
+
+    Returns:
+        (keep, other): indices of the kept slices (in their original order)
+        and the summed size of the rest (None when nothing was folded).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    small = values < values.sum() * min_fraction
+    keep = np.flatnonzero(~small)
+    if keep.size == values.size:
+        return keep, None
+    return keep, float(values[small].sum())
+
+
+def fold_slices(labels, values, min_fraction=FOLD_BELOW, explode=None, colors=None):
+    """
+    Fold slices below min_fraction of the total into one "Other" slice.
+
+    Args:
+    labels: label per slice.
+    values: 1-D array of slice sizes.
+    min_fraction (float): smallest share of the total kept as its own slice.
+    explode, colors: optional per-slice lists, filtered the same way
+        ("Other" is not exploded and is drawn in gray).
+
+    Returns:
+        (labels, values, explode, colors): the folded slices, as lists.
+    """
+    keep, other = fold_small(values, min_fraction)
+    labels = np.asarray(labels).astype(str)[keep].tolist()
+    values = np.asarray(values, dtype=np.float64)[keep].tolist()
+    if explode is not None:
+        explode = np.asarray(explode, dtype=np.float64)[keep].tolist()
+    if colors is not None:
+        colors = [colors[i] for i in keep]
+
+    if other is not None:
+        labels.append(OTHER_LABEL)
+        values.append(other)
+        if explode is not None:
+            explode.append(0.0)
+        if colors is not None:
+            colors.append(OTHER_COLOR)
+    return labels, values, explode, colors
+
+
+# ==================== GEOMETRY ====================
+
+def wedge_angles(values, startangle=90, counterclock=True):
+    """
+    Start and end angle of every wedge, in degrees, like plt.pie lays them out.
+
+    Returns:
+        (theta1, theta2): arrays with one entry per slice.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    edges = np.concatenate(([0.0], np.cumsum(values))) * (360.0 / values.sum())
+    if not counterclock:
+        edges = -edges
+    edges += startangle
+    return edges[:-1], edges[1:]
+
+
+def wedge_polygons(theta1, theta2, radius=1.0, width=None, explode=None, step=ARC_STEP):
+    """
+    Outline of every wedge, built for all wedges at once.
+
+    Each arc gets one point per `step` degrees (at least two), so the total
+    number of points grows with 360 / step plus the slice count, not with
+    slices times a fixed resolution.
+
+    Args:
+    theta1, theta2: start and end angle per wedge, in degrees.
+    radius (float): outer radius.
+    width (float): ring width for a donut (None for a full pie).
+    explode: offset of each wedge from the center, as a fraction of radius.
+    step (float): degrees between points on an arc.
+
+    Returns:
+        list[numpy.ndarray]: one (points, 2) outline per wedge.
+    """
+    theta1 = np.asarray(theta1, dtype=np.float64)
+    theta2 = np.asarray(theta2, dtype=np.float64)
+    num_wedges = theta1.size
+
+    arc_points = np.maximum(2, np.ceil(np.abs(theta2 - theta1) / step).astype(np.intp) + 1)
+    wedge = np.repeat(np.arange(num_wedges), arc_points)
+    arc_start = np.cumsum(arc_points) - arc_points
+    position = np.arange(wedge.size) - arc_start[wedge]
+    fraction = position / (arc_points[wedge] - 1)
+    angle = np.deg2rad(theta1[wedge] + (theta2 - theta1)[wedge] * fraction)
+    unit = np.column_stack((np.cos(angle), np.sin(angle)))
+
+    if width is None:
+        # center point, then the arc
+        sizes = arc_points + 1
+        start = arc_start + np.arange(num_wedges)
+        points = np.zeros((sizes.sum(), 2))
+        points[start[wedge] + 1 + position] = radius * unit
+    else:
+        # outer arc forwards, then the inner arc backwards
+        sizes = 2 * arc_points
+        start = 2 * arc_start
+        points = np.empty((sizes.sum(), 2))
+        points[start[wedge] + position] = radius * unit
+        points[start[wedge] + sizes[wedge] - 1 - position] = (radius - width) * unit
+
+    if explode is not None:
+        middle = np.deg2rad((theta1 + theta2) / 2)
+        shift = np.asarray(explode, dtype=np.float64) * radius
+        offsets = np.column_stack((np.cos(middle), np.sin(middle))) * shift[:, None]
+        points += np.repeat(offsets, sizes, axis=0)
+
+    return np.split(points, np.cumsum(sizes)[:-1])
+
+
+def slice_colors(num_slices, cmap=DEFAULT_CMAP):
+    """RGBA color per slice, cycling through a colormap"""
+    from matplotlib import colormaps
+
+    colormap = colormaps[cmap]
+    count = getattr(colormap, "N", 256)
+    return colormap(np.arange(num_slices) % count)
+
+
+# ==================== DRAWING ====================
+
+def draw_pie(ax, values, labels=None, colors=None, explode=None, width=None, startangle=90,
+             wedgeprops=None, autopct=True, label_min_fraction=LABEL_MIN_FRACTION):
+    """
+    Draw a pie (or donut) chart as one PolyCollection.
+
+    Args:
+    ax: matplotlib Axes to draw on.
+    values: 1-D array of slice sizes.
+    labels: label per slice (optional).
+    colors: color per slice (defaults to a cycled colormap).
+    explode: offset per slice, as a fraction of the radius.
+    width (float): ring width, between 0 and 1, for a donut chart.
+    startangle (float): angle of the first wedge's start, in degrees.
+    wedgeprops (dict): collection properties (hatch, alpha, edgecolor,
+        linewidth, ...) applied to every wedge in one update.
+    autopct (bool): write the percentage inside labeled slices.
+    label_min_fraction (float): slices smaller than this share of the
+        total get no label or percentage text.
+
+    Returns:
+        PolyCollection: the wedges.
+    """
+    from matplotlib.collections import PolyCollection
+
+    values = np.asarray(values, dtype=np.float64)
+    if values.size == 0 or values.sum() <= 0:
+        raise ValueError("Pie chart needs at least one positive value.")
+    if width is not None and not 0 < width <= 1:
+        raise ValueError("Donut width must be between 0 and 1.")
+
+    theta1, theta2 = wedge_angles(values, startangle)
+    polygons = wedge_polygons(theta1, theta2, width=width, explode=explode)
+    facecolors = slice_colors(values.size) if colors is None else colors
+
+    wedges = PolyCollection(polygons, facecolors=facecolors, edgecolors="face")
+    if wedgeprops:
+        wedges.set(**wedgeprops)
+    ax.add_collection(wedges)
+    ax.set(frame_on=False, xticks=[], yticks=[], xlim=(-1.25, 1.25), ylim=(-1.25, 1.25))
+    ax.set_aspect("equal")
+
+    fractions = values / values.sum()
+    shown = np.flatnonzero(fractions >= label_min_fraction)
+    middle = np.deg2rad((theta1[shown] + theta2[shown]) / 2)
+    if explode is None:
+        shift = np.zeros(shown.size)
+    else:
+        shift = np.asarray(explode, dtype=np.float64)[shown]
+    text_radius = 0.6 if width is None else 1 - width / 2
+    for i, angle, offset, fraction in zip(shown, middle, shift, fractions[shown]):
+        x, y = np.cos(angle), np.sin(angle)
+        if labels is not None:
+            ax.text((1.1 + offset) * x, (1.1 + offset) * y, labels[i],
+                    ha="left" if x >= 0 else "right", va="center")
+        if autopct:
+            ax.text((text_radius + offset) * x, (text_radius + offset) * y,
+                    f"{fraction * 100:.1f}%", ha="center", va="center")
+    return wedges
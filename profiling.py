@@ -0,0 +1,198 @@
+"""
+Opt-in timing spans and counters for the chart pipeline.
+
+The create_* functions wrap each phase of a render (artist creation,
+layout, saving/showing) in a span, and the output helpers add counters
+such as the number of charts and data points. Nothing is recorded until
+profiling is enabled; while disabled, span() hands back one shared no-op
+object, so the cost is a flag check per phase.
+
+    import profiling
+    profiling.enable()
+    create_bar_graph(...)
+    profiling.export_chrome_trace("trace.json")   # open in chrome://tracing
+    profiling.export_jsonl("spans.jsonl")
+
+Setting CHART_PROFILE=<file> in the environment enables profiling at
+import time and writes the spans there when the program exits (Chrome
+trace format for .json files, JSON lines otherwise).
+"""
+
+import atexit
+import functools
+import os
+import threading
+import time
+
+_enabled = False
+_events = []
+_counters = {}
+_lock = threading.Lock()
+_local = threading.local()
+
+
+# ==================== SWITCHES ====================
+
+def enable():
+    """Start recording spans and counters"""
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """Stop recording (already recorded data is kept)"""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    """True while spans and counters are being recorded"""
+    return _enabled
+
+
+def reset():
+    """Forget everything recorded so far"""
+    with _lock:
+        _events.clear()
+        _counters.clear()
+
+
+# ==================== RECORDING ====================
+
+class _NullSpan:
+    """Span used while profiling is disabled"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """Times one phase and records it on exit"""
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        self.parent = stack[-1] if stack else None
+        stack.append(self.name)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        _local.stack.pop()
+        event = {
+            "name": self.name,
+            "parent": self.parent,
+            "start_us": self.start / 1000,
+            "duration_us": (end - self.start) / 1000,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        }
+        if self.args:
+            event["args"] = self.args
+        with _lock:
+            _events.append(event)
+        return False
+
+
+def span(name, **args):
+    """Context manager timing one phase (a no-op while disabled)"""
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, args)
+
+
+def profiled(name):
+    """Decorator wrapping a whole function in a span"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(name, None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def count(name, amount=1):
+    """Add to a named counter"""
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+# ==================== RESULTS ====================
+
+def events():
+    """Recorded spans, in the order they finished"""
+    with _lock:
+        return list(_events)
+
+
+def counters():
+    """Current counter values"""
+    with _lock:
+        return dict(_counters)
+
+
+def totals():
+    """Total seconds spent per span name"""
+    result = {}
+    for event in events():
+        result[event["name"]] = result.get(event["name"], 0.0) + event["duration_us"] / 1e6
+    return result
+
+
+def export_jsonl(path):
+    """Write one JSON object per span, then one per counter"""
+    import json
+    with open(path, "w", encoding="utf-8") as f:
+        for event in events():
+            f.write(json.dumps(event) + "\n")
+        for name, value in counters().items():
+            f.write(json.dumps({"counter": name, "value": value}) + "\n")
+
+
+def export_chrome_trace(path):
+    """Write spans and counters in Chrome trace event format"""
+    import json
+    trace = []
+    last_ts = 0
+    for event in events():
+        trace.append({
+            "name": event["name"], "ph": "X", "cat": "chart",
+            "ts": event["start_us"], "dur": event["duration_us"],
+            "pid": event["pid"], "tid": event["tid"], "args": event.get("args", {}),
+        })
+        last_ts = max(last_ts, event["start_us"] + event["duration_us"])
+    for name, value in counters().items():
+        trace.append({"name": name, "ph": "C", "ts": last_ts, "pid": os.getpid(),
+                      "args": {name: value}})
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+
+
+def _export_at_exit(path):
+    if path.endswith(".json"):
+        export_chrome_trace(path)
+    else:
+        export_jsonl(path)
+
+
+if os.environ.get("CHART_PROFILE"):
+    enable()
+    atexit.register(_export_at_exit, os.environ["CHART_PROFILE"])
@@ -0,0 +1,248 @@
+"""
+Content-addressed cache for rendered charts.
+
+Charts are keyed by a stable hash of everything that affects the output
+(chart kind, data arrays, style choices, figure size, DPI and format), so
+asking for the same chart again returns the stored bytes instead of going
+through matplotlib. NumPy arrays are hashed straight from their raw
+buffers, which costs microseconds even for large series.
+
+Rendered bytes live in an in-memory LRU and, when a cache directory is
+given, in an on-disk store as well. Both are bounded by total size and
+evict the least recently used entries first. The directory itself is the
+on-disk store: every cache opened on it (in any process) sees the entries
+the others write, and reads touch a file's mtime so eviction can go by
+mtime. Each cache relists the directory every RESCAN_WRITES writes, or
+when its own writes push the total over the limit, and then removes the
+oldest files until the directory fits in max_disk_bytes again.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+MAX_MEMORY_BYTES = 64 * 1024 * 1024
+MAX_DISK_BYTES = 1024 * 1024 * 1024
+# Writes between directory rescans (other processes write to it as well).
+RESCAN_WRITES = 32
+
+
+# ==================== KEY FUNCTIONS ====================
+
+def _update_array(digest, array):
+    """Feed an array's dtype, shape and raw bytes into the hash"""
+    if array.dtype.kind == "O":
+        array = array.astype(str)
+    array = np.ascontiguousarray(array)
+    digest.update(f"{array.dtype.str}{array.shape}".encode())
+    digest.update(memoryview(array).cast("B"))
+
+
+def chart_key(kind, arrays, style, figsize, dpi, fmt):
+    """
+    Build the cache key for a chart.
+
+    Args:
+    kind (str): chart kind ("line", "bar", ...).
+    arrays (list): data arrays or lists (labels, values, ...).
+    style (dict): style choices; must be JSON serializable.
+    figsize (tuple): figure size in inches.
+    dpi (float): output resolution.
+    fmt (str): output format.
+
+    Returns:
+        str: hex digest identifying the rendered output.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    header = json.dumps([kind, list(figsize), dpi, fmt, style], sort_keys=True, default=str)
+    digest.update(header.encode())
+    for array in arrays:
+        _update_array(digest, np.asarray(array))
+    return digest.hexdigest()
+
+
+# ==================== CACHE ====================
+
+class RenderCache:
+    """In-memory LRU of rendered chart bytes, optionally backed by disk"""
+
+    def __init__(self, cache_dir=None, max_memory_bytes=MAX_MEMORY_BYTES,
+                 max_disk_bytes=MAX_DISK_BYTES):
+        self.cache_dir = cache_dir
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._disk = OrderedDict()
+        self._disk_bytes = 0
+        self._writes_since_scan = 0
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._scan_disk()
+
+    # ---------- disk store ----------
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def _scan_disk(self):
+        """Index the cache files in the directory, oldest first"""
+        entries = []
+        for sub in os.scandir(self.cache_dir):
+            if not sub.is_dir():
+                continue
+            for entry in os.scandir(sub.path):
+                if entry.name.startswith("."):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue  # removed by another cache meanwhile
+                entries.append((stat.st_mtime, entry.name, stat.st_size))
+
+        self._disk.clear()
+        self._disk_bytes = 0
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_bytes += size
+        self._writes_since_scan = 0
+
+    def _read_disk(self, key):
+        if self.cache_dir is None:
+            return None
+        # Read the file even when it is not in the index: another cache on
+        # the same directory may have written it since the last scan.
+        try:
+            with open(self._path(key), "rb") as f:
+                data = f.read()
+            os.utime(self._path(key))
+        except OSError:
+            self._forget_disk(key)
+            return None
+        self._forget_disk(key)
+        self._disk[key] = len(data)
+        self._disk_bytes += len(data)
+        return data
+
+    def _write_disk(self, key, data):
+        if self.cache_dir is None or len(data) > self.max_disk_bytes:
+            return
+        folder = os.path.dirname(self._path(key))
+        os.makedirs(folder, exist_ok=True)
+
+        fd, tmp = tempfile.mkstemp(dir=folder, prefix=".tmp-")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, self._path(key))
+
+        self._forget_disk(key)
+        self._disk[key] = len(data)
+        self._disk_bytes += len(data)
+        self._writes_since_scan += 1
+
+        if self._disk_bytes > self.max_disk_bytes or self._writes_since_scan >= RESCAN_WRITES:
+            self._scan_disk()
+            self._evict_disk()
+
+    def _evict_disk(self):
+        """Remove the least recently used files until the directory fits"""
+        while self._disk_bytes > self.max_disk_bytes:
+            old_key = next(iter(self._disk))
+            self._forget_disk(old_key)
+            try:
+                os.remove(self._path(old_key))
+            except OSError:
+                pass  # already evicted by another cache
+            self.evictions += 1
+
+    def _forget_disk(self, key):
+        size = self._disk.pop(key, None)
+        if size is not None:
+            self._disk_bytes -= size
+
+    # ---------- memory LRU ----------
+
+    def _remember(self, key, data):
+        if len(data) > self.max_memory_bytes:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= len(old)
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+
+        while self._memory_bytes > self.max_memory_bytes:
+            _, dropped = self._memory.popitem(last=False)
+            self._memory_bytes -= len(dropped)
+            self.evictions += 1
+
+    # ---------- public API ----------
+
+    def get(self, key):
+        """Return cached bytes for key, or None on a miss"""
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return data
+
+            data = self._read_disk(key)
+            if data is not None:
+                self._remember(key, data)
+                self.disk_hits += 1
+                return data
+
+            self.misses += 1
+            return None
+
+    def put(self, key, data):
+        """Store rendered bytes under key"""
+        with self._lock:
+            self._remember(key, data)
+            self._write_disk(key, data)
+
+    def get_or_render(self, key, render):
+        """
+        Return cached bytes for key, calling render() to produce them on a miss.
+
+        Args:
+        key (str): key from chart_key().
+        render: function returning the rendered bytes.
+        """
+        data = self.get(key)
+        if data is None:
+            data = render()
+            self.put(key, data)
+        return data
+
+    def stats(self):
+        """Hit/miss counters and current sizes"""
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "hits": hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+            }
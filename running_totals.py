@@ -0,0 +1,250 @@
+"""
+Incremental running totals for the sales summary.
+
+RunningTotals keeps per-category, per-period, per-category-per-period and
+grand totals up to date as transactions arrive. Every sale, refund or
+correction is applied in O(1), so display_summary() and the pie chart can
+be refreshed at any time without re-reading earlier transactions:
+
+    totals = RunningTotals()
+    totals.apply("Gaming Products", "Q2", 1500.0)
+    totals.refund("Gaming Products", "Q2", 200.0)
+    display_summary(*totals.category_sales(), categories=totals.categories)
+    create_pie_chart(*totals.category_totals(), categories=totals.categories)
+
+State can be checkpointed to a JSON file and restored later. The
+command-line mode applies a "category,period,amount" CSV feed, remembers
+how far into the feed it got, and resumes from there on the next run.
+
+Usage:
+    python running_totals.py feed.csv --checkpoint totals.json
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import tempfile
+
+from LabAct_WIthErrorHandling import CATEGORIES, QUARTERS, display_summary
+from sales_validate import parse_amount
+
+CHECKPOINT_VERSION = 1
+
+
+# ==================== RUNNING TOTALS ====================
+
+class RunningTotals:
+    """Sales totals that are updated one transaction at a time"""
+
+    def __init__(self, categories=None, periods=None):
+        self.categories = list(CATEGORIES if categories is None else categories)
+        self.periods = list(QUARTERS if periods is None else periods)
+        self._category_index = {c: i for i, c in enumerate(self.categories)}
+        self._period_index = {p: i for i, p in enumerate(self.periods)}
+
+        self.cells = [[0.0] * len(self.periods) for _ in self.categories]
+        self.by_category = [0.0] * len(self.categories)
+        self.by_period = [0.0] * len(self.periods)
+        self.grand_total = 0.0
+        self.transactions = 0
+        self.feed_offset = 0
+
+    # ---------- updates ----------
+
+    def _row(self, category):
+        index = self._category_index.get(category)
+        if index is None:
+            index = len(self.categories)
+            self.categories.append(category)
+            self._category_index[category] = index
+            self.cells.append([0.0] * len(self.periods))
+            self.by_category.append(0.0)
+        return index
+
+    def _column(self, period):
+        index = self._period_index.get(period)
+        if index is None:
+            index = len(self.periods)
+            self.periods.append(period)
+            self._period_index[period] = index
+            for row in self.cells:
+                row.append(0.0)
+            self.by_period.append(0.0)
+        return index
+
+    def apply(self, category, period, amount):
+        """
+        Add one transaction. Negative amounts reduce the totals.
+
+        New categories or periods are added on first sight.
+
+        Raises:
+            ValueError: if amount is NaN or infinite (it would poison the
+            totals and the checkpoint for good).
+        """
+        if not math.isfinite(amount):
+            raise ValueError(f"Not a valid amount: {amount!r}")
+        row = self._row(category)
+        col = self._column(period)
+        self.cells[row][col] += amount
+        self.by_category[row] += amount
+        self.by_period[col] += amount
+        self.grand_total += amount
+        self.transactions += 1
+
+    def refund(self, category, period, amount):
+        """Take a refunded sale back out of the totals"""
+        self.apply(category, period, -amount)
+
+    def correct(self, category, period, old_amount, new_amount):
+        """Replace a previously applied amount with the corrected one"""
+        self.apply(category, period, new_amount - old_amount)
+
+    # ---------- reads ----------
+
+    def category_sales(self):
+        """Per-period sales lists, one per category (display_summary/create_bar_chart input)"""
+        return [list(row) for row in self.cells]
+
+    def category_totals(self):
+        """Total per category (create_pie_chart input)"""
+        return list(self.by_category)
+
+    def period_totals(self):
+        """Total per period"""
+        return list(self.by_period)
+
+    def to_matrix(self):
+        """Snapshot as a sales_aggregate.SalesMatrix"""
+        from sales_aggregate import SalesMatrix
+        return SalesMatrix(self.categories, self.periods, self.cells)
+
+    # ---------- checkpoints ----------
+
+    def to_dict(self):
+        """Serializable state"""
+        return {
+            "version": CHECKPOINT_VERSION,
+            "categories": self.categories,
+            "periods": self.periods,
+            "cells": self.cells,
+            "transactions": self.transactions,
+            "feed_offset": self.feed_offset,
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        """Rebuild running totals from to_dict() output"""
+        if state.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"unsupported checkpoint version {state.get('version')!r}")
+
+        totals = cls(state["categories"], state["periods"])
+        totals.cells = [[float(v) for v in row] for row in state["cells"]]
+        if not all(math.isfinite(v) for row in totals.cells for v in row):
+            raise ValueError("checkpoint holds totals that are not finite numbers")
+        totals.by_category = [sum(row) for row in totals.cells]
+        totals.by_period = [sum(col) for col in zip(*totals.cells)] or [0.0] * len(totals.periods)
+        totals.grand_total = sum(totals.by_category)
+        totals.transactions = state["transactions"]
+        totals.feed_offset = state.get("feed_offset", 0)
+        return totals
+
+    def checkpoint(self, path):
+        """Write state to path atomically (a crash never leaves a half-written file)"""
+        folder = os.path.dirname(os.path.abspath(path))
+        fd, tmp = tempfile.mkstemp(dir=folder, prefix=".checkpoint-")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def restore(cls, path):
+        """Load state written by checkpoint()"""
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+# ==================== FEED INPUT ====================
+
+def _is_number(text):
+    try:
+        float(text)
+        return True
+    except ValueError:
+        return False
+
+
+def apply_feed(totals, path, checkpoint_path=None, checkpoint_every=100000):
+    """
+    Apply "category,period,amount" rows from a feed file.
+
+    Starts at totals.feed_offset, so rows already applied are skipped, and
+    checkpoints every checkpoint_every rows when a checkpoint path is given.
+    Only the first line of the file may be a header; every other row that
+    does not parse, or whose amount is negative or not finite, is reported
+    and counted.
+
+    Returns:
+        tuple: (rows applied, invalid rows skipped).
+    """
+    applied = 0
+    invalid = 0
+    with open(path, "rb") as f:
+        f.seek(totals.feed_offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # incomplete last line; pick it up next time
+            start = totals.feed_offset
+            text = line.decode("utf-8", errors="replace").strip()
+            totals.feed_offset += len(line)
+            if not text:
+                continue
+
+            fields = text.rsplit(",", 2)
+            try:
+                category, period, amount = fields[0], fields[1], parse_amount(fields[2])
+                if amount < 0:
+                    raise ValueError("Sales cannot be negative.")
+            except (IndexError, ValueError):
+                if start == 0 and not _is_number(fields[-1]):
+                    continue  # header row
+                print(f"Error! Skipping invalid row at byte {start}: {text}", file=sys.stderr)
+                invalid += 1
+                continue
+
+            totals.apply(category.strip(), period.strip(), amount)
+            applied += 1
+            if checkpoint_path and applied % checkpoint_every == 0:
+                totals.checkpoint(checkpoint_path)
+
+    if checkpoint_path:
+        totals.checkpoint(checkpoint_path)
+    return applied, invalid
+
+
+# ==================== PROGRAM ENTRY POINT ====================
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Keep running sales totals from a feed file.")
+    parser.add_argument("feed", help="CSV feed of category,period,amount rows")
+    parser.add_argument("--checkpoint", help="state file to resume from and save to")
+    args = parser.parse_args(argv)
+
+    if args.checkpoint and os.path.exists(args.checkpoint):
+        totals = RunningTotals.restore(args.checkpoint)
+    else:
+        totals = RunningTotals()
+
+    applied, invalid = apply_feed(totals, args.feed, args.checkpoint)
+    print(f"Applied {applied} new transactions ({totals.transactions} total).")
+    if invalid:
+        print(f"Skipped {invalid} invalid rows.")
+    display_summary(*totals.category_sales(), categories=totals.categories)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
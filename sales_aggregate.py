@@ -0,0 +1,273 @@
+"""
+Vectorized sales aggregation.
+
+Turns transaction rows of (category, date, amount) into a category x period
+matrix of sales totals, for any number of categories and periods. Category
+and period values are factorized into integer codes once, and the totals
+are summed with a single np.bincount over the combined (category, period)
+code, so millions of rows never go through Python-level loops.
+
+The result feeds the LabAct_WIthErrorHandling chart functions directly:
+
+    matrix = aggregate_file("transactions.csv")
+    display_summary(*matrix.totals, categories=matrix.categories)
+    create_bar_chart(*matrix.totals, categories=matrix.categories, periods=matrix.periods)
+    create_pie_chart(*matrix.category_totals(), categories=matrix.categories)
+
+Transaction files are CSV rows "category,date,amount" (header optional).
+Dates are ISO dates (2024-05-17); anything that is not a date, such as
+"Q1", is used as a period label as-is. A row without a date is an error.
+"""
+
+from itertools import islice
+
+import numpy as np
+
+CHUNK_ROWS = 262144
+FREQUENCIES = ("D", "W", "M", "Q", "Y")
+
+
+# ==================== RESULT ====================
+
+class SalesMatrix:
+    """Sales totals per category (rows) and period (columns)"""
+
+    def __init__(self, categories, periods, totals):
+        self.categories = list(categories)
+        self.periods = list(periods)
+        self.totals = np.asarray(totals, dtype=np.float64)
+
+    def category_totals(self):
+        """Total sales per category, across all periods"""
+        return self.totals.sum(axis=1)
+
+    def period_totals(self):
+        """Total sales per period, across all categories"""
+        return self.totals.sum(axis=0)
+
+    def __repr__(self):
+        return (f"SalesMatrix({len(self.categories)} categories x "
+                f"{len(self.periods)} periods, total={self.totals.sum():.2f})")
+
+
+# ==================== FACTORIZING ====================
+
+def factorize(values, order=None):
+    """
+    Map values to integer codes.
+
+    Args:
+    values: array of labels.
+    order (list): known labels in the order the codes should follow. When
+        not given the sorted unique values are used.
+
+    Returns:
+        tuple: (codes array, list of labels).
+    """
+    values = np.asarray(values)
+    uniques, codes = np.unique(values, return_inverse=True)
+    if order is None:
+        return codes, uniques.tolist()
+
+    order = list(order)
+    lookup = {label: i for i, label in enumerate(order)}
+    unknown = [u for u in uniques.tolist() if u not in lookup]
+    if unknown:
+        raise ValueError(f"unknown labels: {', '.join(map(str, unknown[:5]))}")
+    remap = np.array([lookup[u] for u in uniques.tolist()], dtype=np.int64)
+    return remap[codes], order
+
+
+def period_codes(dates, freq="Q"):
+    """
+    Convert dates into period codes and labels.
+
+    Args:
+    dates: array of datetime64 values or ISO date strings.
+    freq (str): "D" (day), "W" (week), "M" (month), "Q" (quarter) or "Y" (year).
+
+    Returns:
+        tuple: (codes array, list of period labels), periods in time order.
+    """
+    uniques, codes = np.unique(period_ordinals(dates, freq), return_inverse=True)
+    return codes, [period_label(ordinal, freq) for ordinal in uniques.tolist()]
+
+
+def to_days(dates):
+    """
+    Dates (datetime64 or ISO strings) as datetime64[D].
+
+    Raises:
+        ValueError: for a missing date (blank or NaT), which would
+        otherwise be counted in a junk period.
+    """
+    days = np.asarray(dates, dtype="datetime64[D]")
+    missing = np.flatnonzero(np.isnat(days))
+    if missing.size:
+        raise ValueError(f"missing date in row {missing[0] + 1} of {days.size}.")
+    return days
+
+
+def period_ordinals(dates, freq="Q"):
+    """
+    Number of the period each date falls in, counted from 1970.
+
+    Args:
+    dates: array of datetime64 values or ISO date strings.
+    freq (str): "D", "W", "M", "Q" or "Y" (see period_codes()).
+
+    Returns:
+        numpy.ndarray: int64 period ordinals (see period_label()).
+    """
+    days = to_days(dates)
+
+    if freq == "D":
+        return days.astype(np.int64)
+    if freq == "W":
+        # Weeks start on Monday; 1970-01-01 was a Thursday.
+        return (days.astype(np.int64) + 3) // 7
+    if freq in ("M", "Q", "Y"):
+        months = days.astype("datetime64[M]").astype(np.int64)
+        return {"M": months, "Q": months // 3, "Y": months // 12}[freq]
+    raise ValueError(f"unknown frequency {freq!r} (expected one of {FREQUENCIES}).")
+
+
+def period_label(ordinal, freq):
+    """Readable label for a period ordinal"""
+    if freq == "D":
+        return str(np.datetime64(ordinal, "D"))
+    if freq == "W":
+        return f"W{np.datetime64(ordinal * 7 - 3, 'D')}"
+    if freq == "M":
+        return str(np.datetime64(ordinal, "M"))
+    if freq == "Q":
+        return f"{1970 + ordinal // 4}-Q{ordinal % 4 + 1}"
+    return str(1970 + ordinal)
+
+
+# ==================== AGGREGATION ====================
+
+def group_totals(category_codes, period_codes, amounts, num_categories, num_periods):
+    """Sum amounts into a num_categories x num_periods matrix with one bincount"""
+    flat = np.asarray(category_codes, dtype=np.int64) * num_periods + period_codes
+    totals = np.bincount(flat, weights=amounts, minlength=num_categories * num_periods)
+    return totals.reshape(num_categories, num_periods)
+
+
+def _parse_periods(periods, freq, period_order):
+    """Period codes for dates, or for plain labels when they are not dates"""
+    if period_order is None:
+        try:
+            return period_codes(periods, freq)
+        except ValueError:
+            pass
+    return factorize(periods, period_order)
+
+
+def aggregate(categories, periods, amounts, freq="Q", category_order=None, period_order=None):
+    """
+    Aggregate transactions into a SalesMatrix.
+
+    Args:
+    categories: array of category names, one per transaction.
+    periods: array of dates (or period labels), one per transaction.
+    amounts: array of sale amounts, one per transaction.
+    freq (str): period size used for dates (see period_codes()).
+    category_order (list): fixed category rows (e.g. CATEGORIES).
+    period_order (list): fixed period labels (e.g. QUARTERS).
+
+    Returns:
+        SalesMatrix
+    """
+    amounts = np.asarray(amounts, dtype=np.float64)
+    cat_codes, cat_labels = factorize(categories, category_order)
+    per_codes, per_labels = _parse_periods(periods, freq, period_order)
+
+    totals = group_totals(cat_codes, per_codes, amounts, len(cat_labels), len(per_labels))
+    return SalesMatrix(cat_labels, per_labels, totals)
+
+
+def merge(matrices):
+    """
+    Add several SalesMatrix results together.
+
+    Categories and periods missing from some inputs count as zero.
+    """
+    categories = sorted({c for m in matrices for c in m.categories})
+    periods = sorted({p for m in matrices for p in m.periods})
+    if matrices and all(m.categories == matrices[0].categories for m in matrices):
+        categories = matrices[0].categories
+    if matrices and all(m.periods == matrices[0].periods for m in matrices):
+        periods = matrices[0].periods
+
+    cat_index = {c: i for i, c in enumerate(categories)}
+    per_index = {p: i for i, p in enumerate(periods)}
+    totals = np.zeros((len(categories), len(periods)))
+    for m in matrices:
+        rows = np.array([cat_index[c] for c in m.categories], dtype=np.int64)
+        cols = np.array([per_index[p] for p in m.periods], dtype=np.int64)
+        totals[np.ix_(rows, cols)] += m.totals
+    return SalesMatrix(categories, periods, totals)
+
+
+# ==================== FILE INPUT ====================
+
+def iter_transaction_chunks(path, chunk_rows=CHUNK_ROWS):
+    """
+    Stream a transactions CSV in chunks.
+
+    Yields:
+        tuple: (categories, periods, amounts) arrays.
+    """
+    with open(path, encoding="utf-8") as f:
+        first = True
+        line_num = 0
+        while True:
+            numbered = []
+            for line in islice(f, chunk_rows):
+                line_num += 1
+                if line.strip():
+                    numbered.append((line_num, line))
+            if not numbered:
+                break
+            line_nums = np.array([num for num, _ in numbered])
+            table = np.char.strip(np.loadtxt([line for _, line in numbered], delimiter=",",
+                                             dtype=str, comments=None, quotechar='"', ndmin=2))
+            if table.shape[1] != 3:
+                raise ValueError(f"{path}: expected rows of category,date,amount.")
+            if first:
+                first = False
+                try:
+                    float(table[0, 2])
+                except ValueError:
+                    table = table[1:]
+                    line_nums = line_nums[1:]
+            missing = np.flatnonzero((table[:, 1] == "") | (np.char.lower(table[:, 1]) == "nat"))
+            if missing.size:
+                raise ValueError(f"{path}: row {line_nums[missing[0]]}: missing date.")
+            try:
+                amounts = table[:, 2].astype(np.float64)
+            except ValueError:
+                raise ValueError(f"{path}: amounts must be valid numbers.")
+            yield table[:, 0], table[:, 1], amounts
+
+
+def aggregate_file(path, freq="Q", category_order=None, period_order=None, chunk_rows=CHUNK_ROWS):
+    """
+    Aggregate a transactions CSV chunk by chunk.
+
+    Memory use depends on the chunk size, not the file size.
+
+    Returns:
+        SalesMatrix
+    """
+    result = None
+    for categories, periods, amounts in iter_transaction_chunks(path, chunk_rows):
+        if not len(amounts):
+            continue
+        partial = aggregate(categories, periods, amounts, freq, category_order, period_order)
+        result = partial if result is None else merge([result, partial])
+
+    if result is None:
+        raise ValueError(f"{path}: no transactions found.")
+    return result
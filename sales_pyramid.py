@@ -0,0 +1,291 @@
+"""
+Pre-aggregated time-granularity pyramid for sales totals.
+
+The sales program only knows three fixed quarters, and sales_aggregate
+rescans every transaction for each period size. SalesPyramid sums the
+transactions once into daily totals per category and derives weekly,
+monthly, quarterly and yearly totals from them with np.add.reduceat (each
+level from the one below it), so drilling from quarters down to days
+never touches the transactions again:
+
+    pyramid = SalesPyramid.from_file("transactions.csv")
+    pyramid.totals("2024-02-10", "2024-08-01")      # per category, any range
+    quarters = pyramid.level_matrix("Q")
+    months = pyramid.level_matrix("M", "2024-04-01", "2024-07-01")
+    create_level_chart(pyramid, "W", "2024-04-01", "2024-05-01")
+
+A range query takes whole years where the range covers them, then whole
+quarters, months and weeks at its edges, and only the leftover days from
+the daily level, so even a multi-year range adds up a handful of buckets
+(see plan()). Ranges are half open, [start, stop), like SalesStore.select.
+
+    python sales_pyramid.py transactions.csv --level M --start 2024-04-01 --stop 2024-07-01
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+from sales_aggregate import SalesMatrix, factorize, period_label, period_ordinals, to_days
+
+LEVELS = ("Y", "Q", "M", "W", "D")
+LEVEL_NAMES = {"D": "Day", "W": "Week", "M": "Month", "Q": "Quarter", "Y": "Year"}
+# Each level is summed from the buckets of the one below it.
+PARENTS = {"W": "D", "M": "D", "Q": "M", "Y": "Q"}
+
+
+def _to_days(dates):
+    """Dates (datetime64 or ISO strings) as int64 day numbers; missing dates raise ValueError"""
+    return to_days(dates).astype(np.int64)
+
+
+class _Level:
+    """Buckets of one period size: where each starts and ends, and its totals"""
+
+    def __init__(self, ordinals, first, stop, totals):
+        self.ordinals = ordinals    # period ordinal per bucket
+        self.first = first          # first day (index into the daily level)
+        self.stop = stop            # one past the last day
+        self.totals = totals        # categories x buckets
+
+
+# ==================== PYRAMID ====================
+
+class SalesPyramid:
+    """Daily sales per category plus derived W/M/Q/Y levels"""
+
+    def __init__(self, categories=None):
+        """
+        Args:
+        categories (list): fixed category rows (more are added as they
+            appear in the data).
+        """
+        self.categories = list(categories or [])
+        self.start_day = None
+        self.daily = np.zeros((len(self.categories), 0))
+        self._levels = None
+
+    @classmethod
+    def from_transactions(cls, categories, dates, amounts, category_order=None):
+        """Pyramid for arrays of transactions (category, date, amount)"""
+        pyramid = cls(category_order)
+        pyramid.add(categories, dates, amounts)
+        return pyramid
+
+    @classmethod
+    def from_file(cls, path, category_order=None):
+        """Pyramid for a transactions CSV (see sales_aggregate), read in chunks"""
+        from sales_aggregate import iter_transaction_chunks
+
+        pyramid = cls(category_order)
+        for categories, dates, amounts in iter_transaction_chunks(path):
+            if len(amounts):
+                try:
+                    pyramid.add(categories, dates, amounts)
+                except ValueError as e:
+                    raise ValueError(f"{path}: the pyramid needs ISO dates (2024-05-17); {e}")
+        if pyramid.start_day is None:
+            raise ValueError(f"{path}: no transactions found.")
+        return pyramid
+
+    @classmethod
+    def from_store(cls, store):
+        """Pyramid for every row of a SalesStore"""
+        codes, days, amounts = store.select()
+        pyramid = cls(store.categories)
+        if len(amounts):
+            pyramid._add_days(codes, days.astype(np.int64), amounts)
+        return pyramid
+
+    # ---------- building ----------
+
+    def add(self, categories, dates, amounts):
+        """
+        Add transactions; the levels are rebuilt on the next query.
+
+        Raises:
+            ValueError: for a missing or unreadable date (nothing is added
+            then).
+        """
+        days = _to_days(dates)
+        codes, labels = factorize(categories)
+        known = {label: i for i, label in enumerate(self.categories)}
+        for label in labels:
+            if label not in known:
+                known[label] = len(self.categories)
+                self.categories.append(label)
+        rows = np.array([known[label] for label in labels], dtype=np.int64)
+        self._add_days(rows[codes], days, np.asarray(amounts, dtype=np.float64))
+
+    def _add_days(self, rows, days, amounts):
+        """Sum amounts into the daily level, growing it to cover new days and categories"""
+        low, high = int(days.min()), int(days.max()) + 1
+        if self.start_day is None:
+            self.start_day = low
+            self.daily = np.zeros((len(self.categories), 0))
+        start = min(self.start_day, low)
+        stop = max(self.start_day + self.daily.shape[1], high)
+        before = self.start_day - start
+        grow = (len(self.categories) - self.daily.shape[0], before,
+                stop - start - before - self.daily.shape[1])
+        if any(grow):
+            self.daily = np.pad(self.daily, ((0, grow[0]), (grow[1], grow[2])))
+            self.start_day = start
+
+        num_days = self.daily.shape[1]
+        flat = rows * num_days + (days - self.start_day)
+        self.daily += np.bincount(flat, weights=amounts,
+                                  minlength=self.daily.size).reshape(self.daily.shape)
+        self._levels = None
+
+    def _build(self):
+        """Derive every level from the daily totals"""
+        num_days = self.daily.shape[1]
+        days = np.arange(num_days)
+        levels = {"D": _Level(days + self.start_day, days, days + 1, self.daily)}
+        for freq in ("W", "M", "Q", "Y"):
+            parent = levels[PARENTS[freq]]
+            ordinals = period_ordinals((parent.first + self.start_day).astype("datetime64[D]"), freq)
+            starts = np.flatnonzero(np.diff(ordinals)) + 1
+            starts = np.concatenate(([0], starts))
+            totals = np.add.reduceat(parent.totals, starts, axis=1)
+            first = parent.first[starts]
+            stop = np.append(first[1:], num_days)
+            levels[freq] = _Level(ordinals[starts], first, stop, totals)
+        self._levels = levels
+
+    def level(self, freq):
+        """Buckets of one level ("D", "W", "M", "Q" or "Y")"""
+        if freq not in LEVEL_NAMES:
+            raise ValueError(f"unknown level {freq!r} (expected one of {LEVELS}).")
+        if self.start_day is None:
+            raise ValueError("no sales added yet.")
+        if self._levels is None:
+            self._build()
+        return self._levels[freq]
+
+    # ---------- queries ----------
+
+    def _day_range(self, start, stop):
+        """[start, stop) as indices into the daily level, clipped to the data"""
+        num_days = self.daily.shape[1]
+        if self.start_day is None:
+            return 0, 0
+        lo = 0 if start is None else int(_to_days([start])[0]) - self.start_day
+        hi = num_days if stop is None else int(_to_days([stop])[0]) - self.start_day
+        lo, hi = max(lo, 0), min(hi, num_days)
+        return lo, max(lo, hi)
+
+    def _cover(self, lo, hi, levels=LEVELS):
+        """Whole buckets covering days [lo, hi), in date order: [(freq, i0, i1), ...]"""
+        if lo >= hi:
+            return []
+        freq = levels[0]
+        if freq == "D":
+            return [("D", lo, hi)]
+        level = self.level(freq)
+        i0 = int(np.searchsorted(level.first, lo, "left"))
+        i1 = int(np.searchsorted(level.stop, hi, "right"))
+        if i0 >= i1:
+            return self._cover(lo, hi, levels[1:])
+        return (self._cover(lo, int(level.first[i0]), levels[1:]) + [(freq, i0, i1)]
+                + self._cover(int(level.stop[i1 - 1]), hi, levels[1:]))
+
+    def plan(self, start=None, stop=None):
+        """
+        Buckets a range query adds up, in date order.
+
+        Returns:
+            list: (freq, first bucket, stop bucket) per contiguous run.
+        """
+        return self._cover(*self._day_range(start, stop))
+
+    def _sum(self, lo, hi):
+        result = np.zeros(len(self.categories))
+        for freq, i0, i1 in self._cover(lo, hi):
+            result += self.level(freq).totals[:, i0:i1].sum(axis=1)
+        return result
+
+    def totals(self, start=None, stop=None, category=None):
+        """
+        Sales in [start, stop) per category (or for one category).
+
+        Returns:
+            numpy.ndarray (one total per category) or float.
+        """
+        result = self._sum(*self._day_range(start, stop))
+        if category is None:
+            return result
+        if category not in self.categories:
+            raise ValueError(f"unknown category {category!r}")
+        return float(result[self.categories.index(category)])
+
+    def level_matrix(self, freq="Q", start=None, stop=None):
+        """
+        Totals per category and period of one level, as a SalesMatrix.
+
+        Periods cut by start/stop only count their days inside the range.
+        """
+        lo, hi = self._day_range(start, stop)
+        if lo >= hi:
+            raise ValueError("no sales in the selected range.")
+        level = self.level(freq)
+        j0 = int(np.searchsorted(level.stop, lo, "right"))
+        j1 = int(np.searchsorted(level.first, hi, "left"))
+
+        totals = level.totals[:, j0:j1].copy()
+        if level.first[j0] < lo or level.stop[j0] > hi:
+            totals[:, 0] = self._sum(max(int(level.first[j0]), lo), min(int(level.stop[j0]), hi))
+        if j1 - 1 > j0 and level.stop[j1 - 1] > hi:
+            totals[:, -1] = self._sum(int(level.first[j1 - 1]), hi)
+        periods = [period_label(ordinal, freq) for ordinal in level.ordinals[j0:j1].tolist()]
+        return SalesMatrix(self.categories, periods, totals)
+
+
+# ==================== CHARTS ====================
+
+def create_level_chart(pyramid, freq="Q", start=None, stop=None, output=None, fmt=None):
+    """Bar chart of one pyramid level with create_bar_chart"""
+    from LabAct_WIthErrorHandling import create_bar_chart
+
+    matrix = pyramid.level_matrix(freq, start, stop)
+    create_bar_chart(*matrix.totals, categories=matrix.categories, periods=matrix.periods,
+                     title=f'VisProg Inc. - Sales by {LEVEL_NAMES[freq]}',
+                     xlabel=LEVEL_NAMES[freq], output=output, fmt=fmt)
+    return matrix
+
+
+# ==================== PROGRAM ENTRY POINT ====================
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Drill into sales by year, quarter, month, week or day.")
+    parser.add_argument("source", help="transactions CSV, or a SalesStore directory")
+    parser.add_argument("--level", default="Q", choices=LEVELS, help="period size (default: Q)")
+    parser.add_argument("--start", help="first date (ISO) to include")
+    parser.add_argument("--stop", help="first date (ISO) to leave out")
+    parser.add_argument("-o", "--output", help="save the chart here instead of showing it")
+    args = parser.parse_args(argv)
+
+    from LabAct_WIthErrorHandling import display_summary
+
+    try:
+        if os.path.isdir(args.source):
+            from sales_store import SalesStore
+            pyramid = SalesPyramid.from_store(SalesStore(args.source))
+        else:
+            pyramid = SalesPyramid.from_file(args.source)
+        matrix = pyramid.level_matrix(args.level, args.start, args.stop)
+    except (OSError, ValueError) as e:
+        print(f"Error! {e}", file=sys.stderr)
+        return 1
+
+    display_summary(*matrix.totals.tolist(), categories=matrix.categories)
+    create_level_chart(pyramid, args.level, args.start, args.stop, output=args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
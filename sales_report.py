@@ -0,0 +1,192 @@
+"""
+Multi-page sales reports, one section per store.
+
+LabAct_WIthErrorHandling.main() shows its bar and pie chart in two
+blocking windows. For reports covering many stores, this module writes
+each store's summary table (what display_summary prints) and both charts
+as pages of one PDF:
+
+    python sales_report.py store_*.csv -o report.pdf
+    python sales_report.py store_*.csv --split reports/            # one PDF per store
+    python sales_report.py store_*.csv --split reports/ --format svg
+
+Stores are aggregated one at a time (sales_aggregate.aggregate_file), and
+every page goes through the same chart functions as the program, with
+output set to the open PdfPages. Figures come from the figure manager's
+pool, so the same few figure objects are redrawn for every page instead
+of being created per page. Each page is written to the file as soon as it
+is finished, with fonts embedded once at the end. Memory therefore stays
+flat however many stores the report has. SVG has no pages, so with
+--format svg every page becomes its own file.
+"""
+
+import argparse
+import os
+import re
+import sys
+
+import LabAct_WIthErrorHandling as labact
+from profiling import count
+
+REPORT_TITLE = "VisProg Inc. - Sales Report"
+PAGES = ("summary", "bar", "pie")
+
+
+# ==================== ENTITIES ====================
+
+def iter_store_files(paths, freq="Q"):
+    """
+    Aggregate transaction files one at a time.
+
+    Yields:
+        (name, SalesMatrix): the file name without extension, and its totals.
+    """
+    from sales_aggregate import aggregate_file
+
+    for path in paths:
+        name = os.path.splitext(os.path.basename(path))[0]
+        yield name, aggregate_file(path, freq)
+
+
+def _file_name(name):
+    """A store name made safe to use as a file name"""
+    return re.sub(r"[^\w.-]+", "_", name).strip("._") or "store"
+
+
+def _unique_name(name, used):
+    """
+    _file_name(name), numbered (_2, _3, ...) when an earlier store already has it.
+
+    Stores from different folders can share a basename, and different names
+    can clean up to the same file name; without this their files would
+    overwrite each other. Names are compared case-insensitively for
+    filesystems that ignore case.
+    """
+    base = _file_name(name)
+    unique, number = base, 1
+    while unique.lower() in used:
+        number += 1
+        unique = f"{base}_{number}"
+    used.add(unique.lower())
+    return unique
+
+
+# ==================== PAGES ====================
+
+def write_pages(name, matrix, output, fmt="pdf"):
+    """
+    Write one store's summary table, bar chart and pie chart.
+
+    Args:
+    name (str): store name, shown in every page title.
+    matrix (SalesMatrix): the store's sales per category and period.
+    output: open PdfPages to add the pages to, or (for other formats) a
+        file name pattern with a {page} field.
+    fmt (str): output format.
+
+    Returns:
+        int: number of pages written (the pie is skipped without sales).
+    """
+    def target(page):
+        return output.format(page=page) if isinstance(output, str) else output
+
+    sales = matrix.totals
+    labact.create_summary_table(*sales, categories=matrix.categories, periods=matrix.periods,
+                                title=f"{name} - Sales Summary", output=target("summary"),
+                                fmt=fmt)
+    labact.create_bar_chart(*sales, categories=matrix.categories, periods=matrix.periods,
+                            title=f"{name} - Quarterly Sales Comparison", output=target("bar"),
+                            fmt=fmt)
+    pages = 2
+    totals = matrix.category_totals()
+    if totals.sum() > 0:
+        labact.create_pie_chart(*totals, categories=matrix.categories,
+                                title=f"{name} - Product Category Distribution",
+                                output=target("pie"), fmt=fmt)
+        pages += 1
+    count("report_pages", pages)
+    return pages
+
+
+def write_report(path, entities):
+    """
+    Write every store's pages into one multi-page PDF.
+
+    Args:
+    path (str): PDF file to write.
+    entities: iterable of (name, SalesMatrix); it is consumed lazily, so
+        a generator such as iter_store_files() keeps one store in memory.
+
+    Returns:
+        int: number of pages written.
+    """
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    pages = 0
+    with PdfPages(path, metadata={"Title": REPORT_TITLE}) as pdf:
+        for name, matrix in entities:
+            pages += write_pages(name, matrix, pdf)
+    return pages
+
+
+def write_reports(directory, entities, fmt="pdf"):
+    """
+    Write a separate report for each store into a directory.
+
+    With fmt="pdf" each store gets one multi-page PDF (<store>.pdf); for
+    other formats each page is its own file (<store>_summary.svg, ...).
+    Stores whose names give the same file name are numbered (<store>_2.pdf).
+
+    Returns:
+        list[str]: paths written.
+    """
+    os.makedirs(directory, exist_ok=True)
+    written = []
+    used = set()
+    for name, matrix in entities:
+        stem = os.path.join(directory, _unique_name(name, used))
+        if fmt == "pdf":
+            write_report(f"{stem}.pdf", [(name, matrix)])
+            written.append(f"{stem}.pdf")
+        else:
+            pattern = stem.replace("{", "{{").replace("}", "}}") + f"_{{page}}.{fmt}"
+            pages = write_pages(name, matrix, pattern, fmt)
+            written.extend(pattern.format(page=page) for page in PAGES[:pages])
+    return written
+
+
+# ==================== PROGRAM ENTRY POINT ====================
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Write a multi-page sales report per store.")
+    parser.add_argument("files", nargs="+", help="store transaction files (category,date,amount)")
+    parser.add_argument("-o", "--output", default="sales_report.pdf",
+                        help="PDF file for the combined report")
+    parser.add_argument("--split", metavar="DIR",
+                        help="write one report per store into DIR instead")
+    parser.add_argument("--format", default="pdf", help="page format with --split (pdf, svg, png)")
+    parser.add_argument("--freq", default="Q", help="period size: D, W, M, Q or Y (default: Q)")
+    args = parser.parse_args(argv)
+
+    import matplotlib
+    matplotlib.use("Agg")
+
+    entities = iter_store_files(args.files, args.freq)
+    try:
+        if args.split:
+            written = write_reports(args.split, entities, args.format)
+            print(f"Wrote {len(written)} files to {args.split}")
+        else:
+            if args.format != "pdf":
+                parser.error("only PDF reports can hold several pages; use --split for other formats")
+            pages = write_report(args.output, entities)
+            print(f"Wrote {pages} pages for {len(args.files)} stores to {args.output}")
+    except (OSError, ValueError) as e:
+        print(f"Error! {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,289 @@
+"""
+Memory-mapped columnar store for historical sales.
+
+A store is a directory holding one fixed-width binary file per column plus
+a small JSON index:
+
+    category.u2   uint16 category code per row
+    day.i4        int32 sale date (days since 1970-01-01)
+    amount.f8     float64 sale amount
+    index.json    category names, row counts and per-category row offsets
+
+Columns are opened with np.memmap, so opening even a multi-GB history only
+reads the index; pages of the column files are loaded by the OS as they are
+touched. After compact() rows are grouped by category and sorted by date,
+and the index records where each category's block starts, so reading one
+category or a date range within it only touches the pages it needs.
+
+New rows are appended to the end of the column files (the "tail") without
+rewriting anything. Queries look at the tail as well; compact() folds it
+into the sorted part. compact() writes a new generation of all three column
+files (category.2.u2, ...) and switches to it by rewriting the index, so a
+crash part way through never leaves the columns out of step.
+
+    store = SalesStore.create("history")
+    store.append(categories, dates, amounts)
+    store.compact()
+    matrix = store.matrix(freq="Q")
+    create_bar_chart(*matrix.totals, categories=matrix.categories, periods=matrix.periods)
+"""
+
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from sales_aggregate import SalesMatrix, group_totals, period_codes, to_days
+
+# Version 1 stores have no "generation" in their index (generation 0).
+STORE_VERSION = 2
+READ_VERSIONS = (1, 2)
+COLUMNS = {"category": np.uint16, "day": np.int32, "amount": np.float64}
+FILES = {"category": "category.u2", "day": "day.i4", "amount": "amount.f8"}
+INDEX_FILE = "index.json"
+MAX_CATEGORIES = np.iinfo(np.uint16).max + 1
+
+
+def _to_days(dates):
+    """Dates (datetime64 or ISO strings) as int32 day numbers; missing dates raise ValueError"""
+    return to_days(dates).astype(np.int64).astype(np.int32)
+
+
+def _column_file(name, generation):
+    """File name of a column in one generation (generation 0 is FILES[name])"""
+    if generation == 0:
+        return FILES[name]
+    stem, ext = os.path.splitext(FILES[name])
+    return f"{stem}.{generation}{ext}"
+
+
+# ==================== STORE ====================
+
+class SalesStore:
+    """Columnar sales history on disk, read through memory maps"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, INDEX_FILE), encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("version") not in READ_VERSIONS:
+            raise ValueError(f"{path}: unsupported store version {index.get('version')!r}")
+
+        self.categories = index["categories"]
+        self.rows = index["rows"]
+        self.sorted_rows = index["sorted_rows"]
+        self.offsets = index["offsets"]
+        self.generation = index.get("generation", 0)
+        self._codes = {name: code for code, name in enumerate(self.categories)}
+        self._columns = None
+
+    @classmethod
+    def create(cls, path, categories=None):
+        """Create an empty store (categories are optional; new ones are added on append)"""
+        os.makedirs(path, exist_ok=True)
+        if os.path.exists(os.path.join(path, INDEX_FILE)):
+            raise ValueError(f"{path}: a sales store already exists here.")
+        for name in FILES.values():
+            open(os.path.join(path, name), "wb").close()
+
+        categories = list(categories or [])
+        _write_index(path, categories, 0, 0, [0] * (len(categories) + 1), 0)
+        return cls(path)
+
+    # ---------- column access ----------
+
+    def _file(self, name):
+        return os.path.join(self.path, _column_file(name, self.generation))
+
+    def columns(self):
+        """Memory-mapped (category, day, amount) arrays covering all rows"""
+        if self._columns is None:
+            self._columns = {}
+            for name, dtype in COLUMNS.items():
+                if self.rows == 0:
+                    self._columns[name] = np.empty(0, dtype=dtype)
+                else:
+                    self._columns[name] = np.memmap(
+                        self._file(name), dtype=dtype,
+                        mode="r", shape=(self.rows,),
+                    )
+        return self._columns
+
+    def _code(self, category):
+        try:
+            return self._codes[category]
+        except KeyError:
+            raise ValueError(f"unknown category {category!r}")
+
+    # ---------- writes ----------
+
+    def append(self, categories, dates, amounts):
+        """
+        Append transactions to the end of the store.
+
+        Args:
+        categories: category name per row.
+        dates: sale date per row (datetime64 or ISO strings).
+        amounts: sale amount per row.
+
+        Raises:
+            ValueError: for missing dates, amounts that are not finite,
+            mismatched lengths or too many categories. Nothing is written
+            then.
+        """
+        # Validate everything before touching the in-memory index, so a
+        # rejected append leaves it matching what is on disk.
+        uniques, codes = np.unique(np.asarray(categories), return_inverse=True)
+        new_names = [name for name in uniques.tolist() if name not in self._codes]
+        if len(self.categories) + len(new_names) > MAX_CATEGORIES:
+            raise ValueError(f"a store holds at most {MAX_CATEGORIES} categories.")
+        days = _to_days(dates)
+        amounts = np.asarray(amounts, dtype=np.float64)
+        count = len(amounts)
+        if len(codes) != count or len(days) != count:
+            raise ValueError("categories, dates and amounts must have the same length.")
+        if not np.isfinite(amounts).all():
+            raise ValueError("amounts must be finite numbers.")
+
+        codes_by_name = dict(self._codes)
+        for name in new_names:
+            codes_by_name[name] = len(codes_by_name)
+        remap = np.array([codes_by_name[u] for u in uniques.tolist()], dtype=np.uint16)
+        data = {"category": remap[codes], "day": days, "amount": amounts}
+
+        self._columns = None
+        for name, values in data.items():
+            # Drop any bytes left behind by an append that failed part way
+            target = self._file(name)
+            os.truncate(target, self.rows * np.dtype(COLUMNS[name]).itemsize)
+            with open(target, "ab") as f:
+                values.astype(COLUMNS[name], copy=False).tofile(f)
+
+        # The index is written last: if anything above fails, readers still
+        # only see the rows the previous index promised.
+        for name in new_names:
+            self._codes[name] = len(self.categories)
+            self.categories.append(name)
+            self.offsets.append(self.offsets[-1])
+        self.rows += count
+        self._save_index()
+
+    def compact(self):
+        """
+        Fold the unsorted tail in: group rows by category, sorted by date.
+
+        This rewrites the column files and needs the columns in memory once,
+        so run it occasionally (e.g. after a day's appends), not per append.
+        """
+        if self.sorted_rows == self.rows:
+            return
+
+        cols = self.columns()
+        order = np.lexsort((cols["day"], cols["category"]))
+        sorted_cols = {name: np.asarray(values)[order] for name, values in cols.items()}
+        counts = np.bincount(sorted_cols["category"], minlength=len(self.categories))
+
+        # Write the next generation of every column, then switch to it by
+        # writing the index; until then readers keep using the old files.
+        generation = self.generation + 1
+        for name, values in sorted_cols.items():
+            fd, tmp = tempfile.mkstemp(dir=self.path, prefix=".compact-")
+            with os.fdopen(fd, "wb") as f:
+                values.tofile(f)
+            os.replace(tmp, os.path.join(self.path, _column_file(name, generation)))
+
+        old_files = [self._file(name) for name in COLUMNS]
+        offsets = [0] + np.cumsum(counts).tolist()
+        _write_index(self.path, self.categories, self.rows, self.rows, offsets, generation)
+        self._columns = None
+        self.generation = generation
+        self.sorted_rows = self.rows
+        self.offsets = offsets
+        for old in old_files:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+    def _save_index(self):
+        _write_index(self.path, self.categories, self.rows, self.sorted_rows, self.offsets,
+                     self.generation)
+
+    # ---------- reads ----------
+
+    def select(self, category=None, start=None, stop=None):
+        """
+        Rows for one category and/or a date range [start, stop).
+
+        Only the category's block in the sorted part (narrowed further by
+        binary search on the dates) and the unsorted tail are read.
+
+        Returns:
+            tuple: (category codes, day numbers, amounts) arrays.
+        """
+        cols = self.columns()
+        lo_day = None if start is None else _to_days([start])[0]
+        hi_day = None if stop is None else _to_days([stop])[0]
+
+        parts = []
+        if category is None:
+            blocks = [(self.offsets[i], self.offsets[i + 1]) for i in range(len(self.categories))]
+        else:
+            code = self._code(category)
+            blocks = [(self.offsets[code], self.offsets[code + 1])]
+
+        for block_start, block_stop in blocks:
+            if block_start == block_stop:
+                continue
+            days = cols["day"][block_start:block_stop]
+            lo = 0 if lo_day is None else int(np.searchsorted(days, lo_day, "left"))
+            hi = len(days) if hi_day is None else int(np.searchsorted(days, hi_day, "left"))
+            if lo < hi:
+                parts.append(slice(block_start + lo, block_start + hi))
+
+        selected = [tuple(cols[name][part] for name in COLUMNS) for part in parts]
+
+        if self.rows > self.sorted_rows:
+            tail = slice(self.sorted_rows, self.rows)
+            mask = np.ones(self.rows - self.sorted_rows, dtype=bool)
+            if category is not None:
+                mask &= cols["category"][tail] == self._code(category)
+            if lo_day is not None:
+                mask &= cols["day"][tail] >= lo_day
+            if hi_day is not None:
+                mask &= cols["day"][tail] < hi_day
+            selected.append(tuple(cols[name][tail][mask] for name in COLUMNS))
+
+        if not selected:
+            return tuple(np.empty(0, dtype=dtype) for dtype in COLUMNS.values())
+        return tuple(np.concatenate([part[i] for part in selected]) for i in range(3))
+
+    def matrix(self, freq="Q", category=None, start=None, stop=None):
+        """Category x period SalesMatrix for the selected rows"""
+        codes, days, amounts = self.select(category, start, stop)
+        if not len(amounts):
+            raise ValueError("no sales in the selected range.")
+        per_codes, per_labels = period_codes(days.astype("datetime64[D]"), freq)
+        totals = group_totals(codes, per_codes, amounts, len(self.categories), len(per_labels))
+
+        if category is not None:
+            row = self._code(category)
+            return SalesMatrix([category], per_labels, totals[row:row + 1])
+        return SalesMatrix(self.categories, per_labels, totals)
+
+
+def _write_index(path, categories, rows, sorted_rows, offsets, generation):
+    """Atomically replace the store index"""
+    index = {
+        "version": STORE_VERSION,
+        "categories": categories,
+        "rows": rows,
+        "sorted_rows": sorted_rows,
+        "offsets": offsets,
+        "generation": generation,
+    }
+    fd, tmp = tempfile.mkstemp(dir=path, prefix=".index-")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(index, f)
+    os.replace(tmp, os.path.join(path, INDEX_FILE))
@@ -0,0 +1,236 @@
+"""
+Parsing and validation of sales amounts typed or imported as text.
+
+get_valid_input takes one amount at a time, and used to reject amounts
+written the way people write money ("50,000", "₱50000"). parse_amount()
+accepts those for a single answer. parse_sales() does the same for a
+whole column of strings at once (an imported sheet, for example). It
+returns the clean amounts plus a Rejections report of which rows were
+bad and why, so one bad cell does not stop the import.
+
+    values, rejected = parse_sales(["₱50,000", "$1,200.50", "abc", "-5"])
+    values              # array([50000. ,  1200.5])
+    rejected.describe() # '2 rejected: 1 not a number (row 2), 1 negative (row 3)'
+
+Commas are only accepted as thousands separators ("1,234,567.50", not
+"1,2,3"), and amounts with underscores are rejected even though float()
+takes "1_000". The whole column is cleaned with a few str.replace calls
+on one joined string, after the positions of all its commas and
+underscores have been checked with NumPy on that string's bytes. It is
+then converted block by block with the C float parser, and
+the finite and non-negative rules are checked on the resulting array.
+Only blocks that contain a bad row fall back to checking row by row.
+This runs at a few million values per second; np.strings and
+astype(float) on string arrays both measured slower here.
+"""
+
+import math
+
+CURRENCY_SYMBOLS = ("₱", "PHP", "$")
+THOUSANDS_SEPARATOR = ","
+# An amount with thousands separators, e.g. "-1,234,567.5"
+GROUPED_AMOUNT = r"[ \t]*[+-]?\d{1,3}(?:,\d{3})+(?:\.\d*)?(?:[eE][+-]?\d+)?[ \t\r]*"
+BLOCK_ROWS = 65536
+
+EMPTY = 1
+NOT_A_NUMBER = 2
+NOT_FINITE = 3
+NEGATIVE = 4
+REASONS = {
+    EMPTY: "empty",
+    NOT_A_NUMBER: "not a number",
+    NOT_FINITE: "not finite",
+    NEGATIVE: "negative",
+}
+
+
+# ==================== SINGLE VALUES ====================
+
+def _drop_symbols(text):
+    """Drop currency symbols"""
+    for symbol in CURRENCY_SYMBOLS:
+        text = text.replace(symbol, "")
+    return text
+
+
+def _misplaced(text):
+    """True if an amount (without currency symbols) has an underscore or a stray comma"""
+    # float() would take "1_000"; amounts written with underscores are typos.
+    if "_" in text:
+        return True
+    if THOUSANDS_SEPARATOR not in text:
+        return False
+    import re  # only loaded once someone types a comma (startup budget)
+    return re.fullmatch(GROUPED_AMOUNT, text) is None
+
+
+def parse_amount(text):
+    """
+    Parse one amount, allowing currency symbols and thousands separators.
+
+    Negative amounts are returned as they are; get_valid_input reports
+    them with their own message.
+
+    Raises:
+        ValueError: if the text is not a finite number.
+    """
+    cleaned = _drop_symbols(text)
+    value = math.nan
+    if not _misplaced(cleaned):
+        try:
+            value = float(cleaned.replace(THOUSANDS_SEPARATOR, ""))
+        except ValueError:
+            pass
+    if not math.isfinite(value):
+        raise ValueError(f"Not a valid amount: {text!r}")
+    return value
+
+
+# ==================== WHOLE COLUMNS ====================
+
+class Rejections:
+    """Rows of a column that were rejected, with a reason code for each"""
+
+    def __init__(self, rows, reasons):
+        """
+        Args:
+        rows: sorted int64 array of rejected row indices.
+        reasons: uint8 array of reason codes (see REASONS), one per row.
+        """
+        self.rows = rows
+        self.reasons = reasons
+
+    def __len__(self):
+        return len(self.rows)
+
+    def counts(self):
+        """Number of rejected rows per reason"""
+        import numpy as np
+
+        codes, totals = np.unique(self.reasons, return_counts=True)
+        return {REASONS[int(code)]: int(total) for code, total in zip(codes, totals)}
+
+    def describe(self, limit=3):
+        """One line summary, listing the first few rows for each reason"""
+        if not len(self):
+            return "0 rejected"
+        parts = []
+        for code, reason in REASONS.items():
+            rows = self.rows[self.reasons == code]
+            if rows.size:
+                shown = ", ".join(str(row) for row in rows[:limit])
+                more = ", ..." if rows.size > limit else ""
+                noun = "row" if rows.size == 1 else "rows"
+                parts.append(f"{rows.size} {reason} ({noun} {shown}{more})")
+        return f"{len(self)} rejected: " + ", ".join(parts)
+
+
+def _misplaced_lines(text):
+    """
+    Lines of text with an underscore or a comma that is not a thousands
+    separator, found with array operations instead of a regular
+    expression per line (the same rule as GROUPED_AMOUNT).
+    """
+    import numpy as np
+
+    data = np.frombuffer(text.encode("utf-8", "surrogatepass"), dtype=np.uint8)
+    bad = [np.flatnonzero(data == ord("_"))]
+    commas = np.flatnonzero(data == ord(THOUSANDS_SEPARATOR))
+    if commas.size:
+        padded = np.pad(data, 5, constant_values=ord("\n"))
+        digit = (padded >= ord("0")) & (padded <= ord("9"))
+        at = commas + 5
+        # Exactly three digits after the comma...
+        after = digit[at + 1] & digit[at + 2] & digit[at + 3] & ~digit[at + 4]
+        # ...and one to three before it, not part of a fraction or exponent
+        # (a group after another comma was checked by that comma).
+        d1 = digit[at - 1]
+        d2 = d1 & digit[at - 2]
+        d3 = d2 & digit[at - 3]
+        d4 = d3 & digit[at - 4]
+        before = padded[at - 1 - d1 - d2 - d3]
+        ok = after & d1 & ~d4 & ~np.isin(before, [ord("."), ord("e"), ord("E")])
+        bad.append(commas[~ok])
+
+    positions = np.concatenate(bad)
+    if not positions.size:
+        return []
+    newlines = np.flatnonzero(data == ord("\n"))
+    return np.unique(np.searchsorted(newlines, positions)).tolist()
+
+
+def _split_clean(raw):
+    """
+    Cleaned text of every row (one joined string, cleaned in one pass).
+
+    Returns:
+        (lines, bad): the cleaned rows, and the rows with an underscore
+        or a misplaced comma.
+    """
+    try:
+        text = "\n".join(raw)
+    except TypeError:
+        raw = [str(item) for item in raw]
+        text = "\n".join(raw)
+    text = _drop_symbols(text)
+    lines = text.replace(THOUSANDS_SEPARATOR, "").split("\n")
+    if len(lines) == len(raw):
+        return lines, _misplaced_lines(text)
+
+    # Some row had a line break in it: clean the rows one by one.
+    texts = [_drop_symbols(str(item)) for item in raw]
+    lines = [text.replace(THOUSANDS_SEPARATOR, "") for text in texts]
+    return lines, [row for row, text in enumerate(texts) if _misplaced(text)]
+
+
+def parse_sales(raw, keep_rows=False):
+    """
+    Parse a column of sales amounts.
+
+    Args:
+    raw: sequence of strings (numbers are accepted too), e.g. one column
+        read from a CSV file.
+    keep_rows (bool): return one value per input row, with NaN in the
+        rejected rows, instead of only the accepted values.
+
+    Returns:
+        (values, rejections): float64 array and a Rejections report.
+    """
+    import numpy as np
+
+    if isinstance(raw, np.ndarray) and raw.dtype.kind in "iuf":
+        values = raw.astype(np.float64).ravel()
+        codes = np.zeros(values.size, dtype=np.uint8)
+    else:
+        if not isinstance(raw, (list, tuple)):
+            raw = [str(item) for item in np.ravel(raw)] if isinstance(raw, np.ndarray) else list(raw)
+        num_rows = len(raw)
+        codes = np.zeros(num_rows, dtype=np.uint8)
+        lines, bad = _split_clean(raw)
+        values = np.empty(num_rows)
+        for start in range(0, num_rows, BLOCK_ROWS):
+            block = lines[start:start + BLOCK_ROWS]
+            try:
+                values[start:start + len(block)] = np.fromiter(map(float, block), np.float64,
+                                                               len(block))
+                continue
+            except ValueError:
+                pass
+            for row, text in enumerate(block, start):
+                try:
+                    values[row] = float(text)
+                except ValueError:
+                    values[row] = np.nan
+                    codes[row] = EMPTY if not text.strip() else NOT_A_NUMBER
+        values[bad] = np.nan
+        codes[bad] = NOT_A_NUMBER
+
+    codes[(codes == 0) & ~np.isfinite(values)] = NOT_FINITE
+    codes[(codes == 0) & (values < 0)] = NEGATIVE
+
+    rows = np.flatnonzero(codes)
+    rejections = Rejections(rows, codes[rows])
+    if keep_rows:
+        values[rows] = np.nan
+        return values, rejections
+    return values[codes == 0], rejections
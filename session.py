@@ -0,0 +1,301 @@
+"""
+Record and replay sessions of the interactive chart programs.
+
+Rebuilding the same charts means typing through the same menus and prompts
+every time. `record` runs a program as usual and saves every answer typed
+at its prompts into a small JSON transcript; `replay` runs the program
+again with the answers fed back from the transcript instead of the
+terminal. The answers go through the program's own prompt functions, so
+the same validation applies (a mistyped answer that was rejected while
+recording is rejected again, and the answer that followed it is used).
+During replay nothing is printed and every chart is saved into a
+directory instead of being shown, in one unattended pass:
+
+    python session.py record labexamnga weekly.json
+    python session.py replay weekly.json --outdir charts
+    python session.py replay weekly.json --outdir charts --data this_week.csv
+
+Each answer is stored with the chain of functions that asked for it
+(e.g. "main/handle_bar_graph/get_bar_width"), which is how replay keeps
+answers and prompts lined up. --data replaces the answer to the "Data file
+to load" prompt and drops the values that were typed in by hand, keeping
+every style choice. When the new data has a different number of bars or
+slices, extra per-item answers are skipped and missing ones repeat the
+last answer given at that prompt; prompts the recording never reached
+(and answers that get rejected) take the default, as if Enter was pressed.
+"""
+
+import argparse
+import builtins
+import importlib
+import json
+import sys
+
+PROGRAMS = {
+    "labexamnga": "labexamnga",
+    "labact": "LabAct_WIthErrorHandling",
+}
+TRANSCRIPT_VERSION = 1
+DATA_FILE_PROMPT = "get_data_file"
+DATA_ENTRY_PROMPTS = ("get_data_points", "get_bar_data")
+
+
+class ReplayError(Exception):
+    """The transcript does not fit the prompts the program asks"""
+
+
+# ==================== PROMPT HOOKS ====================
+
+def _asked_by(module):
+    """Chain of the module's functions that led to the current input() call"""
+    names = []
+    frame = sys._getframe(2)
+    while frame is not None and frame.f_globals is module.__dict__:
+        names.append(frame.f_code.co_name)
+        frame = frame.f_back
+    return "/".join(reversed(names))
+
+
+def _section(asked_by):
+    """Part of the program a prompt belongs to (e.g. main/handle_pie_chart)"""
+    return "/".join(asked_by.split("/")[:2])
+
+
+class _Recorder:
+    """input() replacement that asks the terminal and keeps every answer"""
+
+    def __init__(self, module):
+        self.module = module
+        self.answers = []
+
+    def __call__(self, prompt=""):
+        asked_by = _asked_by(self.module)
+        answer = builtins.input(prompt)
+        self.answers.append((asked_by, answer))
+        return answer
+
+
+class _Player:
+    """input() replacement that answers from a transcript"""
+
+    def __init__(self, module, answers, data=None):
+        self.module = module
+        self.answers = list(reversed(answers))
+        self.data = data
+        self.adapt = data is not None
+        self.last = {}
+        self.errors = 0
+        self._last_asked = None
+        self._fallback = None
+        self._skip_data_entry = False
+
+    def print(self, *args, **kwargs):
+        """print() replacement: stays quiet, but notices rejected answers"""
+        if args and str(args[0]).lstrip().startswith("Error"):
+            self.errors += 1
+
+    def __call__(self, prompt=""):
+        asked_by = _asked_by(self.module)
+        rejected, self.errors = self.errors, 0
+
+        if self._skip_data_entry:
+            while self.answers and self.answers[-1][0].endswith(DATA_ENTRY_PROMPTS):
+                self.answers.pop()
+            self._skip_data_entry = False
+
+        if self.data is not None and asked_by.endswith(DATA_FILE_PROMPT):
+            if rejected and self._last_asked == asked_by:
+                raise ReplayError(f"Could not load data file '{self.data}'.")
+            if not self.answers or not self.answers[-1][0].endswith(DATA_FILE_PROMPT):
+                raise ReplayError(f"Expected a data file prompt in the transcript at '{asked_by}'.")
+            self.answers.pop()
+            self._skip_data_entry = True
+            return self._answer(asked_by, self.data)
+
+        if self.answers and self.answers[-1][0] == asked_by:
+            return self._answer(asked_by, self.answers.pop()[1])
+        if not self.adapt:
+            if not self.answers:
+                raise EOFError("End of transcript.")
+            raise ReplayError(f"Transcript answers '{self.answers[-1][0]}' "
+                              f"but the program asks at '{asked_by}'.")
+
+        # Fewer items than recorded: drop answers left over for the last
+        # prompt, or for a part of the program that is already done.
+        done = _section(self._last_asked or "")
+        while self.answers and self.answers[-1][0] != asked_by and (
+                self.answers[-1][0] == self._last_asked
+                or _section(self.answers[-1][0]) == done != _section(asked_by)):
+            self.answers.pop()
+        if self.answers and self.answers[-1][0] == asked_by:
+            return self._answer(asked_by, self.answers.pop()[1])
+
+        if not self.answers:
+            raise EOFError("End of transcript.")
+
+        # More items than recorded (or a prompt the recording never reached):
+        # repeat the last answer given here, then fall back to the default.
+        if rejected and self._fallback == "":
+            raise ReplayError(f"Recorded answers are rejected at '{asked_by}'.")
+        self._fallback = "" if rejected else self.last.get(asked_by, "")
+        self._last_asked = asked_by
+        return self._fallback
+
+    def _answer(self, asked_by, answer):
+        self.last[asked_by] = answer
+        self._last_asked = asked_by
+        self._fallback = None
+        return answer
+
+
+def _patched(module, **hooks):
+    """Install module-level replacements for builtins; returns an undo function"""
+    saved = {name: module.__dict__[name] for name in hooks if name in module.__dict__}
+    for name, hook in hooks.items():
+        setattr(module, name, hook)
+
+    def undo():
+        for name in hooks:
+            if name in saved:
+                setattr(module, name, saved[name])
+            else:
+                delattr(module, name)
+    return undo
+
+
+# ==================== RECORD / REPLAY ====================
+
+def _load_program(program):
+    if program not in PROGRAMS:
+        raise ValueError(f"Unknown program '{program}' (expected one of: {', '.join(PROGRAMS)}).")
+    return importlib.import_module(PROGRAMS[program])
+
+
+def record(program, path):
+    """
+    Run a program interactively and save the answers to a transcript.
+
+    The transcript is written even when the session ends with Ctrl-C or
+    end of input, so it replays up to that point.
+
+    Args:
+    program (str): "labexamnga" or "labact".
+    path (str): JSON transcript to write.
+
+    Returns:
+        int: number of answers recorded.
+    """
+    module = _load_program(program)
+    recorder = _Recorder(module)
+    undo = _patched(module, input=recorder)
+    try:
+        module.main()
+    except (KeyboardInterrupt, EOFError):
+        print()
+    finally:
+        undo()
+        save_transcript(path, program, recorder.answers)
+    return len(recorder.answers)
+
+
+def save_transcript(path, program, answers):
+    """Write answers as a transcript, with each prompt chain stored once"""
+    prompts = []
+    index = {}
+    compact = []
+    for asked_by, answer in answers:
+        if asked_by not in index:
+            index[asked_by] = len(prompts)
+            prompts.append(asked_by)
+        compact.append([index[asked_by], answer])
+    transcript = {"version": TRANSCRIPT_VERSION, "program": program,
+                  "prompts": prompts, "answers": compact}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(transcript, f, separators=(",", ":"))
+        f.write("\n")
+
+
+def load_transcript(path):
+    """
+    Read a transcript.
+
+    Returns:
+        (program, answers): program name and list of (asked_by, answer).
+    """
+    with open(path, encoding="utf-8") as f:
+        transcript = json.load(f)
+    if transcript.get("version") != TRANSCRIPT_VERSION:
+        raise ValueError(f"{path}: unsupported transcript version {transcript.get('version')}.")
+    prompts = transcript["prompts"]
+    return transcript["program"], [(prompts[i], answer) for i, answer in transcript["answers"]]
+
+
+def replay(path, output_dir, fmt="png", data=None):
+    """
+    Regenerate a recorded session's charts without any terminal I/O.
+
+    Args:
+    path (str): transcript written by record().
+    output_dir (str): directory the charts are saved into.
+    fmt (str): image format for the charts.
+    data (str): data file to use instead of the recorded data (the
+        program must have a data file prompt).
+
+    Returns:
+        list[str]: paths of the charts written, in order.
+    """
+    import chart_output
+
+    program, answers = load_transcript(path)
+    if data is not None and not any(a.endswith(DATA_FILE_PROMPT) for a, _ in answers):
+        raise ValueError(f"The {program} session has no data file prompt to override.")
+    module = _load_program(program)
+
+    player = _Player(module, answers, data)
+    undo = _patched(module, input=player, print=player.print)
+    chart_output.save_charts_to(output_dir, fmt)
+    try:
+        module.main()
+    except EOFError:
+        pass
+    finally:
+        undo()
+        written = chart_output.saved_charts()
+        chart_output.save_charts_to(None)
+    return written
+
+
+# ==================== PROGRAM ENTRY POINT ====================
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Record or replay a chart program session.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rec = commands.add_parser("record", help="run a program and save the answers")
+    rec.add_argument("program", choices=sorted(PROGRAMS))
+    rec.add_argument("transcript", help="JSON file to write")
+
+    play = commands.add_parser("replay", help="regenerate the charts of a recorded session")
+    play.add_argument("transcript", help="JSON file written by record")
+    play.add_argument("--outdir", default="charts", help="directory for the charts")
+    play.add_argument("--format", default="png", help="image format (png, svg, pdf, ...)")
+    play.add_argument("--data", help="data file to use instead of the recorded data")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "record":
+            answers = record(args.program, args.transcript)
+            print(f"Recorded {answers} answers to {args.transcript}.")
+            return 0
+        written = replay(args.transcript, args.outdir, args.format, args.data)
+    except (OSError, ValueError, ReplayError) as e:
+        print(f"Error! {e}")
+        return 1
+    for chart in written:
+        print(chart)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+Sharded map-reduce aggregation of per-store sales files.
+
+Each store has its own transactions file ("category,date,amount" rows, see
+sales_aggregate.py). The files are spread across a process pool; every
+worker turns one file into a partial category x quarter SalesMatrix, and
+the partials are merged into the totals display_summary() works with.
+
+The partials are always merged one file at a time in input order, whether
+they were computed by 1 worker or 32, so a parallel run gives exactly the
+same floating-point totals as a sequential one.
+
+Usage:
+    python sharded_aggregate.py stores/*.csv --workers 16
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from sales_aggregate import aggregate_file, merge
+
+
+# ==================== MAP / REDUCE ====================
+
+def _aggregate_one(task):
+    """Worker: aggregate one store file into a partial SalesMatrix"""
+    path, freq, category_order = task
+    return aggregate_file(path, freq, category_order)
+
+
+def aggregate_files(paths, workers=None, freq="Q", category_order=None):
+    """
+    Aggregate many store files into one SalesMatrix.
+
+    Args:
+    paths (list[str]): one transactions file per store.
+    workers (int): pool size; 1 (or 0) runs everything in this process.
+        Defaults to the CPU count.
+    freq (str): period size (see sales_aggregate.period_codes()).
+    category_order (list): fixed category rows (optional).
+
+    Returns:
+        SalesMatrix: totals over all stores.
+    """
+    if not paths:
+        raise ValueError("no store files given.")
+
+    tasks = [(path, freq, category_order) for path in paths]
+    workers = os.cpu_count() if workers is None else workers
+
+    if workers <= 1:
+        partials = [_aggregate_one(task) for task in tasks]
+    else:
+        chunksize = max(1, len(tasks) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            partials = list(pool.map(_aggregate_one, tasks, chunksize=chunksize))
+
+    return merge(partials)
+
+
+def summary_args(matrix):
+    """Per-category period sales lists, as passed to display_summary()"""
+    return [row.tolist() for row in matrix.totals]
+
+
+# ==================== PROGRAM ENTRY POINT ====================
+
+def main(argv=None):
+    """Command line entry point"""
+    from LabAct_WIthErrorHandling import display_summary
+
+    parser = argparse.ArgumentParser(description="Aggregate per-store sales files in parallel.")
+    parser.add_argument("files", nargs="+", help="store transaction files")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="pool size (default: number of CPUs)")
+    parser.add_argument("--freq", default="Q", help="period size: D, W, M, Q or Y (default: Q)")
+    args = parser.parse_args(argv)
+
+    try:
+        matrix = aggregate_files(args.files, args.workers, args.freq)
+    except (OSError, ValueError) as e:
+        print(f"Error! {e}", file=sys.stderr)
+        return 1
+
+    print(f"Aggregated {len(args.files)} stores: {matrix}")
+    display_summary(*summary_args(matrix), categories=matrix.categories)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())